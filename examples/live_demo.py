@@ -14,6 +14,7 @@ Then open http://localhost:8550 to watch the dashboard.
 from __future__ import annotations
 
 import asyncio
+from collections.abc import Sequence
 
 from agenthalt import (
     AuditLogger,
@@ -33,7 +34,7 @@ from agenthalt import (
     SensitiveDataGuard,
 )
 from agenthalt.audit.logger import LoggingSink
-from agenthalt.dashboard.server import create_event_listener
+from agenthalt.dashboard.server import create_batch_listener
 
 
 def build_engine() -> PolicyEngine:
@@ -118,7 +119,7 @@ def build_engine() -> PolicyEngine:
     )
 
     # Wire up dashboard events
-    engine.add_event_listener(create_event_listener())
+    engine.add_event_listener(create_batch_listener(), batch=True)
 
     # Audit logging
     audit = AuditLogger()
@@ -130,7 +131,7 @@ def build_engine() -> PolicyEngine:
 
 # ── Simulated Agent Actions ────────────────────────────────────────
 
-NORMAL_ACTIONS = [
+NORMAL_ACTIONS = (
     ("gpt4_call", {"prompt": "Summarize the Q3 report", "model": "gpt-4"}),
     ("gpt4o_call", {"prompt": "Draft an email to the team", "model": "gpt-4o"}),
     ("web_search", {"query": "latest AI safety research 2025"}),
@@ -141,9 +142,9 @@ NORMAL_ACTIONS = [
     ("search_knowledge_base", {"query": "refund policy"}),
     ("gpt4o_call", {"prompt": "Analyze customer sentiment", "model": "gpt-4o"}),
     ("fetch_metrics", {"dashboard": "sales", "period": "7d"}),
-]
+)
 
-DANGEROUS_ACTIONS = [
+DANGEROUS_ACTIONS = (
     # Budget burn — expensive calls
     ("image_generation", {"prompt": "Generate 50 product images", "n": 50}),
     # Unauthorized purchase
@@ -166,15 +167,28 @@ DANGEROUS_ACTIONS = [
     # Needs approval
     ("send_email", {"to": "all@company.com", "subject": "URGENT: System update"}),
     ("deploy_production", {"version": "2.1.0", "environment": "prod"}),
-]
+)
+
+LOOP_ACTIONS = (("gpt4_call", {"prompt": "What is 2+2?", "model": "gpt-4"}),)
 
-LOOP_ACTIONS = [
-    ("gpt4_call", {"prompt": "What is 2+2?", "model": "gpt-4"}),
-]
+
+def _ctx(
+    fn_name: str,
+    args: dict,
+    agent_id: str = "demo_agent",
+    session_id: str = "demo_session",
+) -> CallContext:
+    # Each evaluation gets a fresh context: call_id and timestamp must be unique per call
+    return CallContext(
+        function_name=fn_name, arguments=args, agent_id=agent_id, session_id=session_id
+    )
 
 
 async def run_scenario(
-    engine: PolicyEngine, name: str, actions: list, delay: float = 0.5
+    engine: PolicyEngine,
+    name: str,
+    actions: Sequence[tuple[str, dict]],
+    delay: float = 0.5,
 ):
     """Run a named scenario and print results."""
     print(f"\n{'='*60}")
@@ -182,13 +196,7 @@ async def run_scenario(
     print(f"{'='*60}")
 
     for fn_name, args in actions:
-        ctx = CallContext(
-            function_name=fn_name,
-            arguments=args,
-            agent_id="demo_agent",
-            session_id="demo_session",
-        )
-        result = await engine.evaluate(ctx)
+        result = await engine.evaluate(_ctx(fn_name, args))
 
         icon = "✅" if result.is_allowed else "⏳" if result.needs_approval else "❌"
         decision = result.final_decision.decision.value
@@ -201,6 +209,19 @@ async def run_scenario(
         await asyncio.sleep(delay)
 
 
+async def _run_dashboard() -> None:
+    """Serve the dashboard; report a failure instead of ending the demo."""
+    try:
+        from agenthalt.dashboard.server import serve_dashboard
+
+        await serve_dashboard(host="127.0.0.1", port=8550)
+    except ImportError:
+        print("\n  ⚠️  Install dashboard deps: pip install python-socketio uvicorn")
+    except (Exception, SystemExit) as err:
+        # uvicorn exits (SystemExit) when it cannot bind the port
+        print(f"\n  ⚠️  Dashboard stopped ({type(err).__name__}: {err}); is port 8550 in use?")
+
+
 async def main():
     print("\n" + "=" * 60)
     print("  🛡️  AgentHalt — Live Demo")
@@ -209,30 +230,12 @@ async def main():
 
     engine = build_engine()
 
-    # Start dashboard server in background thread (Flask-SocketIO)
-    try:
-        import threading
-
-        from agenthalt.dashboard.server import create_app
-
-        flask_app, socketio = create_app(engine)
-
-        def _run_server():
-            socketio.run(
-                flask_app,
-                host="127.0.0.1",
-                port=8550,
-                debug=False,
-                allow_unsafe_werkzeug=True,
-                log_output=False,
-            )
-
-        t = threading.Thread(target=_run_server, daemon=True)
-        t.start()
-        await asyncio.sleep(1.5)  # Let server fully start
+    # Serve the dashboard on this event loop (python-socketio + uvicorn).
+    # build_engine() already registered the event listener, so pass no engine.
+    server = asyncio.create_task(_run_dashboard())
+    await asyncio.sleep(1.5)  # Let server fully start
+    if not server.done():  # a failed start has already printed why
         print("\n  📊 Dashboard running at http://127.0.0.1:8550")
-    except ImportError:
-        print("\n  ⚠️  Install dashboard deps: pip install flask flask-socketio")
 
     print("\n  👉 Open http://localhost:8550 in your browser now!")
     for i in range(10, 0, -1):
@@ -264,18 +267,15 @@ async def main():
             )
         )
     )
-    loop_engine.add_event_listener(create_event_listener())
+    loop_engine.add_event_listener(create_batch_listener(), batch=True)
     print(f"\n{'='*60}")
     print("  SCENARIO: Agent Stuck in Loop (same call repeated)")
     print(f"{'='*60}")
+    loop_fn, loop_args = LOOP_ACTIONS[0]
     for i in range(8):
-        ctx = CallContext(
-            function_name="gpt4_call",
-            arguments={"prompt": "What is 2+2?", "model": "gpt-4"},
-            agent_id="loop_agent",
-            session_id="loop_session",
+        result = await loop_engine.evaluate(
+            _ctx(loop_fn, loop_args, "loop_agent", "loop_session")
         )
-        result = await loop_engine.evaluate(ctx)
         icon = "✅" if result.is_allowed else "❌"
         decision = result.final_decision.decision.value
         reason = (
@@ -298,18 +298,19 @@ async def main():
             )
         )
     )
-    budget_engine.add_event_listener(create_event_listener())
+    budget_engine.add_event_listener(create_batch_listener(), batch=True)
     print(f"\n{'='*60}")
     print("  SCENARIO: Budget Exhaustion (session limit $0.15)")
     print(f"{'='*60}")
     for i in range(15):
-        ctx = CallContext(
-            function_name="gpt4_call",
-            arguments={"prompt": f"Query #{i}", "model": "gpt-4"},
-            agent_id="budget_agent",
-            session_id="budget_session",
+        result = await budget_engine.evaluate(
+            _ctx(
+                "gpt4_call",
+                {"prompt": f"Query #{i}", "model": "gpt-4"},
+                "budget_agent",
+                "budget_session",
+            )
         )
-        result = await budget_engine.evaluate(ctx)
         if result.is_denied:
             print(f"  ❌ Call #{i+1}: DENIED — {result.final_decision.reason[:70]}")
             break
@@ -9,7 +9,7 @@ from agenthalt.audit.logger import AuditEntry, AuditLogger
 from agenthalt.core.context import CallContext
 from agenthalt.core.decision import Decision, DecisionType
 from agenthalt.core.engine import PolicyEngine
-from agenthalt.core.guard import Guard
+from agenthalt.core.guard import Guard, SyncGuard
 from agenthalt.decorators import guarded
 from agenthalt.guards.budget import BudgetConfig, BudgetGuard
 from agenthalt.guards.deletion import DeletionConfig, DeletionGuard
@@ -25,6 +25,7 @@ __all__ = [
     # Core
     "PolicyEngine",
     "Guard",
+    "SyncGuard",
     "Decision",
     "DecisionType",
     "CallContext",
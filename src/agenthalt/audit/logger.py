@@ -3,17 +3,78 @@
 from __future__ import annotations
 
 import logging
+import os
+import queue
+import reprlib
+import threading
 import time
+from collections import deque
+from itertools import islice
 from pathlib import Path
-from typing import Any, TextIO
+from typing import Any, Literal
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
 from agenthalt.core.context import CallContext
-from agenthalt.core.decision import Decision, DecisionType
+from agenthalt.core.decision import DECISION_PRIORITY, Decision, DecisionType
 
 logger = logging.getLogger("agenthalt.audit")
 
+_SUMMARY_LENGTH = 100
+
+
+class _SummaryRepr(reprlib.Repr):
+    """Bounded repr that keeps dict and set iteration order, like str() does."""
+
+    def repr_dict(self, x: dict[Any, Any], level: int) -> str:
+        if not x:
+            return "{}"
+        if level <= 0:
+            return "{...}"
+        pieces = [
+            f"{self.repr1(k, level - 1)}: {self.repr1(v, level - 1)}"
+            for k, v in islice(x.items(), self.maxdict)
+        ]
+        if len(x) > self.maxdict:
+            pieces.append("...")
+        return "{" + ", ".join(pieces) + "}"
+
+    def repr_set(self, x: set[Any], level: int) -> str:
+        return self._repr_iterable(x, level, "{", "}", self.maxset) if x else "set()"
+
+    def repr_frozenset(self, x: frozenset[Any], level: int) -> str:
+        if not x:
+            return "frozenset()"
+        return self._repr_iterable(x, level, "frozenset({", "})", self.maxfrozenset)
+
+
+# Builtin containers' str() is their repr. The limits are loose enough that any
+# container whose full text fits in the summary renders exactly as str() would;
+# larger ones are elided before being stringified.
+_container_repr = _SummaryRepr()
+_container_repr.maxlevel = _SUMMARY_LENGTH // 2
+_container_repr.maxstring = _container_repr.maxlong = _container_repr.maxother = _SUMMARY_LENGTH
+_container_repr.maxlist = _container_repr.maxtuple = _SUMMARY_LENGTH // 3 + 1
+_container_repr.maxset = _container_repr.maxfrozenset = _SUMMARY_LENGTH // 3 + 1
+_container_repr.maxdict = _SUMMARY_LENGTH // 6 + 1
+_CONTAINERS = (list, tuple, dict, set, frozenset)
+
+
+def _summarize(value: Any) -> str:
+    """Render an argument value for the audit log, truncated to _SUMMARY_LENGTH.
+
+    Large containers are rendered through a bounded repr, so a huge list or
+    dict never gets fully stringified just to be cut down.
+    """
+    cls = value.__class__
+    if cls is str:
+        s = value
+    elif cls in _CONTAINERS:
+        s = _container_repr.repr(value)
+    else:
+        s = str(value)
+    return s[:_SUMMARY_LENGTH] + "..." if len(s) > _SUMMARY_LENGTH else s
+
 
 class AuditEntry(BaseModel):
     """A single audit log entry."""
@@ -32,6 +93,18 @@ class AuditEntry(BaseModel):
     execution_allowed: bool = False
     metadata: dict[str, Any] = Field(default_factory=dict)
 
+    _json_line: bytes | None = PrivateAttr(default=None)
+
+    def json_line(self) -> bytes:
+        """Return the entry as a UTF-8 JSON line, serializing it only once.
+
+        Entries are records and are not expected to change after logging;
+        every sink that needs JSON shares the cached bytes.
+        """
+        if self._json_line is None:
+            self._json_line = self.__pydantic_serializer__.to_json(self) + b"\n"
+        return self._json_line
+
     @classmethod
     def from_evaluation(
         cls,
@@ -44,32 +117,29 @@ class AuditEntry(BaseModel):
     ) -> AuditEntry:
         """Create an audit entry from an evaluation result."""
         # Summarize arguments (truncate long values for the log)
-        args_summary: dict[str, str] = {}
-        for k, v in ctx.arguments.items():
-            s = str(v)
-            args_summary[k] = s[:100] + "..." if len(s) > 100 else s
-
-        decision_dicts = [
-            {
-                "guard": d.guard_name,
-                "decision": d.decision.value,
-                "reason": d.reason,
-                "risk_score": d.risk_score,
-            }
-            for d in decisions
-        ]
+        args_summary = {k: _summarize(v) for k, v in ctx.arguments.items()}
 
+        # Summarize decisions, tracking the most restrictive one and the highest risk
+        decision_dicts: list[dict[str, Any]] = []
         final = DecisionType.ALLOW
+        best = DECISION_PRIORITY[final]
         max_risk = 0.0
-        if decisions:
-            priority = {
-                DecisionType.DENY: 0,
-                DecisionType.REQUIRE_APPROVAL: 1,
-                DecisionType.MODIFY: 2,
-                DecisionType.ALLOW: 3,
-            }
-            final = min(decisions, key=lambda d: priority[d.decision]).decision
-            max_risk = max(d.risk_score for d in decisions)
+        append = decision_dicts.append
+        for d in decisions:
+            kind, risk = d.decision, d.risk_score
+            append(
+                {
+                    "guard": d.guard_name,
+                    "decision": kind.value,
+                    "reason": d.reason,
+                    "risk_score": risk,
+                }
+            )
+            priority = DECISION_PRIORITY[kind]
+            if priority < best:
+                best, final = priority, kind
+            if risk > max_risk:
+                max_risk = risk
 
         return cls(
             call_id=ctx.call_id,
@@ -83,7 +153,9 @@ class AuditEntry(BaseModel):
             approved=approved,
             approver=approver,
             execution_allowed=execution_allowed,
-            metadata=dict(ctx.metadata),
+            # Validation copies the dict once, so the entry keeps a snapshot even if
+            # a hook later changes ctx.metadata in place
+            metadata=ctx.metadata,
         )
 
 
@@ -93,6 +165,11 @@ class AuditSink:
     def write(self, entry: AuditEntry) -> None:
         raise NotImplementedError
 
+    def write_batch(self, entries: list[AuditEntry]) -> None:
+        """Write several entries. Override when the destination can batch writes."""
+        for entry in entries:
+            self.write(entry)
+
     def flush(self) -> None:
         pass
 
@@ -100,30 +177,57 @@ class AuditSink:
         pass
 
 
+_fdatasync = getattr(os, "fdatasync", os.fsync)
+
+
 class JsonFileSink(AuditSink):
-    """Writes audit entries as JSON lines to a file."""
+    """Writes audit entries as JSON lines to a file.
+
+    Lines are appended with a single `os.write` per entry or batch on a file
+    descriptor opened in append mode, so there is no Python-side buffer to
+    flush. `fsync` sets durability: "never" leaves syncing to the OS, "batch"
+    syncs after each write call (once per batch when the logger is buffered),
+    and "always" writes and syncs entry by entry.
+    """
 
-    def __init__(self, path: str | Path) -> None:
+    def __init__(
+        self, path: str | Path, *, fsync: Literal["never", "batch", "always"] = "never"
+    ) -> None:
+        if fsync not in ("never", "batch", "always"):
+            raise ValueError(f"Invalid fsync policy: {fsync!r}")
         self._path = Path(path)
         self._path.parent.mkdir(parents=True, exist_ok=True)
-        self._file: TextIO | None = None
-
-    def _ensure_open(self) -> TextIO:
-        if self._file is None or self._file.closed:
-            self._file = open(self._path, "a", encoding="utf-8")  # noqa: SIM115
-        return self._file
+        self._fsync = fsync
+        self._fd: int | None = None
+
+    def _ensure_open(self) -> int:
+        if self._fd is None:
+            flags = os.O_WRONLY | os.O_CREAT | os.O_APPEND | getattr(os, "O_BINARY", 0)
+            self._fd = os.open(self._path, flags, 0o644)
+        return self._fd
+
+    def _append(self, data: bytes) -> None:
+        fd = self._ensure_open()
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view) :]
+        if self._fsync != "never":
+            _fdatasync(fd)
 
     def write(self, entry: AuditEntry) -> None:
-        f = self._ensure_open()
-        f.write(entry.model_dump_json() + "\n")
+        self._append(entry.json_line())
 
-    def flush(self) -> None:
-        if self._file and not self._file.closed:
-            self._file.flush()
+    def write_batch(self, entries: list[AuditEntry]) -> None:
+        if self._fsync == "always":
+            for entry in entries:
+                self._append(entry.json_line())
+        else:
+            self._append(b"".join(entry.json_line() for entry in entries))
 
     def close(self) -> None:
-        if self._file and not self._file.closed:
-            self._file.close()
+        fd, self._fd = self._fd, None
+        if fd is not None:
+            os.close(fd)
 
 
 class LoggingSink(AuditSink):
@@ -168,12 +272,45 @@ class AuditLogger:
 
         # Called automatically by PolicyEngine when using the audit post-hook
         audit.log(ctx, decisions, execution_allowed=True)
+
+    With `buffered=True`, sink writes are handed to a background thread through
+    a bounded queue so `log()` never waits on file or logging I/O. The thread
+    collects up to `batch_size` entries, or whatever arrived within
+    `flush_interval_s`, and hands them to each sink's `write_batch`. Entries that
+    do not fit in the queue are dropped from the sinks (but kept in memory) and
+    counted in `dropped`. Call `flush()` to wait until queued entries are written.
+
+    The most recent `max_memory_entries` entries are kept in memory and indexed
+    by function name, decision, agent and session for `query()`.
     """
 
-    def __init__(self) -> None:
+    _STOP = object()
+    _FLUSH = object()
+    _INDEXED_FIELDS = ("function_name", "final_decision", "agent_id", "session_id")
+
+    def __init__(
+        self,
+        *,
+        buffered: bool = False,
+        max_queue_size: int = 10_000,
+        batch_size: int = 128,
+        flush_interval_s: float = 0.5,
+        max_memory_entries: int = 10_000,
+    ) -> None:
         self._sinks: list[AuditSink] = []
-        self._entries: list[AuditEntry] = []
-        self._max_memory_entries: int = 10000
+        self._max_memory_entries = max_memory_entries
+        # Oldest entries fall off the left once the cap is reached
+        self._entries: deque[AuditEntry] = deque(maxlen=max_memory_entries)
+        # (field, value) -> entries with that value, oldest first
+        self._index: dict[tuple[str, str], deque[AuditEntry]] = {}
+        self._entries_lock = threading.Lock()
+        self._buffered = buffered
+        self._queue: queue.Queue[Any] = queue.Queue(maxsize=max_queue_size)
+        self._worker: threading.Thread | None = None
+        self._worker_lock = threading.Lock()
+        self._batch_size = batch_size
+        self._flush_interval_s = flush_interval_s
+        self.dropped = 0
 
     def add_sink(self, sink: AuditSink) -> AuditLogger:
         """Add an audit sink. Returns self for chaining."""
@@ -198,24 +335,96 @@ class AuditLogger:
             execution_allowed=execution_allowed,
         )
 
-        # Store in memory (with cap)
-        self._entries.append(entry)
-        if len(self._entries) > self._max_memory_entries:
-            self._entries = self._entries[-self._max_memory_entries :]
+        self._remember(entry)
+
+        if self._buffered:
+            self._ensure_worker()
+            try:
+                self._queue.put_nowait(entry)
+            except queue.Full:
+                self.dropped += 1
+        else:
+            self._dispatch(entry)
+
+        return entry
 
-        # Dispatch to sinks
+    def _index_keys(self, entry: AuditEntry) -> list[tuple[str, str]]:
+        return [(f, v) for f in self._INDEXED_FIELDS if (v := getattr(entry, f))]
+
+    def _remember(self, entry: AuditEntry) -> None:
+        """Store an entry in memory (with cap) and in the query indexes."""
+        if self._max_memory_entries <= 0:
+            return
+        with self._entries_lock:
+            if len(self._entries) == self._max_memory_entries:
+                # The evicted entry is the oldest in each of its index buckets
+                evicted = self._entries[0]
+                for key in self._index_keys(evicted):
+                    bucket = self._index[key]
+                    bucket.popleft()
+                    if not bucket:
+                        del self._index[key]
+            self._entries.append(entry)
+            for key in self._index_keys(entry):
+                bucket = self._index.get(key)
+                if bucket is None:
+                    bucket = self._index[key] = deque()
+                bucket.append(entry)
+
+    def _dispatch(self, entry: AuditEntry) -> None:
         for sink in self._sinks:
             try:
                 sink.write(entry)
             except Exception as e:
                 logger.error("Audit sink error: %s", e)
 
-        return entry
+    def _dispatch_batch(self, entries: list[AuditEntry]) -> None:
+        for sink in self._sinks:
+            try:
+                sink.write_batch(entries)
+            except Exception as e:
+                logger.error("Audit sink error: %s", e)
+
+    def _ensure_worker(self) -> None:
+        if self._worker is not None:
+            return
+        with self._worker_lock:
+            if self._worker is None:
+                self._worker = threading.Thread(
+                    target=self._drain, name="agenthalt-audit", daemon=True
+                )
+                self._worker.start()
+
+    def _drain(self) -> None:
+        while True:
+            # Block for the first item, then collect more until the batch is full,
+            # the interval elapses, or a flush/stop marker arrives.
+            items = [self._queue.get()]
+            deadline = time.monotonic() + self._flush_interval_s
+            while len(items) < self._batch_size and items[-1] not in (self._STOP, self._FLUSH):
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    items.append(self._queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+
+            entries = [e for e in items if e is not self._STOP and e is not self._FLUSH]
+            try:
+                if entries:
+                    self._dispatch_batch(entries)
+            finally:
+                for _ in items:
+                    self._queue.task_done()
+            if items[-1] is self._STOP:
+                return
 
     @property
     def entries(self) -> list[AuditEntry]:
         """Get in-memory audit entries."""
-        return list(self._entries)
+        with self._entries_lock:
+            return list(self._entries)
 
     def query(
         self,
@@ -227,21 +436,41 @@ class AuditLogger:
         since: float | None = None,
         limit: int = 100,
     ) -> list[AuditEntry]:
-        """Query in-memory audit entries with filters."""
-        results = self._entries
-        if function_name:
-            results = [e for e in results if e.function_name == function_name]
-        if decision:
-            results = [e for e in results if e.final_decision == decision]
-        if agent_id:
-            results = [e for e in results if e.agent_id == agent_id]
-        if session_id:
-            results = [e for e in results if e.session_id == session_id]
-        if since:
-            results = [e for e in results if e.timestamp >= since]
-        return results[-limit:]
+        """Query in-memory audit entries with filters.
+
+        Returns up to `limit` of the most recent matches, oldest first.
+        """
+        filters = [
+            (f, v)
+            for f, v in zip(
+                self._INDEXED_FIELDS, (function_name, decision, agent_id, session_id), strict=True
+            )
+            if v
+        ]
+        results: list[AuditEntry] = []
+        with self._entries_lock:
+            # Walk the smallest matching index bucket newest first, checking the
+            # other filters, and stop once enough matches are found
+            candidates: deque[AuditEntry] = self._entries
+            if filters:
+                candidates = min((self._index.get(key, deque()) for key in filters), key=len)
+            for e in reversed(candidates):
+                if since and e.timestamp < since:
+                    continue
+                if any(getattr(e, f) != v for f, v in filters):
+                    continue
+                results.append(e)
+                if len(results) == limit:
+                    break
+        results.reverse()
+        return results
 
     def flush(self) -> None:
+        """Wait for queued entries to reach the sinks, then flush every sink."""
+        if self._worker is not None:
+            # Wake the worker so a partial batch is written now, then wait for it
+            self._queue.put(self._FLUSH)
+            self._queue.join()
         for sink in self._sinks:
             try:
                 sink.flush()
@@ -249,6 +478,12 @@ class AuditLogger:
                 logger.error("Audit sink flush error: %s", e)
 
     def close(self) -> None:
+        """Drain queued entries, stop the background thread and close every sink."""
+        worker = self._worker
+        if worker is not None:
+            self._queue.put(self._STOP)
+            worker.join()
+            self._worker = None
         for sink in self._sinks:
             try:
                 sink.close()
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
@@ -24,6 +25,16 @@ _GUARD_REGISTRY: dict[str, tuple[type, type]] = {
     "sensitive_data": (SensitiveDataGuard, SensitiveDataConfig),
 }
 
+# libyaml's loader when PyYAML was built with it, same safe schema either way
+_YAML_LOADER: Any = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+@lru_cache(maxsize=32)
+def _parse_yaml(path: str, mtime_ns: int, size: int) -> Any:
+    """Parse a YAML file; cached per file version (the loaded data is never mutated)."""
+    with open(path) as f:
+        return yaml.load(f, Loader=_YAML_LOADER)
+
 
 def load_config(path: str | Path) -> PolicyEngine:
     """Load a PolicyEngine from a YAML configuration file.
@@ -72,8 +83,8 @@ def load_config(path: str | Path) -> PolicyEngine:
               - api_key
     """
     path = Path(path)
-    with open(path) as f:
-        data = yaml.safe_load(f)
+    stat = path.stat()
+    data = _parse_yaml(str(path.resolve()), stat.st_mtime_ns, stat.st_size)
 
     if not isinstance(data, dict):
         raise ValueError(f"Invalid config file: expected a mapping, got {type(data)}")
@@ -91,12 +102,13 @@ def _build_engine(data: dict[str, Any]) -> PolicyEngine:
     guards_config = data.get("guards", {})
 
     for guard_name, guard_config in guards_config.items():
-        if guard_name not in _GUARD_REGISTRY:
+        entry = _GUARD_REGISTRY.get(guard_name)
+        if entry is None:
             raise ValueError(
                 f"Unknown guard: '{guard_name}'. Available: {list(_GUARD_REGISTRY.keys())}"
             )
 
-        guard_cls, config_cls = _GUARD_REGISTRY[guard_name]
+        guard_cls, config_cls = entry
         config = config_cls(**(guard_config or {}))
         guard = guard_cls(config)
 
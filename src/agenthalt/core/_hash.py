@@ -0,0 +1,27 @@
+"""Hashable keys for call arguments — used by the engine's decision cache."""
+
+from __future__ import annotations
+
+from collections.abc import Hashable
+from typing import Any
+
+
+def freeze(value: Any) -> Hashable:
+    """Convert a JSON-like value into a hashable, type-tagged key.
+
+    Dicts are walked in insertion order, so equal dicts built in a different
+    order produce different keys; that only costs a cache miss. Keys compare
+    by equality, never by digest, so distinct values never share a key.
+
+    Raises TypeError for values that cannot be frozen (unhashable leaves).
+    """
+    cls = value.__class__
+    if cls is str:
+        return value
+    if isinstance(value, dict):
+        return (dict, tuple((freeze(k), freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return (cls, tuple(freeze(v) for v in value))
+    hash(value)
+    # Tag with the type so 1, 1.0 and True produce distinct keys
+    return (cls, value)
@@ -0,0 +1,90 @@
+"""Shared background event loop for running coroutines from synchronous code."""
+
+from __future__ import annotations
+
+import asyncio
+import atexit
+import threading
+from collections.abc import Coroutine
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+_lock = threading.Lock()
+_loop: asyncio.AbstractEventLoop | None = None
+_thread: threading.Thread | None = None
+_in_flight = 0  # coroutines currently submitted to the shared loop
+
+
+def _background_loop() -> asyncio.AbstractEventLoop:
+    global _loop, _thread
+    loop = _loop
+    if loop is not None:
+        return loop
+    with _lock:
+        if _loop is None:
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=loop.run_forever, name="agenthalt-loop", daemon=True)
+            thread.start()
+            _loop, _thread = loop, thread
+        return _loop
+
+
+def run_coroutine(coro: Coroutine[Any, Any, T]) -> T:
+    """Run a coroutine to completion from synchronous code.
+
+    When the shared loop is idle, the coroutine runs on it: a long-lived loop
+    in a daemon thread, so repeated calls pay neither loop setup/teardown nor
+    executor creation. When it is already running another caller's coroutine
+    (or this call comes from the shared loop itself), the coroutine gets a
+    private loop instead, so a guard or approval handler that blocks cannot
+    stall other threads. The caller's context variables are visible to the
+    coroutine either way.
+    """
+    global _in_flight
+    loop = _background_loop()
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    with _lock:
+        shared = running is not loop and _in_flight == 0
+        if shared:
+            _in_flight += 1
+    if not shared:
+        return _run_private(coro, running)
+    try:
+        return asyncio.run_coroutine_threadsafe(coro, loop).result()
+    finally:
+        with _lock:
+            _in_flight -= 1
+
+
+def _run_private(coro: Coroutine[Any, Any, T], running: asyncio.AbstractEventLoop | None) -> T:
+    """Run a coroutine on a loop of its own, created for this call."""
+    if running is None:
+        return asyncio.run(coro)
+    # asyncio.run() refuses to start inside a running loop; use a helper thread,
+    # carrying the caller's context variables over
+    import concurrent.futures
+    import contextvars
+
+    context = contextvars.copy_context()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(context.run, asyncio.run, coro).result()
+
+
+def shutdown() -> None:
+    """Stop the background loop. A later run_coroutine() starts a new one."""
+    global _loop, _thread
+    with _lock:
+        loop, thread = _loop, _thread
+        _loop = _thread = None
+    if loop is None or thread is None:
+        return
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    loop.close()
+
+
+atexit.register(shutdown)
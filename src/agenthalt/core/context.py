@@ -2,8 +2,8 @@
 
 from __future__ import annotations
 
+import secrets
 import time
-import uuid
 from typing import Any
 
 from pydantic import BaseModel, Field
@@ -22,7 +22,7 @@ class CallContext(BaseModel):
         metadata: Arbitrary extra metadata for custom guards.
     """
 
-    call_id: str = Field(default_factory=lambda: uuid.uuid4().hex[:16])
+    call_id: str = Field(default_factory=lambda: secrets.token_hex(8))
     function_name: str
     arguments: dict[str, Any] = Field(default_factory=dict)
     agent_id: str | None = None
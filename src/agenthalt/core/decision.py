@@ -2,10 +2,11 @@
 
 from __future__ import annotations
 
+import copy
 from enum import Enum
 from typing import Any
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 
 
 class DecisionType(str, Enum):
@@ -17,6 +18,43 @@ class DecisionType(str, Enum):
     MODIFY = "modify"
 
 
+# Restrictiveness order used to fold many decisions into one (lower wins)
+DECISION_PRIORITY: dict[DecisionType, int] = {
+    DecisionType.DENY: 0,
+    DecisionType.REQUIRE_APPROVAL: 1,
+    DecisionType.MODIFY: 2,
+    DecisionType.ALLOW: 3,
+}
+
+
+class _ReadOnlyDict(dict[str, Any]):
+    """A dict that rejects changes after construction.
+
+    Still a dict, so it serializes, pickles and unpacks like one;
+    `dict(details)` or `details.copy()` gives a mutable copy.
+    """
+
+    __slots__ = ()
+
+    def _read_only(self, *args: Any, **kwargs: Any) -> Any:
+        raise TypeError("Decision.details is read-only; build a new dict instead")
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def copy(self) -> dict[str, Any]:
+        return dict(self)
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return (type(self), (dict(self),))
+
+    def __copy__(self) -> _ReadOnlyDict:
+        return self
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> _ReadOnlyDict:
+        return type(self)(copy.deepcopy(dict(self), memo))
+
+
 class Decision(BaseModel):
     """Result of a guard evaluating a function call.
 
@@ -27,15 +65,25 @@ class Decision(BaseModel):
         details: Structured data about why the decision was made.
         modified_arguments: If decision is MODIFY, the new arguments to use.
         risk_score: Optional 0.0–1.0 risk score for the call.
+
+    Decisions are immutable so a single instance can be shared between results;
+    `details` is a read-only dict for the same reason.
     """
 
+    model_config = {"frozen": True}
+
     decision: DecisionType
     guard_name: str
     reason: str = ""
-    details: dict[str, Any] = Field(default_factory=dict)
+    details: dict[str, Any] = Field(default_factory=dict, validate_default=True)
     modified_arguments: dict[str, Any] | None = None
     risk_score: float = 0.0
 
+    @field_validator("details")
+    @classmethod
+    def _freeze_details(cls, details: dict[str, Any]) -> dict[str, Any]:
+        return _ReadOnlyDict(details)
+
     @property
     def is_blocked(self) -> bool:
         return self.decision in (DecisionType.DENY, DecisionType.REQUIRE_APPROVAL)
@@ -3,12 +3,20 @@
 from __future__ import annotations
 
 import asyncio
+import copy
+import functools
 import logging
-from collections.abc import Callable
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Sequence
 from typing import TYPE_CHECKING, Any
 
+from agenthalt.core._hash import freeze
+from agenthalt.core._loop import run_coroutine
 from agenthalt.core.context import CallContext
-from agenthalt.core.decision import Decision, DecisionType
+from agenthalt.core.decision import DECISION_PRIORITY, Decision, DecisionType
 from agenthalt.core.guard import Guard
 
 if TYPE_CHECKING:
@@ -16,6 +24,84 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger("agenthalt")
 
+_UNCACHEABLE = object()
+
+# Final decision of a call that no guard evaluated (decisions are immutable)
+_NO_GUARDS_ALLOW = Decision(
+    decision=DecisionType.ALLOW,
+    guard_name="engine",
+    reason="No guards evaluated",
+)
+
+
+def _context_key(ctx: CallContext) -> Hashable:
+    """Build a cache key from the parts of a context a pure guard may inspect."""
+    try:
+        return (
+            ctx.function_name,
+            ctx.agent_id,
+            ctx.session_id,
+            freeze(ctx.arguments),
+            freeze(ctx.metadata),
+        )
+    except TypeError:
+        return _UNCACHEABLE
+
+
+@functools.lru_cache(maxsize=256)
+def _error_decision(guard_name: str, reason: str) -> Decision:
+    """Fail-safe DENY for a guard error; a failing dependency tends to repeat one error."""
+    return Decision(
+        decision=DecisionType.DENY,
+        guard_name=guard_name,
+        reason=reason,
+        risk_score=1.0,
+    )
+
+
+def _unshared(decision: Decision) -> Decision:
+    """Return ``decision`` with modified_arguments its receiver may mutate freely.
+
+    Decisions are frozen with read-only details, but modified_arguments is a
+    plain dict that callers merge into the call; cached and coalesced decisions
+    hand each receiver its own deep copy.
+    """
+    if decision.modified_arguments is None:
+        return decision
+    return decision.model_copy(
+        update={"modified_arguments": copy.deepcopy(decision.modified_arguments)}
+    )
+
+
+class _DecisionCache:
+    """Thread-safe bounded LRU cache of decisions produced by pure guards."""
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._data: OrderedDict[Hashable, Decision] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Decision | None:
+        with self._lock:
+            decision = self._data.get(key)
+            if decision is not None:
+                self._data.move_to_end(key)
+        return decision
+
+    def put(self, key: Hashable, decision: Decision) -> None:
+        with self._lock:
+            self._data[key] = decision
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
 
 class GuardResult:
     """Aggregated result from all guards for a single function call.
@@ -29,28 +115,24 @@ class GuardResult:
     def __init__(self, decisions: list[Decision]) -> None:
         self.decisions = decisions
         self.approved: bool = False
-        self._final: Decision | None = None
+
+        # Find the most restrictive decision and the highest risk in one pass
+        final: Decision | None = None
+        best = len(DECISION_PRIORITY)
+        max_risk = 0.0
+        for d in decisions:
+            priority = DECISION_PRIORITY[d.decision]
+            if priority < best:
+                best, final = priority, d
+            if d.risk_score > max_risk:
+                max_risk = d.risk_score
+        self._final = final if final is not None else _NO_GUARDS_ALLOW
+        self._max_risk = max_risk
 
     @property
     def final_decision(self) -> Decision:
         """Return the most restrictive decision (deny > require_approval > modify > allow)."""
-        if self._final is not None:
-            return self._final
-
-        if not self.decisions:
-            return Decision(
-                decision=DecisionType.ALLOW,
-                guard_name="engine",
-                reason="No guards evaluated",
-            )
-
-        priority = {
-            DecisionType.DENY: 0,
-            DecisionType.REQUIRE_APPROVAL: 1,
-            DecisionType.MODIFY: 2,
-            DecisionType.ALLOW: 3,
-        }
-        return min(self.decisions, key=lambda d: priority[d.decision])
+        return self._final
 
     @property
     def is_allowed(self) -> bool:
@@ -88,9 +170,7 @@ class GuardResult:
 
     @property
     def max_risk_score(self) -> float:
-        if not self.decisions:
-            return 0.0
-        return max(d.risk_score for d in self.decisions)
+        return self._max_risk
 
     def __str__(self) -> str:
         final = self.final_decision
@@ -122,26 +202,78 @@ class PolicyEngine:
         else:
             # blocked
             print(result.denial_reasons)
+
+    Decisions of guards marked `pure = True` are cached in a bounded LRU keyed
+    by the guard, the policy epoch and the call's function name, agent_id,
+    session_id, arguments and metadata. Adding or removing a guard bumps the epoch. Pass
+    `decision_cache_size=0` to disable caching.
+
+    Which guards apply is remembered per function name for guards that always
+    apply or declare `applies_by_function_name = True`. Call
+    `invalidate_caches()` after changing a registered guard's configuration.
     """
 
-    def __init__(self, *, approval_handler: ApprovalHandler | None = None) -> None:
+    _MAX_APPLICABILITY_ENTRIES = 1024
+
+    def __init__(
+        self,
+        *,
+        approval_handler: ApprovalHandler | None = None,
+        decision_cache_size: int = 10_000,
+        event_batch_interval_s: float = 0.1,
+    ) -> None:
         self._guards: list[Guard] = []
-        self._pre_hooks: list[Callable[[CallContext], CallContext]] = []
+        # (registration index, guard) pairs in the order guards are evaluated
+        self._by_cost: list[tuple[int, Guard]] = []
+        # function name -> (index, guard, needs per-call should_apply) in cost order
+        self._candidates: dict[str, list[tuple[int, Guard, bool]]] = {}
+        self._pre_hooks: list[Callable[[CallContext], CallContext | None]] = []
         self._post_hooks: list[Callable[[CallContext, GuardResult], None]] = []
         self._approval_handler: ApprovalHandler | None = approval_handler
         self._event_listeners: list[Callable[[dict[str, Any]], None]] = []
+        self._batch_listeners: list[Callable[[list[dict[str, Any]]], None]] = []
+        self._event_batch: list[dict[str, Any]] = []
+        self._event_lock = threading.Lock()
+        self._event_batch_interval_s = event_batch_interval_s
+        self._event_flusher: threading.Thread | None = None
+        self._policy_epoch = 0
+        self._inflight: dict[Hashable, asyncio.Future[list[Decision] | None]] = {}
+        self._decision_cache: _DecisionCache | None = (
+            _DecisionCache(decision_cache_size) if decision_cache_size > 0 else None
+        )
 
     def add_guard(self, guard: Guard) -> PolicyEngine:
         """Register a guard. Returns self for chaining."""
         self._guards.append(guard)
+        self._guards_changed()
         logger.info("Registered guard: %s", guard.name)
         return self
 
     def remove_guard(self, name: str) -> PolicyEngine:
         """Remove a guard by name. Returns self for chaining."""
         self._guards = [g for g in self._guards if g.name != name]
+        self._guards_changed()
         return self
 
+    def _guards_changed(self) -> None:
+        # Cheap guards first (stable, so ties keep registration order)
+        self._by_cost = sorted(enumerate(self._guards), key=lambda item: item[1].cost_hint)
+        # Entries from older epochs can never be hit again; drop them eagerly
+        self._policy_epoch += 1
+        self._candidates = {}
+        if self._decision_cache is not None:
+            self._decision_cache.clear()
+
+    def invalidate_caches(self) -> None:
+        """Apply in-place config edits to every registered guard.
+
+        Calls each guard's ``reconfigure()`` so it rebuilds the state it derived
+        from its config, then forgets cached applicability and decisions.
+        """
+        for guard in self._guards:
+            guard.reconfigure()
+        self._guards_changed()
+
     def get_guard(self, name: str) -> Guard | None:
         """Get a guard by name."""
         for g in self._guards:
@@ -153,8 +285,13 @@ class PolicyEngine:
     def guards(self) -> list[Guard]:
         return list(self._guards)
 
-    def add_pre_hook(self, hook: Callable[[CallContext], CallContext]) -> PolicyEngine:
-        """Add a hook that runs before guard evaluation. Can modify context."""
+    def add_pre_hook(self, hook: Callable[[CallContext], CallContext | None]) -> PolicyEngine:
+        """Add a hook that runs before guard evaluation. Can modify context.
+
+        The hook returns the context to evaluate, or None to keep the one it was
+        given. Updating `ctx.metadata` in place and returning None avoids copying
+        the context on every call.
+        """
         self._pre_hooks.append(hook)
         return self
 
@@ -168,70 +305,188 @@ class PolicyEngine:
         self._approval_handler = handler
         return self
 
-    def add_event_listener(self, listener: Callable[[dict[str, Any]], None]) -> PolicyEngine:
-        """Add a real-time event listener (for dashboard, webhooks, etc.)."""
-        self._event_listeners.append(listener)
+    def add_event_listener(
+        self, listener: Callable[[Any], None], *, batch: bool = False
+    ) -> PolicyEngine:
+        """Add a real-time event listener (for dashboard, webhooks, etc.).
+
+        With `batch=True` the listener is called from a background thread with
+        the list of events emitted since the previous call, roughly every
+        `event_batch_interval_s` seconds (see `flush_events()`). Adding a listener
+        that is already registered has no effect.
+        """
+        if batch:
+            if listener not in self._batch_listeners:
+                self._batch_listeners.append(listener)
+            self._ensure_event_flusher()
+        elif listener not in self._event_listeners:
+            self._event_listeners.append(listener)
         return self
 
+    @property
+    def _has_listeners(self) -> bool:
+        return bool(self._event_listeners or self._batch_listeners)
+
     def _emit_event(self, event: dict[str, Any]) -> None:
         for listener in self._event_listeners:
             try:
                 listener(event)
             except Exception as e:
                 logger.error("Event listener error: %s", e)
+        if self._batch_listeners:
+            with self._event_lock:
+                self._event_batch.append(event)
+
+    def flush_events(self) -> None:
+        """Deliver buffered events to batch listeners now."""
+        with self._event_lock:
+            events, self._event_batch = self._event_batch, []
+        if not events:
+            return
+        for listener in self._batch_listeners:
+            try:
+                listener(events)
+            except Exception as e:
+                logger.error("Event listener error: %s", e)
+
+    def _ensure_event_flusher(self) -> None:
+        if self._event_flusher is not None:
+            return
+        # The thread holds only a weak reference so it never keeps the engine alive
+        ref = weakref.ref(self)
+        interval = self._event_batch_interval_s
+
+        def run() -> None:
+            while True:
+                time.sleep(interval)
+                engine = ref()
+                if engine is None:
+                    return
+                engine.flush_events()
+                del engine
+
+        self._event_flusher = threading.Thread(target=run, name="agenthalt-events", daemon=True)
+        self._event_flusher.start()
 
     async def evaluate(self, ctx: CallContext) -> GuardResult:
         """Evaluate a function call against all registered guards.
 
-        Guards are evaluated concurrently. The most restrictive decision wins.
+        Guards are evaluated concurrently. As soon as any guard denies, guards
+        that are still pending are cancelled. The most restrictive decision wins.
         """
-        # Run pre-hooks
-        for hook in self._pre_hooks:
-            ctx = hook(ctx)
+        ctx, applicable = self._prepare(ctx)
+        if not applicable:
+            return self._without_guards(ctx)
+
+        if all(g.is_sync for _, g in applicable):
+            # Nothing to await: run inline without scheduling a task per guard
+            decisions = self._run_guards_sync(applicable, ctx)
+        else:
+            decisions = await self._run_guards_coalesced(applicable, ctx)
+        result = self._conclude(ctx, applicable, decisions)
+
+        # Auto-route to approval handler if wired in
+        if result.needs_approval and self._approval_handler:
+            await self._request_approval(self._approval_handler, ctx, result)
 
-        # Collect applicable guards
-        applicable = [g for g in self._guards if g.enabled and g.should_apply(ctx)]
+        # Run post-hooks
+        if self._post_hooks:
+            self._run_post_hooks(ctx, result)
 
+        return result
+
+    def evaluate_sync(self, ctx: CallContext) -> GuardResult:
+        """Synchronous counterpart of evaluate().
+
+        When every applicable guard is a SyncGuard, guards run inline on the
+        calling thread without an event loop, stopping at the first DENY.
+        Otherwise the guards (and any approval handler) run on a shared
+        background event loop, or on a private one while another thread is
+        using it, so one slow evaluation does not hold up the others.
+        """
+        ctx, applicable = self._prepare(ctx)
         if not applicable:
-            logger.debug("No applicable guards for %s", ctx.function_name)
-            result = GuardResult([])
+            return self._without_guards(ctx)
+
+        if all(g.is_sync for _, g in applicable):
+            decisions = self._run_guards_sync(applicable, ctx)
+        else:
+            decisions = run_coroutine(self._run_guards(applicable, ctx))
+        result = self._conclude(ctx, applicable, decisions)
+
+        if result.needs_approval and self._approval_handler:
+            run_coroutine(self._request_approval(self._approval_handler, ctx, result))
+
+        if self._post_hooks:
             self._run_post_hooks(ctx, result)
-            return result
 
-        # Evaluate all guards concurrently
-        decisions = await asyncio.gather(
-            *(g.evaluate(ctx) for g in applicable),
-            return_exceptions=True,
-        )
+        return result
 
-        # Handle exceptions from individual guards
-        valid_decisions: list[Decision] = []
-        for guard, decision in zip(applicable, decisions, strict=True):
-            if isinstance(decision, Exception):
-                logger.error("Guard %s raised exception: %s", guard.name, decision)
-                # Fail-safe: treat guard errors as denials
-                valid_decisions.append(
-                    Decision(
-                        decision=DecisionType.DENY,
-                        guard_name=guard.name,
-                        reason=f"Guard error (fail-safe deny): {decision}",
-                        risk_score=1.0,
-                    )
-                )
-            else:
-                valid_decisions.append(decision)
-
-        result = GuardResult(valid_decisions)
-
-        logger.info(
-            "Evaluated %s: %s (guards=%d, risk=%.2f)",
-            ctx.function_name,
-            result.final_decision.decision.value,
-            len(applicable),
-            result.max_risk_score,
-        )
+    def _prepare(self, ctx: CallContext) -> tuple[CallContext, list[tuple[int, Guard]]]:
+        """Run pre-hooks and collect the guards that apply to the call.
+
+        Guards are returned cheapest first, paired with their registration index.
+        """
+        if self._pre_hooks:
+            for hook in self._pre_hooks:
+                updated = hook(ctx)
+                if updated is not None:
+                    ctx = updated
+        candidates = self._candidates.get(ctx.function_name)
+        if candidates is None:
+            candidates = self._candidates_for(ctx)
+        return ctx, [
+            (i, g)
+            for i, g, per_call in candidates
+            if g.enabled and (not per_call or g.should_apply(ctx))
+        ]
+
+    def _candidates_for(self, ctx: CallContext) -> list[tuple[int, Guard, bool]]:
+        """Resolve name-only applicability once per function name.
+
+        Guards whose `should_apply` may look beyond the function name stay in
+        the list and are checked on every call.
+        """
+        candidates: list[tuple[int, Guard, bool]] = []
+        for i, g in self._by_cost:
+            by_name = g.applies_by_function_name or type(g).should_apply is Guard.should_apply
+            if not by_name:
+                candidates.append((i, g, True))
+            elif g.should_apply(ctx):
+                candidates.append((i, g, False))
+        if len(self._candidates) >= self._MAX_APPLICABILITY_ENTRIES:
+            self._candidates = {}
+        self._candidates[ctx.function_name] = candidates
+        return candidates
+
+    def _without_guards(self, ctx: CallContext) -> GuardResult:
+        logger.debug("No applicable guards for %s", ctx.function_name)
+        result = GuardResult([])
+        if self._post_hooks:
+            self._run_post_hooks(ctx, result)
+        return result
+
+    def _conclude(
+        self,
+        ctx: CallContext,
+        applicable: list[tuple[int, Guard]],
+        decisions: list[Decision],
+    ) -> GuardResult:
+        """Fold decisions into a result, then log and emit the evaluation event."""
+        result = GuardResult(decisions)
+
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "Evaluated %s: %s (guards=%d, risk=%.2f)",
+                ctx.function_name,
+                result.final_decision.decision.value,
+                len(applicable),
+                result.max_risk_score,
+            )
 
-        # Emit real-time event
+        # Emit real-time event (skip building the payload when nobody listens)
+        if not self._has_listeners:
+            return result
         self._emit_event(
             {
                 "type": "evaluation",
@@ -241,52 +496,196 @@ class PolicyEngine:
                 "session_id": ctx.session_id,
                 "decision": result.final_decision.decision.value,
                 "risk_score": result.max_risk_score,
-                "reasons": [d.reason for d in valid_decisions if d.reason],
+                "reasons": [d.reason for d in decisions if d.reason],
                 "guard_count": len(applicable),
                 "timestamp": ctx.timestamp,
             }
         )
+        return result
 
-        # Auto-route to approval handler if wired in
-        if result.needs_approval and self._approval_handler:
-            from agenthalt.hil.approval import ApprovalRequest
+    async def _request_approval(
+        self, handler: ApprovalHandler, ctx: CallContext, result: GuardResult
+    ) -> None:
+        from agenthalt.hil.approval import ApprovalRequest
 
-            request = ApprovalRequest(
-                call_context=ctx,
-                decisions=result.decisions,
-                reason=result.final_decision.reason,
-                risk_score=result.max_risk_score,
-            )
-            response = await self._approval_handler.request_approval(request)
-            result.approved = response.approved
-            self._emit_event(
-                {
-                    "type": "approval",
-                    "call_id": ctx.call_id,
-                    "function_name": ctx.function_name,
-                    "approved": response.approved,
-                    "approver": response.approver,
-                    "reason": response.reason,
-                }
-            )
+        request = ApprovalRequest(
+            call_context=ctx,
+            decisions=result.decisions,
+            reason=result.final_decision.reason,
+            risk_score=result.max_risk_score,
+        )
+        response = await handler.request_approval(request)
+        result.approved = response.approved
+        if not self._has_listeners:
+            return
+        self._emit_event(
+            {
+                "type": "approval",
+                "call_id": ctx.call_id,
+                "function_name": ctx.function_name,
+                "approved": response.approved,
+                "approver": response.approver,
+                "reason": response.reason,
+            }
+        )
 
-        # Run post-hooks
-        self._run_post_hooks(ctx, result)
+    def _cached_decisions(
+        self, guards: list[tuple[int, Guard]], ctx: CallContext
+    ) -> tuple[dict[int, Decision], list[tuple[int, Guard]], Hashable]:
+        """Answer pure guards from the decision cache.
 
-        return result
+        Returns the cached decisions by guard index, the guards that still have
+        to run, and the key to store their decisions under (_UNCACHEABLE when
+        caching does not apply). A cached DENY leaves nothing to run.
+        """
+        cache = self._decision_cache
+        if cache is None or not any(g.pure for _, g in guards):
+            return {}, guards, _UNCACHEABLE
+        ctx_key = _context_key(ctx)
+        if ctx_key is _UNCACHEABLE:
+            return {}, guards, _UNCACHEABLE
+
+        key = (self._policy_epoch, ctx_key)
+        collected: dict[int, Decision] = {}
+        to_run: list[tuple[int, Guard]] = []
+        for i, guard in guards:
+            cached = cache.get((id(guard), key)) if guard.pure else None
+            if cached is None:
+                to_run.append((i, guard))
+                continue
+            collected[i] = cached = _unshared(cached)
+            if cached.decision == DecisionType.DENY:
+                return {i: cached}, [], key
+        return collected, to_run, key
+
+    def _store_decision(self, guard: Guard, key: Hashable, decision: Decision) -> None:
+        if guard.pure and key is not _UNCACHEABLE and self._decision_cache is not None:
+            self._decision_cache.put((id(guard), key), _unshared(decision))
+
+    @staticmethod
+    def _guard_error(guard: Guard, error: BaseException) -> Decision:
+        logger.error("Guard %s raised exception: %s", guard.name, error)
+        # Fail-safe: treat guard errors as denials
+        return _error_decision(guard.name, f"Guard error (fail-safe deny): {error}")
+
+    async def _run_guards_coalesced(
+        self, guards: list[tuple[int, Guard]], ctx: CallContext
+    ) -> list[Decision]:
+        """Share one guard pass between identical concurrent calls.
+
+        Only applies when every guard is pure, so the outcome depends on the
+        context alone. Callers that arrive while an identical pass is in flight
+        await its decisions instead of running the guards again.
+        """
+        if not all(g.pure for _, g in guards):
+            return await self._run_guards(guards, ctx)
+        ctx_key = _context_key(ctx)
+        if ctx_key is _UNCACHEABLE:
+            return await self._run_guards(guards, ctx)
+
+        loop = asyncio.get_running_loop()
+        flight_key = (loop, self._policy_epoch, ctx_key, tuple(i for i, _ in guards))
+        leader = self._inflight.get(flight_key)
+        if leader is not None:
+            shared = await asyncio.shield(leader)
+            if shared is not None:
+                return [_unshared(d) for d in shared]
+            # The leader failed or was cancelled; evaluate independently
+            return await self._run_guards(guards, ctx)
+
+        future: asyncio.Future[list[Decision] | None] = loop.create_future()
+        self._inflight[flight_key] = future
+        decisions: list[Decision] | None = None
+        try:
+            decisions = await self._run_guards(guards, ctx)
+            return decisions
+        finally:
+            del self._inflight[flight_key]
+            future.set_result(decisions)
+
+    async def _run_guards(
+        self, guards: list[tuple[int, Guard]], ctx: CallContext
+    ) -> list[Decision]:
+        """Run guards concurrently, short-circuiting on the first DENY.
+
+        Decisions are returned in guard registration order so the folded
+        final decision is deterministic regardless of completion order.
+        Pure guards are answered from the decision cache when possible, and
+        sync guards run inline before any task is scheduled.
+        """
+        collected, to_run, key = self._cached_decisions(guards, ctx)
+        async_guards: list[tuple[int, Guard]] = []
+        for index, guard in to_run:
+            if not guard.is_sync:
+                async_guards.append((index, guard))
+                continue
+            decision = self._evaluate_inline(guard, ctx, key)
+            collected[index] = decision
+            if decision.decision == DecisionType.DENY:
+                return [collected[i] for i in sorted(collected)]
+
+        tasks = {asyncio.ensure_future(g.evaluate(ctx)): (i, g) for i, g in async_guards}
+        pending: set[asyncio.Future[Decision]] = set(tasks)
 
-    def evaluate_sync(self, ctx: CallContext) -> GuardResult:
-        """Synchronous wrapper around evaluate()."""
         try:
-            asyncio.get_running_loop()
-        except RuntimeError:
-            return asyncio.run(self.evaluate(ctx))
-        else:
-            import concurrent.futures
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                denied = False
+                for task in done:
+                    index, guard = tasks[task]
+                    error = task.exception()
+                    if error is not None:
+                        decision = self._guard_error(guard, error)
+                    else:
+                        decision = task.result()
+                        self._store_decision(guard, key, decision)
+                    collected[index] = decision
+                    denied = denied or decision.decision == DecisionType.DENY
+                if denied:
+                    break
+        finally:
+            # Cancel guards that are still running after a denial (or if we were cancelled)
+            if pending:
+                for task in pending:
+                    task.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        return [collected[i] for i in sorted(collected)]
+
+    def _run_guards_sync(self, guards: list[tuple[int, Guard]], ctx: CallContext) -> list[Decision]:
+        """Run sync guards inline, cheapest first, stopping at the first DENY."""
+        collected, to_run, key = self._cached_decisions(guards, ctx)
+        for index, guard in to_run:
+            decision = self._evaluate_inline(guard, ctx, key)
+            collected[index] = decision
+            if decision.decision == DecisionType.DENY:
+                break
+        return [collected[i] for i in sorted(collected)]
+
+    def _evaluate_inline(self, guard: Guard, ctx: CallContext, key: Hashable) -> Decision:
+        try:
+            decision = guard.evaluate_sync(ctx)
+        except Exception as error:
+            return self._guard_error(guard, error)
+        self._store_decision(guard, key, decision)
+        return decision
+
+    async def evaluate_batch(self, contexts: Sequence[CallContext]) -> list[GuardResult]:
+        """Evaluate many function calls, returning one result per context in order.
+
+        Calls are evaluated one after another so stateful guards (budget, rate
+        limit) observe them in the given order. Repeated identical calls reuse
+        the cached decisions of pure guards.
+        """
+        return [await self.evaluate(ctx) for ctx in contexts]
 
-            with concurrent.futures.ThreadPoolExecutor() as pool:
-                future = pool.submit(asyncio.run, self.evaluate(ctx))
-                return future.result()
+    def evaluate_batch_sync(self, contexts: Sequence[CallContext]) -> list[GuardResult]:
+        """Synchronous wrapper around evaluate_batch().
+
+        The whole batch shares a single event loop round-trip instead of
+        paying for one per call as repeated evaluate_sync() calls would.
+        """
+        return run_coroutine(self.evaluate_batch(contexts))
 
     def _run_post_hooks(self, ctx: CallContext, result: GuardResult) -> None:
         for hook in self._post_hooks:
@@ -2,10 +2,10 @@
 
 from __future__ import annotations
 
-import asyncio
 from abc import ABC, abstractmethod
 from typing import Any
 
+from agenthalt.core._loop import run_coroutine
 from agenthalt.core.context import CallContext
 from agenthalt.core.decision import Decision, DecisionType
 
@@ -25,11 +25,33 @@ class Guard(ABC):
                 if ctx.function_name == "dangerous_thing":
                     return self.deny("This is too dangerous")
                 return self.allow()
+
+    Set the class attribute `pure = True` on guards whose decision depends only
+    on the call context (no internal state, no I/O). The PolicyEngine may then
+    cache their decisions for repeated identical calls, keyed by the context's
+    function_name, agent_id, session_id, arguments and metadata; a pure guard
+    must not read call_id or timestamp.
+
+    Guards that never await should subclass `SyncGuard` instead.
+
+    Set `applies_by_function_name = True` when `should_apply` looks only at
+    `ctx.function_name`; the PolicyEngine then resolves it once per name.
+
+    `cost_hint` orders evaluation: the PolicyEngine starts cheaper guards first
+    so a cheap denial can skip expensive checks. Decisions are still reported
+    in registration order.
     """
 
+    pure: bool = False
+    is_sync: bool = False
+    cost_hint: int = 5
+    applies_by_function_name: bool = False
+
     def __init__(self, name: str, *, enabled: bool = True) -> None:
         self._name = name
         self._enabled = enabled
+        # Most evaluations end in a plain ALLOW; share one instance for them
+        self._plain_allow = Decision(decision=DecisionType.ALLOW, guard_name=name)
 
     @property
     def name(self) -> str:
@@ -51,6 +73,15 @@ class Guard(ABC):
         """
         return True
 
+    def reconfigure(self) -> None:
+        """Rebuild any state the guard derived from its config.
+
+        Guards that precompile their config (patterns, flags) override this and
+        call it from ``__init__``; call it (or ``PolicyEngine.invalidate_caches()``)
+        after editing a guard's config in place. Default: nothing to rebuild.
+        """
+        return None
+
     @abstractmethod
     async def evaluate(self, ctx: CallContext) -> Decision:
         """Evaluate a function call and return a decision.
@@ -60,21 +91,18 @@ class Guard(ABC):
         ...
 
     def evaluate_sync(self, ctx: CallContext) -> Decision:
-        """Synchronous wrapper around evaluate()."""
-        import concurrent.futures
-
-        try:
-            asyncio.get_running_loop()
-        except RuntimeError:
-            return asyncio.run(self.evaluate(ctx))
-        else:
-            with concurrent.futures.ThreadPoolExecutor(max_workers=1) as pool:
-                future = pool.submit(asyncio.run, self.evaluate(ctx))
-                return future.result()
+        """Synchronous wrapper around evaluate().
+
+        Runs on the shared background event loop, or on a private one while
+        another thread is using it.
+        """
+        return run_coroutine(self.evaluate(ctx))
 
     # ── Helper factories for building decisions ──────────────────────
 
     def allow(self, reason: str = "") -> Decision:
+        if not reason:
+            return self._plain_allow
         return Decision(
             decision=DecisionType.ALLOW,
             guard_name=self._name,
@@ -120,3 +148,32 @@ class Guard(ABC):
 
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}(name={self._name!r}, enabled={self._enabled})"
+
+
+class SyncGuard(Guard):
+    """Base class for guards whose checks never await (no I/O).
+
+    Implement `evaluate_sync` instead of `evaluate`. `PolicyEngine.evaluate_sync`
+    calls it directly, without going through an event loop, and `evaluate`
+    simply delegates to it.
+
+    Example:
+        class MyGuard(SyncGuard):
+            def __init__(self):
+                super().__init__(name="my_guard")
+
+            def evaluate_sync(self, ctx: CallContext) -> Decision:
+                if ctx.function_name == "dangerous_thing":
+                    return self.deny("This is too dangerous")
+                return self.allow()
+    """
+
+    is_sync = True
+
+    @abstractmethod
+    def evaluate_sync(self, ctx: CallContext) -> Decision:
+        """Evaluate a function call and return a decision, synchronously."""
+        ...
+
+    async def evaluate(self, ctx: CallContext) -> Decision:
+        return self.evaluate_sync(ctx)
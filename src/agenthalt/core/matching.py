@@ -0,0 +1,131 @@
+"""Name matching — compile glob and keyword lists once, match many times."""
+
+from __future__ import annotations
+
+import fnmatch
+import os
+import re
+from collections.abc import Iterable
+
+_MAGIC = frozenset("*?[")
+
+# fnmatch.fnmatch() normalizes case on case-insensitive platforms (Windows)
+_FOLD_CASE = os.path.normcase("A") != "A"
+
+
+def _has_magic(pattern: str) -> bool:
+    return any(c in _MAGIC for c in pattern)
+
+
+class GlobMatcher:
+    """Matches names against a fixed list of fnmatch-style glob patterns.
+
+    Patterns are classified once at construction:
+    - literals without wildcards go into a frozenset (one hash lookup),
+    - plain prefix patterns like "drop_*" become a tuple for str.startswith,
+    - plain suffix patterns like "*_backup" become a tuple for str.endswith,
+    - everything else is translated and joined into a single compiled regex.
+
+    Matching semantics are identical to `fnmatch.fnmatch` against each pattern.
+    For `first_match`, all patterns are also joined in configured order into one
+    regex with a named group per pattern; the group that matched names the
+    pattern, so a hit costs one regex call rather than one per pattern.
+
+    Usage:
+        matcher = GlobMatcher(["drop_*", "format_*", "send_email"])
+        matcher.matches("drop_table")  # True
+    """
+
+    __slots__ = ("patterns", "_literals", "_prefixes", "_suffixes", "_regex", "_ordered")
+
+    def __init__(self, patterns: Iterable[str]) -> None:
+        self.patterns: tuple[str, ...] = tuple(patterns)
+
+        literals: set[str] = set()
+        prefixes: list[str] = []
+        suffixes: list[str] = []
+        globs: list[str] = []
+        for pattern in self.patterns:
+            pattern = os.path.normcase(pattern)
+            if not _has_magic(pattern):
+                literals.add(pattern)
+            elif pattern.endswith("*") and not _has_magic(pattern[:-1]):
+                prefixes.append(pattern[:-1])
+            elif pattern.startswith("*") and not _has_magic(pattern[1:]):
+                suffixes.append(pattern[1:])
+            else:
+                globs.append(pattern)
+
+        self._literals = frozenset(literals)
+        self._prefixes = tuple(prefixes)
+        self._suffixes = tuple(suffixes)
+        self._regex = (
+            re.compile("|".join(f"(?:{fnmatch.translate(g)})" for g in globs)).match
+            if globs
+            else None
+        )
+        # Alternatives are tried left to right and each is anchored at the end,
+        # so the first group to match is the first matching pattern
+        self._ordered = re.compile(
+            "|".join(
+                f"(?P<_p{i}>{fnmatch.translate(os.path.normcase(p))})"
+                for i, p in enumerate(self.patterns)
+            )
+        ).match
+
+    def __bool__(self) -> bool:
+        return bool(self.patterns)
+
+    def matches(self, name: str) -> bool:
+        """Return True if name matches any of the patterns."""
+        if _FOLD_CASE:
+            name = os.path.normcase(name)
+        return (
+            name in self._literals
+            or name.startswith(self._prefixes)
+            or name.endswith(self._suffixes)
+            or (self._regex is not None and self._regex(name) is not None)
+        )
+
+    def first_match(self, name: str) -> str | None:
+        """Return the first pattern (in configured order) that matches name, if any."""
+        if not self.matches(name):
+            return None
+        if _FOLD_CASE:
+            name = os.path.normcase(name)
+        match = self._ordered(name)
+        # The outermost group closes last, so lastgroup is the pattern's group
+        return self.patterns[int(match.lastgroup[2:])] if match and match.lastgroup else None
+
+    def __repr__(self) -> str:
+        return f"GlobMatcher({list(self.patterns)!r})"
+
+
+class KeywordMatcher:
+    """Tests whether a text contains any of a fixed list of substrings.
+
+    Equivalent to `any(word in text for word in words)`, with the words joined
+    into one compiled alternation so a call is a single regex search.
+
+    Usage:
+        matcher = KeywordMatcher(["delete", "remove"])
+        matcher.matches("bulk_delete_files")  # True
+    """
+
+    __slots__ = ("words", "_search")
+
+    def __init__(self, words: Iterable[str]) -> None:
+        self.words: tuple[str, ...] = tuple(words)
+        self._search = (
+            re.compile("|".join(re.escape(w) for w in self.words)).search if self.words else None
+        )
+
+    def __bool__(self) -> bool:
+        return bool(self.words)
+
+    def matches(self, text: str) -> bool:
+        """Return True if any word occurs in text."""
+        return self._search is not None and self._search(text) is not None
+
+    def __repr__(self) -> str:
+        return f"KeywordMatcher({list(self.words)!r})"
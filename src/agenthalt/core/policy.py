@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 from enum import Enum
+from operator import attrgetter
 from typing import Any
 
 from pydantic import BaseModel, Field
@@ -46,6 +47,9 @@ class Policy(BaseModel):
     model_config = {"frozen": True}
 
 
+_by_priority = attrgetter("priority")
+
+
 class PolicySet(BaseModel):
     """An ordered collection of policies evaluated as a group.
 
@@ -64,7 +68,7 @@ class PolicySet(BaseModel):
             update={
                 "policies": sorted(
                     [*self.policies, policy],
-                    key=lambda p: p.priority,
+                    key=_by_priority,
                     reverse=True,
                 )
             }
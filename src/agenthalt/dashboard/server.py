@@ -1,4 +1,4 @@
-"""AgentHalt Real-Time Dashboard — Flask + SocketIO server.
+"""AgentHalt Real-Time Dashboard — Flask + SocketIO server, or an asyncio ASGI app.
 
 Provides a live monitoring dashboard showing:
 - Real-time guard evaluations as they happen
@@ -6,55 +6,153 @@ Provides a live monitoring dashboard showing:
 - Rate limit and loop detection alerts
 - Approval request queue
 - Audit log with filtering
+
+`create_app`/`run_dashboard` run the Flask server (in its own thread or process).
+`create_asgi_app`/`serve_dashboard` run python-socketio's asyncio server on the
+caller's event loop, so events from `engine.evaluate` are broadcast without a
+thread hop.
 """
 
 from __future__ import annotations
 
+import asyncio
+import json
 import logging
 import time
+from collections import deque
+from itertools import islice
 from pathlib import Path
 from typing import Any
 
 logger = logging.getLogger("agenthalt.dashboard")
 
-# Track events for the dashboard
-_event_buffer: list[dict[str, Any]] = []
+# Track events for the dashboard (oldest events fall off the left)
 _event_buffer_max = 1000
+_event_buffer: deque[dict[str, Any]] = deque(maxlen=_event_buffer_max)
+# Bumped on every recorded event; keys the cached /api/events body
+_event_version = 0
+_events_body: tuple[int, bytes] = (-1, b"")
 _stats: dict[str, Any] = {
     "total_evaluations": 0,
     "total_allowed": 0,
     "total_denied": 0,
     "total_approvals": 0,
+    "dropped_broadcasts": 0,
     "start_time": time.time(),
 }
 _socketio: Any = None
+_async_sio: Any = None
+_async_loop: asyncio.AbstractEventLoop | None = None
+# Broadcasts waiting for the asyncio server's single writer task
+_outbox_max = 1000
+_outbox: asyncio.Queue[tuple[str, Any]] | None = None
+_outbox_writer: asyncio.Task[None] | None = None
+
+
+def _broadcast(name: str, payload: Any) -> None:
+    """Send an event to every connected client of whichever server is running."""
+    if _socketio is not None:
+        _socketio.emit(name, payload)
+    loop = _async_loop
+    if _outbox is not None and loop is not None and not loop.is_closed():
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            _enqueue(name, payload)
+        else:
+            # Called from another thread (e.g. evaluate_sync); hand over to the server loop
+            loop.call_soon_threadsafe(_enqueue, name, payload)
+
+
+def _enqueue(name: str, payload: Any) -> None:
+    """Queue a broadcast for the writer task, dropping it if clients cannot keep up."""
+    if _outbox is None:
+        return
+    try:
+        _outbox.put_nowait((name, payload))
+    except asyncio.QueueFull:
+        _stats["dropped_broadcasts"] += 1
+
+
+async def _write_outbox(sio: Any, outbox: asyncio.Queue[tuple[str, Any]]) -> None:
+    """Send queued broadcasts in order, one at a time."""
+    while True:
+        name, payload = await outbox.get()
+        try:
+            await sio.emit(name, payload)
+        except Exception as e:
+            logger.error("Dashboard broadcast error: %s", e)
+
+
+def _recent_events(limit: int = 50) -> list[dict[str, Any]]:
+    """Return the last `limit` buffered events, oldest first."""
+    return list(islice(_event_buffer, max(len(_event_buffer) - limit, 0), None))
+
+
+# Stats counter bumped for each evaluation decision (modify has none)
+_DECISION_COUNTERS: dict[Any, str] = {
+    "allow": "total_allowed",
+    "deny": "total_denied",
+    "require_approval": "total_approvals",
+}
+
+
+def _recent_events_json() -> bytes:
+    """JSON body for /api/events, encoded once per change rather than per request."""
+    global _events_body
+    version, body = _events_body
+    if version != _event_version:
+        version = _event_version
+        body = json.dumps(_recent_events()).encode()
+        _events_body = (version, body)
+    return body
+
+
+def _record(event: dict[str, Any]) -> None:
+    """Buffer an event and update the counters."""
+    global _event_version
+    _event_buffer.append(event)
+    _event_version += 1
+
+    # Update stats
+    if event.get("type") == "evaluation":
+        _stats["total_evaluations"] += 1
+        counter = _DECISION_COUNTERS.get(event.get("decision"))
+        if counter is not None:
+            _stats[counter] += 1
+
+
+def _event_listener(event: dict[str, Any]) -> None:
+    _record(event)
+    # Broadcast to all connected SocketIO clients
+    _broadcast("event", event)
+
+
+def _batch_listener(events: list[dict[str, Any]]) -> None:
+    for event in events:
+        _record(event)
+    _broadcast("events", events)
 
 
 def create_event_listener():
-    """Create an event listener function for PolicyEngine.add_event_listener()."""
+    """Return the event listener function for PolicyEngine.add_event_listener().
 
-    def listener(event: dict[str, Any]) -> None:
-        global _event_buffer
-        _event_buffer.append(event)
-        if len(_event_buffer) > _event_buffer_max:
-            _event_buffer = _event_buffer[-_event_buffer_max:]
+    The listener only touches module state, so every call returns the same
+    function and registering it on an engine twice is a no-op.
+    """
+    return _event_listener
 
-        # Update stats
-        if event.get("type") == "evaluation":
-            _stats["total_evaluations"] += 1
-            decision = event.get("decision", "")
-            if decision == "allow":
-                _stats["total_allowed"] += 1
-            elif decision == "deny":
-                _stats["total_denied"] += 1
-            elif decision == "require_approval":
-                _stats["total_approvals"] += 1
 
-        # Broadcast to all connected SocketIO clients
-        if _socketio is not None:
-            _socketio.emit("event", event)
+def create_batch_listener():
+    """Return the listener for PolicyEngine.add_event_listener(..., batch=True).
 
-    return listener
+    Each batch reaches clients as a single "events" message, so encoding and
+    frame overhead are paid once per flush rather than once per evaluation.
+    Like `create_event_listener`, it always returns the same function.
+    """
+    return _batch_listener
 
 
 def create_app(engine: Any = None) -> Any:
@@ -77,7 +175,7 @@ def create_app(engine: Any = None) -> Any:
     _socketio = socketio
 
     if engine is not None:
-        engine.add_event_listener(create_event_listener())
+        engine.add_event_listener(create_batch_listener(), batch=True)
 
     @app.route("/")
     def index():
@@ -93,15 +191,14 @@ def create_app(engine: Any = None) -> Any:
 
     @app.route("/api/events")
     def get_events():
-        return jsonify(_event_buffer[-50:])
+        return app.response_class(_recent_events_json(), mimetype="application/json")
 
     @socketio.on("connect")
     def on_connect():
         logger.info("Dashboard client connected")
         # Send initial stats + recent events on connect
         socketio.emit("stats", _stats)
-        for event in _event_buffer[-50:]:
-            socketio.emit("event", event)
+        socketio.emit("events", _recent_events())
 
     @socketio.on("ping")
     def on_ping():
@@ -124,3 +221,103 @@ def run_dashboard(
     app, socketio = create_app(engine)
     print(f"\n🛡️  AgentHalt Dashboard: http://{host}:{port}\n")
     socketio.run(app, host=host, port=port, debug=False, allow_unsafe_werkzeug=True)
+
+
+def create_asgi_app(engine: Any = None) -> Any:
+    """Create the dashboard as an ASGI app backed by python-socketio's AsyncServer.
+
+    Must be served from the event loop that runs the engine (see `serve_dashboard`).
+    """
+    global _async_sio
+
+    try:
+        import socketio
+    except ImportError as err:
+        raise ImportError(
+            "The asyncio dashboard requires python-socketio. "
+            "Install with: pip install python-socketio uvicorn"
+        ) from err
+
+    sio = socketio.AsyncServer(async_mode="asgi", cors_allowed_origins="*")
+    _async_sio = sio
+
+    if engine is not None:
+        engine.add_event_listener(create_batch_listener(), batch=True)
+
+    @sio.event
+    async def connect(sid: str, environ: dict[str, Any]) -> None:
+        logger.info("Dashboard client connected")
+        # Send initial stats + recent events on connect
+        await sio.emit("stats", _stats, to=sid)
+        await sio.emit("events", _recent_events(), to=sid)
+
+    @sio.on("ping")
+    async def on_ping(sid: str, *args: Any) -> None:
+        await sio.emit("pong", {"timestamp": time.time()}, to=sid)
+
+    return socketio.ASGIApp(sio, other_asgi_app=_http_app)
+
+
+async def _http_app(scope: dict[str, Any], receive: Any, send: Any) -> None:
+    """Minimal ASGI app serving the dashboard page and its JSON endpoints."""
+    global _async_loop, _outbox, _outbox_writer
+
+    if scope["type"] == "lifespan":
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                _outbox = asyncio.Queue(maxsize=_outbox_max)
+                _outbox_writer = asyncio.create_task(_write_outbox(_async_sio, _outbox))
+                _async_loop = asyncio.get_running_loop()
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                _async_loop = _outbox = None
+                if _outbox_writer is not None:
+                    _outbox_writer.cancel()
+                    _outbox_writer = None
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    path = scope.get("path", "/")
+    status = 200
+    if path == "/":
+        body = (Path(__file__).parent / "templates" / "dashboard.html").read_bytes()
+        content_type = b"text/html; charset=utf-8"
+    elif path == "/api/stats":
+        uptime = time.time() - _stats["start_time"]
+        stats = {**_stats, "uptime_seconds": uptime, "buffer_size": len(_event_buffer)}
+        body = json.dumps(stats).encode()
+        content_type = b"application/json"
+    elif path == "/api/events":
+        body = _recent_events_json()
+        content_type = b"application/json"
+    else:
+        status, body, content_type = 404, b"Not Found", b"text/plain"
+
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(b"content-type", content_type)],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
+
+
+async def serve_dashboard(engine: Any = None, host: str = "127.0.0.1", port: int = 8550) -> None:
+    """Serve the dashboard on the running event loop until cancelled.
+
+    Usage:
+        server = asyncio.create_task(serve_dashboard(engine))
+    """
+    try:
+        import uvicorn
+    except ImportError as err:
+        raise ImportError(
+            "The asyncio dashboard requires uvicorn. "
+            "Install with: pip install python-socketio uvicorn"
+        ) from err
+
+    app = create_asgi_app(engine)
+    config = uvicorn.Config(app, host=host, port=port, log_level="warning", lifespan="on")
+    await uvicorn.Server(config).serve()
@@ -2,7 +2,6 @@
 
 from __future__ import annotations
 
-import asyncio
 import functools
 import inspect
 from collections.abc import Callable
@@ -66,22 +65,33 @@ def guarded(
     """
 
     def decorator(func: F) -> F:
-        if asyncio.iscoroutinefunction(func):
+        # Reflect on the function once; every call reuses the same signature
+        binder = _ArgumentBinder(inspect.signature(func))
+        function_name = func.__name__
+        # Reject bad fixed context fields when decorating rather than on first call
+        CallContext(function_name=function_name, agent_id=agent_id, session_id=session_id)
+        # Bind exception classes as closure locals rather than module globals
+        blocked, needs_approval = GuardedCallBlocked, GuardedCallNeedsApproval
+
+        # The function kind is fixed, so pick the wrapper here rather than per call
+        if inspect.iscoroutinefunction(func):
 
             @functools.wraps(func)
             async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
                 # Build call context from function signature
-                ctx = _build_context(func, args, kwargs, agent_id=agent_id, session_id=session_id)
+                ctx = _build_context(
+                    function_name, binder, args, kwargs, agent_id=agent_id, session_id=session_id
+                )
                 result = await engine.evaluate(ctx)
 
                 if result.is_denied:
                     if raise_on_deny:
-                        raise GuardedCallBlocked(result)
+                        raise blocked(result)
                     return None
 
                 if result.needs_approval:
                     if raise_on_approval:
-                        raise GuardedCallNeedsApproval(result)
+                        raise needs_approval(result)
                     return None
 
                 # If arguments were modified, apply them
@@ -95,17 +105,19 @@ def guarded(
 
             @functools.wraps(func)
             def sync_wrapper(*args: Any, **kwargs: Any) -> Any:
-                ctx = _build_context(func, args, kwargs, agent_id=agent_id, session_id=session_id)
+                ctx = _build_context(
+                    function_name, binder, args, kwargs, agent_id=agent_id, session_id=session_id
+                )
                 result = engine.evaluate_sync(ctx)
 
                 if result.is_denied:
                     if raise_on_deny:
-                        raise GuardedCallBlocked(result)
+                        raise blocked(result)
                     return None
 
                 if result.needs_approval:
                     if raise_on_approval:
-                        raise GuardedCallNeedsApproval(result)
+                        raise needs_approval(result)
                     return None
 
                 if result.modified_arguments is not None:
@@ -118,8 +130,72 @@ def guarded(
     return decorator  # type: ignore[return-value]
 
 
+_PLAIN_KINDS = (inspect.Parameter.POSITIONAL_OR_KEYWORD, inspect.Parameter.KEYWORD_ONLY)
+
+
+class _ArgumentBinder:
+    """Maps a call's arguments to parameter names for one function signature.
+
+    Equivalent to `Signature.bind(*args, **kwargs)` followed by
+    `apply_defaults()`. Plain signatures (no *args, **kwargs or positional-only
+    parameters) are bound by zipping names with values; anything else, including
+    calls that would fail to bind, goes through `Signature.bind` so results and
+    errors stay identical.
+
+    `receivers` names the `self`/`cls` parameters, if any, that callers leave
+    out of the call context.
+    """
+
+    __slots__ = (
+        "_sig",
+        "_names",
+        "_name_set",
+        "_positional",
+        "_defaults",
+        "_plain",
+        "receivers",
+    )
+
+    def __init__(self, sig: inspect.Signature) -> None:
+        params = sig.parameters.values()
+        self._sig = sig
+        self._names = tuple(sig.parameters)
+        self._name_set = frozenset(self._names)
+        self._positional = tuple(
+            p.name for p in params if p.kind is inspect.Parameter.POSITIONAL_OR_KEYWORD
+        )
+        self._defaults = {p.name: p.default for p in params if p.default is not p.empty}
+        self._plain = all(p.kind in _PLAIN_KINDS for p in params)
+        self.receivers = tuple(name for name in ("self", "cls") if name in self._name_set)
+
+    def bind(self, args: tuple[Any, ...], kwargs: dict[str, Any]) -> dict[str, Any]:
+        if self._plain and len(args) <= len(self._positional):
+            # Fewer args than names: zip stops at the last argument
+            supplied = dict(zip(self._positional, args, strict=False))
+            clean = not kwargs or (
+                kwargs.keys() <= self._name_set and supplied.keys().isdisjoint(kwargs)
+            )
+            if clean:
+                supplied.update(kwargs)
+                defaults = self._defaults
+                arguments: dict[str, Any] = {}
+                for name in self._names:
+                    if name in supplied:
+                        arguments[name] = supplied[name]
+                    elif name in defaults:
+                        arguments[name] = defaults[name]
+                    else:
+                        break  # missing required argument: let bind() raise
+                else:
+                    return arguments
+        bound = self._sig.bind(*args, **kwargs)
+        bound.apply_defaults()
+        return dict(bound.arguments)
+
+
 def _build_context(
-    func: Callable[..., Any],
+    function_name: str,
+    binder: _ArgumentBinder,
     args: tuple[Any, ...],
     kwargs: dict[str, Any],
     *,
@@ -127,17 +203,16 @@ def _build_context(
     session_id: str | None = None,
 ) -> CallContext:
     """Build a CallContext from a function call's arguments."""
-    sig = inspect.signature(func)
-    bound = sig.bind(*args, **kwargs)
-    bound.apply_defaults()
-    arguments = dict(bound.arguments)
+    arguments = binder.bind(args, kwargs)
 
-    # Remove 'self' and 'cls' from arguments
-    arguments.pop("self", None)
-    arguments.pop("cls", None)
+    # Remove 'self' and 'cls' from arguments (known per signature; usually none)
+    for name in binder.receivers:
+        del arguments[name]
 
+    # Plain construction: pydantic-core validation of these few fields is cheaper
+    # than model_construct, which re-inspects every default_factory per call
     return CallContext(
-        function_name=func.__name__,
+        function_name=function_name,
         arguments=arguments,
         agent_id=agent_id,
         session_id=session_id,
@@ -2,15 +2,17 @@
 
 from __future__ import annotations
 
+import calendar
 import threading
 import time
+from collections import OrderedDict, deque
 from typing import Any
 
 from pydantic import BaseModel, Field
 
 from agenthalt.core.context import CallContext
 from agenthalt.core.decision import Decision
-from agenthalt.core.guard import Guard
+from agenthalt.core.guard import SyncGuard
 
 
 class BudgetConfig(BaseModel):
@@ -25,6 +27,11 @@ class BudgetConfig(BaseModel):
         default_cost: Default cost to assume if no cost field is present.
         warn_threshold: Fraction of budget at which to require approval (e.g., 0.8 = 80%).
         cost_estimator: Optional mapping of function_name -> estimated cost.
+        history_size: Number of recent (cost, session_id, timestamp) records to keep
+            in memory for inspection. Default 0 keeps none.
+        max_tracked_sessions: Number of sessions whose spend is remembered. Beyond
+            this, the least recently charged session is forgotten (its spend restarts
+            at zero).
     """
 
     max_call_cost: float | None = None
@@ -35,50 +42,71 @@ class BudgetConfig(BaseModel):
     default_cost: float = 0.01
     warn_threshold: float = 0.8
     cost_estimator: dict[str, float] = Field(default_factory=dict)
+    history_size: int = 0
+    max_tracked_sessions: int = 100_000
+
+
+# Session totals are guarded by one of a fixed set of striped locks so that
+# evaluations for different sessions don't queue behind each other
+_SESSION_LOCK_STRIPES = 64
 
 
 class SpendingTracker:
-    """Thread-safe tracker for cumulative spending."""
+    """Thread-safe tracker for cumulative spending.
+
+    Per-session totals are protected by striped session locks; daily/monthly
+    totals and the call history by the global ``lock``. When both are needed,
+    take the session lock first.
+    """
 
-    def __init__(self) -> None:
+    def __init__(self, history_size: int = 0, max_sessions: int = 100_000) -> None:
         self._lock = threading.Lock()
-        self._session_spend: dict[str, float] = {}  # session_id -> total
+        self._session_locks = tuple(threading.Lock() for _ in range(_SESSION_LOCK_STRIPES))
+        # session_id -> total, least recently charged first
+        self._session_spend: OrderedDict[str, float] = OrderedDict()
+        self._max_sessions = max_sessions
         self._daily_spend: float = 0.0
         self._monthly_spend: float = 0.0
         self._daily_reset: float = self._next_day_boundary()
         self._monthly_reset: float = self._next_month_boundary()
-        self._call_history: list[dict[str, Any]] = []
+        # Bounded and opt-in: the guard itself never reads it
+        self._call_history: deque[tuple[float, str | None, float]] | None = (
+            deque(maxlen=history_size) if history_size > 0 else None
+        )
 
     @property
     def lock(self) -> threading.Lock:
-        """Expose lock for atomic check-and-record in guards."""
+        """Expose the global lock for atomic check-and-record in guards."""
         return self._lock
 
+    def session_lock(self, session_id: str | None) -> threading.Lock:
+        """Lock protecting the spend total of ``session_id``."""
+        return self._session_locks[hash(session_id) % _SESSION_LOCK_STRIPES]
+
     def record_unlocked(self, cost: float, session_id: str | None = None) -> None:
-        """Record spending. Caller MUST hold self.lock."""
+        """Record spending. Caller MUST hold the session lock and self.lock."""
         self._maybe_reset()
         self._daily_spend += cost
         self._monthly_spend += cost
         if session_id:
-            self._session_spend[session_id] = self._session_spend.get(session_id, 0.0) + cost
-        self._call_history.append(
-            {
-                "cost": cost,
-                "session_id": session_id,
-                "timestamp": time.time(),
-            }
-        )
+            spend = self._session_spend
+            spend[session_id] = spend.get(session_id, 0.0) + cost
+            spend.move_to_end(session_id)
+            if len(spend) > self._max_sessions:
+                spend.popitem(last=False)
+        if self._call_history is not None:
+            self._call_history.append((cost, session_id, time.time()))
 
     def record(self, cost: float, session_id: str | None = None) -> None:
-        with self._lock:
+        with self.session_lock(session_id), self._lock:
             self.record_unlocked(cost, session_id)
 
     def get_session_spend(self, session_id: str) -> float:
-        with self._lock:
-            return self._session_spend.get(session_id, 0.0)
+        # A single dict read is atomic; no lock needed
+        return self._session_spend.get(session_id, 0.0)
 
     def get_session_spend_unlocked(self, session_id: str) -> float:
-        """Get session spend. Caller MUST hold self.lock."""
+        """Get session spend. Caller MUST hold the session lock."""
         return self._session_spend.get(session_id, 0.0)
 
     @property
@@ -108,10 +136,13 @@ class SpendingTracker:
             self._session_spend.clear()
             self._daily_spend = 0.0
             self._monthly_spend = 0.0
-            self._call_history.clear()
+            if self._call_history is not None:
+                self._call_history.clear()
 
     def _maybe_reset(self) -> None:
         now = time.time()
+        if now < self._daily_reset and now < self._monthly_reset:
+            return
         if now >= self._daily_reset:
             self._daily_spend = 0.0
             self._daily_reset = self._next_day_boundary()
@@ -121,35 +152,26 @@ class SpendingTracker:
 
     @staticmethod
     def _next_day_boundary() -> float:
-        import datetime
-
-        tomorrow = datetime.datetime.now(datetime.timezone.utc).replace(
-            hour=0, minute=0, second=0, microsecond=0
-        ) + datetime.timedelta(days=1)
-        return tomorrow.timestamp()
+        # UTC days are exactly 86400 epoch seconds (POSIX time ignores leap seconds)
+        return float((int(time.time()) // 86400 + 1) * 86400)
 
     @staticmethod
     def _next_month_boundary() -> float:
-        import datetime
-
-        now = datetime.datetime.now(datetime.timezone.utc)
-        if now.month == 12:
-            first_next = now.replace(
-                year=now.year + 1, month=1, day=1, hour=0, minute=0, second=0, microsecond=0
-            )
+        year, month = time.gmtime()[:2]
+        if month == 12:
+            year, month = year + 1, 1
         else:
-            first_next = now.replace(
-                month=now.month + 1, day=1, hour=0, minute=0, second=0, microsecond=0
-            )
-        return first_next.timestamp()
+            month += 1
+        return float(calendar.timegm((year, month, 1, 0, 0, 0)))
 
 
-class BudgetGuard(Guard):
+class BudgetGuard(SyncGuard):
     """Guard that prevents overspending on API calls.
 
     Tracks cumulative spending per session, per day, and per month.
     Denies calls that would exceed configured budgets and requires
-    approval when spend approaches the warning threshold.
+    approval when spend approaches the warning threshold. Spending is only
+    tracked when a cumulative limit (or history_size) is configured.
 
     Usage:
         guard = BudgetGuard(BudgetConfig(
@@ -160,90 +182,121 @@ class BudgetGuard(Guard):
         ))
     """
 
+    cost_hint = 4
+
     def __init__(self, config: BudgetConfig) -> None:
         super().__init__(name="budget")
         self.config = config
-        self.tracker = SpendingTracker()
+        self.tracker = SpendingTracker(config.history_size, config.max_tracked_sessions)
+        self.reconfigure()
+
+    def reconfigure(self) -> None:
+        """Re-read the limits and costs from ``self.config``.
+
+        Call this (or ``PolicyEngine.invalidate_caches()``) after editing the
+        config in place. The tracker keeps its spend and its sizes.
+        """
+        config = self.config
+        # Plain attributes for the per-call path (pydantic attribute access is slower)
+        self._max_call = config.max_call_cost
+        self._max_session = config.max_session_spend
+        self._max_daily = config.max_daily_spend
+        self._max_monthly = config.max_monthly_spend
+        self._cost_field = config.cost_field
+        self._cost_estimator = config.cost_estimator
+        self._default_cost = config.default_cost
+        self._warn = config.warn_threshold
+        # Without cumulative limits (or history) nothing needs recording or locking
+        limits = (self._max_session, self._max_daily, self._max_monthly)
+        self._needs_tracking = config.history_size > 0 or any(x is not None for x in limits)
+        # Decisions are immutable, so allows for the configured costs are built once
+        self._ok_decisions = {
+            cost: self._build_ok(cost)
+            for cost in (config.default_cost, *config.cost_estimator.values())
+        }
+
+    def _build_ok(self, cost: float) -> Decision:
+        return self.allow(f"Budget OK (cost: ${cost:.4f})")
+
+    def _ok(self, cost: float) -> Decision:
+        ok = self._ok_decisions.get(cost)
+        return ok if ok is not None else self._build_ok(cost)
 
     def _estimate_cost(self, ctx: CallContext) -> float:
         """Estimate the cost of a function call."""
-        # Check explicit cost in arguments
-        if self.config.cost_field in ctx.arguments:
-            return float(ctx.arguments[self.config.cost_field])
-        # Check metadata
-        if self.config.cost_field in ctx.metadata:
-            return float(ctx.metadata[self.config.cost_field])
-        # Check cost estimator mapping
-        if ctx.function_name in self.config.cost_estimator:
-            return self.config.cost_estimator[ctx.function_name]
-        return self.config.default_cost
-
-    async def evaluate(self, ctx: CallContext) -> Decision:
+        # Check explicit cost in arguments, then metadata
+        cost = ctx.arguments.get(self._cost_field)
+        if cost is None:
+            cost = ctx.metadata.get(self._cost_field)
+        if cost is not None:
+            return float(cost)
+        # Check cost estimator mapping (one probe; names missing from it use the default)
+        return self._cost_estimator.get(ctx.function_name, self._default_cost)
+
+    def _check(
+        self, details: dict[str, Any], scope: str, total: float, limit: float, warn: bool
+    ) -> tuple[str, float, float, bool] | None:
+        """Record ``scope`` in details and return it if over limit (or warning)."""
+        details[f"{scope}_spend"] = total
+        details[f"{scope}_limit"] = limit
+        if total > limit:
+            return (scope, total, limit, True)
+        if warn and total > limit * self._warn:
+            return (scope, total, limit, False)
+        return None
+
+    def evaluate_sync(self, ctx: CallContext) -> Decision:
         cost = self._estimate_cost(ctx)
         details: dict[str, Any] = {"estimated_cost": cost}
 
         # Per-call limit doesn't need the lock (stateless check)
-        if self.config.max_call_cost is not None and cost > self.config.max_call_cost:
+        max_call = self._max_call
+        if max_call is not None and cost > max_call:
             return self.deny(
-                f"Call cost ${cost:.4f} exceeds per-call limit ${self.config.max_call_cost:.4f}",
+                f"Call cost ${cost:.4f} exceeds per-call limit ${max_call:.4f}",
                 details=details,
             )
-
-        # Atomic check-and-record under a single lock to prevent race conditions
-        with self.tracker.lock:
-            # Check session budget
-            if self.config.max_session_spend is not None and ctx.session_id:
-                session_total = self.tracker.get_session_spend_unlocked(ctx.session_id) + cost
-                details["session_spend"] = session_total
-                details["session_limit"] = self.config.max_session_spend
-                if session_total > self.config.max_session_spend:
-                    return self.deny(
-                        f"Session spend ${session_total:.4f} would exceed"
-                        f" limit ${self.config.max_session_spend:.4f}",
-                        details=details,
-                    )
-                if session_total > self.config.max_session_spend * self.config.warn_threshold:
-                    return self.require_approval(
-                        f"Session spend ${session_total:.4f} approaching"
-                        f" limit ${self.config.max_session_spend:.4f} "
-                        f"({session_total / self.config.max_session_spend:.0%})",
-                        details=details,
-                        risk_score=session_total / self.config.max_session_spend,
-                    )
-
-            # Check daily budget
-            if self.config.max_daily_spend is not None:
-                daily_total = self.tracker.get_daily_spend_unlocked() + cost
-                details["daily_spend"] = daily_total
-                details["daily_limit"] = self.config.max_daily_spend
-                if daily_total > self.config.max_daily_spend:
-                    return self.deny(
-                        f"Daily spend ${daily_total:.4f} would exceed"
-                        f" limit ${self.config.max_daily_spend:.4f}",
-                        details=details,
-                    )
-                if daily_total > self.config.max_daily_spend * self.config.warn_threshold:
-                    return self.require_approval(
-                        f"Daily spend ${daily_total:.4f} approaching"
-                        f" limit ${self.config.max_daily_spend:.4f} "
-                        f"({daily_total / self.config.max_daily_spend:.0%})",
-                        details=details,
-                        risk_score=daily_total / self.config.max_daily_spend,
-                    )
-
-            # Check monthly budget
-            if self.config.max_monthly_spend is not None:
-                monthly_total = self.tracker.get_monthly_spend_unlocked() + cost
-                details["monthly_spend"] = monthly_total
-                details["monthly_limit"] = self.config.max_monthly_spend
-                if monthly_total > self.config.max_monthly_spend:
-                    return self.deny(
-                        f"Monthly spend ${monthly_total:.4f} would exceed"
-                        f" limit ${self.config.max_monthly_spend:.4f}",
-                        details=details,
-                    )
-
-            # All checks passed — record atomically while still holding the lock
-            self.tracker.record_unlocked(cost, session_id=ctx.session_id)
-
-        return self.allow(f"Budget OK (cost: ${cost:.4f})")
+        if not self._needs_tracking:
+            return self._ok(cost)
+
+        # Atomic check-and-record to prevent race conditions. The session check
+        # holds only that session's lock; the global lock is taken afterwards,
+        # briefly, for the daily/monthly checks and the write. Decisions are
+        # formatted after both locks are released.
+        max_session, max_daily, max_monthly = self._max_session, self._max_daily, self._max_monthly
+        tracker = self.tracker
+        session_id = ctx.session_id
+        exceeded: tuple[str, float, float, bool] | None = None
+        with tracker.session_lock(session_id):
+            if max_session is not None and session_id:
+                session_total = tracker.get_session_spend_unlocked(session_id) + cost
+                exceeded = self._check(details, "session", session_total, max_session, True)
+            if exceeded is None:
+                with tracker.lock:
+                    if max_daily is not None:
+                        daily_total = tracker.get_daily_spend_unlocked() + cost
+                        exceeded = self._check(details, "daily", daily_total, max_daily, True)
+                    if exceeded is None and max_monthly is not None:
+                        monthly_total = tracker.get_monthly_spend_unlocked() + cost
+                        exceeded = self._check(
+                            details, "monthly", monthly_total, max_monthly, False
+                        )
+                    if exceeded is None:
+                        # All checks passed — record atomically while still holding the locks
+                        tracker.record_unlocked(cost, session_id=session_id)
+
+        if exceeded is None:
+            return self._ok(cost)
+
+        scope, total, limit, over_limit = exceeded
+        if over_limit:
+            return self.deny(
+                f"{scope.capitalize()} spend ${total:.4f} would exceed limit ${limit:.4f}",
+                details=details,
+            )
+        return self.require_approval(
+            f"{scope.capitalize()} spend ${total:.4f} approaching"
+            f" limit ${limit:.4f} ({total / limit:.0%})",
+            details=details,
+            risk_score=total / limit,
+        )
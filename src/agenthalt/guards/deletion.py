@@ -2,16 +2,25 @@
 
 from __future__ import annotations
 
-import fnmatch
+import functools
 import threading
 import time
+from collections import deque
 from typing import Any
 
 from pydantic import BaseModel, Field
 
 from agenthalt.core.context import CallContext
 from agenthalt.core.decision import Decision
-from agenthalt.core.guard import Guard
+from agenthalt.core.guard import SyncGuard
+from agenthalt.core.matching import GlobMatcher, KeywordMatcher
+
+# Function-name fragments that mark a delete as permanent
+_HARD_DELETE = KeywordMatcher(["hard", "permanent", "purge", "wipe", "destroy"])
+
+# Argument names searched for resource ids, after DeletionConfig.resource_field
+_BULK_FIELDS = ("resource_ids", "ids", "items", "targets")
+_FALLBACK_FIELDS = ("id", "name", "path", "file", "document_id", "email_id", "record_id")
 
 
 class DeletionConfig(BaseModel):
@@ -29,6 +38,10 @@ class DeletionConfig(BaseModel):
         soft_delete_only: If True, deny hard deletes and suggest soft delete instead.
         deletion_functions: Function names that represent deletion actions.
         cooldown_seconds: Minimum seconds between deletion calls (prevents rapid-fire).
+        history_size: Number of recent deletions to keep in memory for inspection.
+            Default 0 keeps none.
+        pattern_cache_size: Number of resource ids whose pattern verdict is cached.
+            0 disables the cache.
     """
 
     allow_patterns: list[str] = Field(default_factory=list)
@@ -55,67 +68,77 @@ class DeletionConfig(BaseModel):
         ]
     )
     cooldown_seconds: float = 0.0
+    history_size: int = 0
+    pattern_cache_size: int = 4096
 
 
 class DeletionTracker:
     """Thread-safe tracker for deletion history."""
 
-    def __init__(self) -> None:
+    def __init__(self, history_size: int = 0) -> None:
         self._lock = threading.Lock()
         self._session_counts: dict[str, int] = {}
         self._daily_count: int = 0
         self._reset_time: float = self._next_day()
         self._last_deletion: float = 0.0
-        self._history: list[dict[str, Any]] = []
+        self._last_deletion_monotonic: float | None = None
+        # Bounded and opt-in: (function, arguments, timestamp)
+        self._history: deque[tuple[str, dict[str, Any], float]] | None = (
+            deque(maxlen=history_size) if history_size > 0 else None
+        )
 
     def record(self, ctx: CallContext) -> None:
+        # Read the clocks and copy arguments before taking the lock
+        now, now_monotonic = time.time(), time.monotonic()
+        history = self._history
+        if history is not None:
+            entry = (ctx.function_name, dict(ctx.arguments), now)
         with self._lock:
-            self._maybe_reset()
+            self._maybe_reset(now)
             self._daily_count += 1
-            self._last_deletion = time.time()
+            self._last_deletion = now
+            self._last_deletion_monotonic = now_monotonic
             if ctx.session_id:
                 self._session_counts[ctx.session_id] = (
                     self._session_counts.get(ctx.session_id, 0) + 1
                 )
-            self._history.append(
-                {
-                    "function": ctx.function_name,
-                    "arguments": dict(ctx.arguments),
-                    "timestamp": time.time(),
-                }
-            )
+            if history is not None:
+                history.append(entry)
 
     def get_session_count(self, session_id: str) -> int:
-        with self._lock:
-            return self._session_counts.get(session_id, 0)
+        # A single dict read is atomic; no lock needed
+        return self._session_counts.get(session_id, 0)
 
     @property
     def daily_count(self) -> int:
+        if time.time() < self._reset_time:
+            return self._daily_count  # no reset due; a single read needs no lock
         with self._lock:
             self._maybe_reset()
             return self._daily_count
 
     @property
     def last_deletion_time(self) -> float:
-        with self._lock:
-            return self._last_deletion
+        return self._last_deletion
+
+    @property
+    def seconds_since_last_deletion(self) -> float:
+        """Elapsed time on the monotonic clock (inf before the first deletion)."""
+        last = self._last_deletion_monotonic
+        return float("inf") if last is None else time.monotonic() - last
 
-    def _maybe_reset(self) -> None:
-        if time.time() >= self._reset_time:
+    def _maybe_reset(self, now: float | None = None) -> None:
+        if (time.time() if now is None else now) >= self._reset_time:
             self._daily_count = 0
             self._reset_time = self._next_day()
 
     @staticmethod
     def _next_day() -> float:
-        import datetime
-
-        tomorrow = datetime.datetime.now(datetime.timezone.utc).replace(
-            hour=0, minute=0, second=0, microsecond=0
-        ) + datetime.timedelta(days=1)
-        return tomorrow.timestamp()
+        # Next UTC midnight: UTC days are exactly 86400 epoch seconds
+        return float((int(time.time()) // 86400 + 1) * 86400)
 
 
-class DeletionGuard(Guard):
+class DeletionGuard(SyncGuard):
     """Guard that restricts deletion of documents and resources.
 
     Enforces whitelist/blacklist patterns, protected resources, bulk limits,
@@ -134,35 +157,59 @@ class DeletionGuard(Guard):
         ))
     """
 
+    cost_hint = 3
+    applies_by_function_name = True
+
     def __init__(self, config: DeletionConfig) -> None:
         super().__init__(name="deletion")
         self.config = config
-        self.tracker = DeletionTracker()
+        self.tracker = DeletionTracker(config.history_size)
+        self.reconfigure()
+
+    def reconfigure(self) -> None:
+        """Recompile the patterns from ``self.config``.
+
+        Call this (or ``PolicyEngine.invalidate_caches()``) after editing the
+        config in place. The tracker keeps its counts and its history size.
+        """
+        config = self.config
+        self._allow = GlobMatcher(config.allow_patterns)
+        self._deny = GlobMatcher(config.deny_patterns)
+        self._protected = frozenset(config.protected_resources)
+        self._triggers = KeywordMatcher(config.deletion_functions)
+        self._resource_field = config.resource_field
+        # The verdict depends only on the resource id and the patterns, so the
+        # cache is rebuilt along with them
+        self.__dict__.pop("_check_pattern", None)
+        if config.pattern_cache_size > 0:
+            self._check_pattern = functools.lru_cache(config.pattern_cache_size)(
+                self._check_pattern
+            )
 
     def should_apply(self, ctx: CallContext) -> bool:
         """Only apply to deletion-related function calls."""
-        fn = ctx.function_name.lower()
-        return any(df in fn for df in self.config.deletion_functions)
+        return self._triggers.matches(ctx.function_name.lower())
 
     def _extract_resource_ids(self, ctx: CallContext) -> list[str]:
         """Extract resource identifier(s) from arguments."""
+        get = ctx.arguments.get
         ids: list[str] = []
 
         # Single resource
-        val = ctx.arguments.get(self.config.resource_field)
+        val = get(self._resource_field)
         if val is not None:
             ids.append(str(val))
 
         # Bulk: list of IDs
-        for field in ("resource_ids", "ids", "items", "targets"):
-            val = ctx.arguments.get(field)
+        for field in _BULK_FIELDS:
+            val = get(field)
             if isinstance(val, list):
-                ids.extend(str(v) for v in val)
+                ids.extend(map(str, val))
 
         # Common alternative single fields
         if not ids:
-            for field in ("id", "name", "path", "file", "document_id", "email_id", "record_id"):
-                val = ctx.arguments.get(field)
+            for field in _FALLBACK_FIELDS:
+                val = get(field)
                 if val is not None:
                     ids.append(str(val))
                     break
@@ -175,19 +222,19 @@ class DeletionGuard(Guard):
         Returns (allowed, reason).
         """
         # Check protected resources first (highest priority)
-        if resource_id in self.config.protected_resources:
+        if resource_id in self._protected:
             return False, f"Resource '{resource_id}' is protected and cannot be deleted"
 
         # Check deny patterns
-        for pattern in self.config.deny_patterns:
-            if fnmatch.fnmatch(resource_id, pattern):
-                return False, f"Resource '{resource_id}' matches deny pattern '{pattern}'"
+        pattern = self._deny.first_match(resource_id)
+        if pattern is not None:
+            return False, f"Resource '{resource_id}' matches deny pattern '{pattern}'"
 
         # If allow_patterns are set, resource must match at least one
-        if self.config.allow_patterns:
-            for pattern in self.config.allow_patterns:
-                if fnmatch.fnmatch(resource_id, pattern):
-                    return True, f"Resource '{resource_id}' matches allow pattern '{pattern}'"
+        if self._allow:
+            pattern = self._allow.first_match(resource_id)
+            if pattern is not None:
+                return True, f"Resource '{resource_id}' matches allow pattern '{pattern}'"
             return False, (
                 f"Resource '{resource_id}' does not match any allow pattern. "
                 f"Allowed: {self.config.allow_patterns}"
@@ -196,64 +243,62 @@ class DeletionGuard(Guard):
         # No allow patterns and no deny match: allow by default
         return True, ""
 
-    async def evaluate(self, ctx: CallContext) -> Decision:
+    def evaluate_sync(self, ctx: CallContext) -> Decision:
+        config = self.config
         resource_ids = self._extract_resource_ids(ctx)
+        count = len(resource_ids)
         details: dict[str, Any] = {
             "function": ctx.function_name,
             "resource_ids": resource_ids,
         }
 
         # Soft delete enforcement
-        if self.config.soft_delete_only:
-            fn = ctx.function_name.lower()
-            hard_delete_indicators = ["hard", "permanent", "purge", "wipe", "destroy"]
-            is_hard = any(ind in fn for ind in hard_delete_indicators)
-            is_hard = is_hard or ctx.arguments.get("permanent", False)
-            is_hard = is_hard or ctx.arguments.get("hard_delete", False)
-            if is_hard:
+        if config.soft_delete_only:
+            get = ctx.arguments.get
+            if (
+                _HARD_DELETE.matches(ctx.function_name.lower())
+                or get("permanent", False)
+                or get("hard_delete", False)
+            ):
                 return self.deny(
                     "Hard deletes are not allowed. Use soft delete instead.",
                     details=details,
                 )
 
         # Cooldown check
-        if self.config.cooldown_seconds > 0:
-            elapsed = time.time() - self.tracker.last_deletion_time
-            if elapsed < self.config.cooldown_seconds:
-                remaining = self.config.cooldown_seconds - elapsed
+        if config.cooldown_seconds > 0:
+            elapsed = self.tracker.seconds_since_last_deletion
+            if elapsed < config.cooldown_seconds:
+                remaining = config.cooldown_seconds - elapsed
                 return self.deny(
                     f"Deletion cooldown: {remaining:.1f}s remaining",
                     details={**details, "cooldown_remaining": remaining},
                 )
 
         # Bulk delete limit
-        if (
-            self.config.max_bulk_delete is not None
-            and len(resource_ids) > self.config.max_bulk_delete
-        ):
+        if config.max_bulk_delete is not None and count > config.max_bulk_delete:
             return self.deny(
-                f"Bulk delete of {len(resource_ids)} items exceeds"
-                f" limit of {self.config.max_bulk_delete}",
+                f"Bulk delete of {count} items exceeds limit of {config.max_bulk_delete}",
                 details=details,
             )
 
         # Session count limit
-        if self.config.max_deletions_per_session is not None and ctx.session_id:
-            session_count = self.tracker.get_session_count(ctx.session_id) + len(resource_ids)
-            if session_count > self.config.max_deletions_per_session:
+        if config.max_deletions_per_session is not None and ctx.session_id:
+            session_count = self.tracker.get_session_count(ctx.session_id) + count
+            if session_count > config.max_deletions_per_session:
                 return self.deny(
                     f"Session deletion count ({session_count}) would exceed limit "
-                    f"({self.config.max_deletions_per_session})",
+                    f"({config.max_deletions_per_session})",
                     details={**details, "session_count": session_count},
                 )
 
         # Daily count limit
-        if self.config.max_deletions_per_day is not None:
-            daily_count = self.tracker.daily_count + len(resource_ids)
-            if daily_count > self.config.max_deletions_per_day:
+        if config.max_deletions_per_day is not None:
+            daily_count = self.tracker.daily_count + count
+            if daily_count > config.max_deletions_per_day:
                 return self.deny(
                     f"Daily deletion count ({daily_count}) would exceed limit "
-                    f"({self.config.max_deletions_per_day})",
+                    f"({config.max_deletions_per_day})",
                     details={**details, "daily_count": daily_count},
                 )
 
@@ -272,7 +317,7 @@ class DeletionGuard(Guard):
                 return self.deny(reason, details={**details, "blocked_resource": rid})
 
         # Mandatory approval for all deletions
-        if self.config.require_approval_always:
+        if config.require_approval_always:
             return self.require_approval(
                 f"Deletion requires human approval: {resource_ids}",
                 details=details,
@@ -4,13 +4,15 @@ from __future__ import annotations
 
 import threading
 import time
+from collections import deque
 from typing import Any
 
 from pydantic import BaseModel, Field
 
 from agenthalt.core.context import CallContext
 from agenthalt.core.decision import Decision
-from agenthalt.core.guard import Guard
+from agenthalt.core.guard import SyncGuard
+from agenthalt.core.matching import KeywordMatcher
 
 
 class PurchaseConfig(BaseModel):
@@ -27,6 +29,8 @@ class PurchaseConfig(BaseModel):
         category_field: Key in arguments that contains the purchase category.
         currency: Expected currency code for validation.
         purchase_functions: Function names that represent purchase actions.
+        history_size: Number of recent purchases to keep in memory for inspection.
+            Default 0 keeps none.
     """
 
     max_single_purchase: float | None = None
@@ -51,61 +55,64 @@ class PurchaseConfig(BaseModel):
             "transfer_funds",
         ]
     )
+    history_size: int = 0
 
 
 class PurchaseTracker:
     """Thread-safe tracker for purchase history."""
 
-    def __init__(self) -> None:
+    def __init__(self, history_size: int = 0) -> None:
         self._lock = threading.Lock()
         self._daily_total: float = 0.0
         self._daily_count: int = 0
         self._reset_time: float = self._next_day()
-        self._history: list[dict[str, Any]] = []
+        # Bounded and opt-in: (amount, function, arguments, timestamp)
+        self._history: deque[tuple[float, str, dict[str, Any], float]] | None = (
+            deque(maxlen=history_size) if history_size > 0 else None
+        )
 
     def record(self, amount: float, ctx: CallContext) -> None:
+        # Read the clock and copy arguments before taking the lock
+        now = time.time()
+        history = self._history
+        if history is not None:
+            entry = (amount, ctx.function_name, dict(ctx.arguments), now)
         with self._lock:
-            self._maybe_reset()
+            self._maybe_reset(now)
             self._daily_total += amount
             self._daily_count += 1
-            self._history.append(
-                {
-                    "amount": amount,
-                    "function": ctx.function_name,
-                    "arguments": dict(ctx.arguments),
-                    "timestamp": time.time(),
-                }
-            )
+            if history is not None:
+                history.append(entry)
 
     @property
     def daily_total(self) -> float:
+        if time.time() < self._reset_time:
+            return self._daily_total  # no reset due; a single read needs no lock
         with self._lock:
             self._maybe_reset()
             return self._daily_total
 
     @property
     def daily_count(self) -> int:
+        if time.time() < self._reset_time:
+            return self._daily_count  # no reset due; a single read needs no lock
         with self._lock:
             self._maybe_reset()
             return self._daily_count
 
-    def _maybe_reset(self) -> None:
-        if time.time() >= self._reset_time:
+    def _maybe_reset(self, now: float | None = None) -> None:
+        if (time.time() if now is None else now) >= self._reset_time:
             self._daily_total = 0.0
             self._daily_count = 0
             self._reset_time = self._next_day()
 
     @staticmethod
     def _next_day() -> float:
-        import datetime
-
-        tomorrow = datetime.datetime.now(datetime.timezone.utc).replace(
-            hour=0, minute=0, second=0, microsecond=0
-        ) + datetime.timedelta(days=1)
-        return tomorrow.timestamp()
+        # Next UTC midnight: UTC days are exactly 86400 epoch seconds
+        return float((int(time.time()) // 86400 + 1) * 86400)
 
 
-class PurchaseGuard(Guard):
+class PurchaseGuard(SyncGuard):
     """Guard that prevents unauthorized or excessive purchases.
 
     Enforces per-transaction limits, daily spending caps, purchase count limits,
@@ -120,15 +127,30 @@ class PurchaseGuard(Guard):
         ))
     """
 
+    cost_hint = 2
+    applies_by_function_name = True
+
     def __init__(self, config: PurchaseConfig) -> None:
         super().__init__(name="purchase")
         self.config = config
-        self.tracker = PurchaseTracker()
+        self.tracker = PurchaseTracker(config.history_size)
+        self.reconfigure()
+
+    def reconfigure(self) -> None:
+        """Rebuild the category and trigger lists from ``self.config``.
+
+        Call this (or ``PolicyEngine.invalidate_caches()``) after editing the
+        config in place. The tracker keeps its totals and its history size.
+        """
+        config = self.config
+        # Categories match as case-insensitive substrings; lower-case them once
+        self._blocked_categories = tuple(c.lower() for c in config.blocked_categories)
+        self._allowed_categories = tuple(c.lower() for c in config.allowed_categories)
+        self._triggers = KeywordMatcher(config.purchase_functions)
 
     def should_apply(self, ctx: CallContext) -> bool:
         """Only apply to purchase-related function calls."""
-        fn = ctx.function_name.lower()
-        return any(pf in fn for pf in self.config.purchase_functions)
+        return self._triggers.matches(ctx.function_name.lower())
 
     def _extract_amount(self, ctx: CallContext) -> float | None:
         """Extract the purchase amount from arguments."""
@@ -159,7 +181,7 @@ class PurchaseGuard(Guard):
             return str(item.get("category", "")).lower() or None
         return None
 
-    async def evaluate(self, ctx: CallContext) -> Decision:
+    def evaluate_sync(self, ctx: CallContext) -> Decision:
         amount = self._extract_amount(ctx)
         category = self._extract_category(ctx)
         details: dict[str, Any] = {
@@ -178,15 +200,13 @@ class PurchaseGuard(Guard):
 
         # Check category restrictions
         if category:
-            if self.config.blocked_categories:
-                for blocked in self.config.blocked_categories:
-                    if blocked.lower() in category:
-                        return self.deny(
-                            f"Purchase category '{category}' is blocked",
-                            details=details,
-                        )
-            if self.config.allowed_categories and not any(
-                allowed.lower() in category for allowed in self.config.allowed_categories
+            if any(blocked in category for blocked in self._blocked_categories):
+                return self.deny(
+                    f"Purchase category '{category}' is blocked",
+                    details=details,
+                )
+            if self._allowed_categories and not any(
+                allowed in category for allowed in self._allowed_categories
             ):
                 return self.deny(
                     f"Purchase category '{category}' is not in allowed list",
@@ -2,16 +2,18 @@
 
 from __future__ import annotations
 
+import hashlib
 import threading
-import time
+from bisect import bisect_left
 from collections import deque
+from time import monotonic
 from typing import Any
 
 from pydantic import BaseModel
 
 from agenthalt.core.context import CallContext
 from agenthalt.core.decision import Decision
-from agenthalt.core.guard import Guard
+from agenthalt.core.guard import SyncGuard
 
 
 class RateLimitConfig(BaseModel):
@@ -36,77 +38,187 @@ class RateLimitConfig(BaseModel):
     cooldown_seconds: float = 30.0
 
 
+_NUM_SHARDS = 16
+
+
+def _call_digest(function_name: str, arguments: dict[str, Any]) -> bytes:
+    """Fixed-size fingerprint of a call for identical-call detection.
+
+    Two calls get the same digest when they name the same function and their
+    sorted argument items have the same string form, so recent calls are
+    remembered and compared as one 16-byte value however large the arguments are.
+    """
+    h = hashlib.blake2b(function_name.encode(), digest_size=16)
+    h.update(b"\0")
+    h.update(str(sorted(arguments.items())).encode())
+    return h.digest()
+
+
 class CallWindow:
-    """Sliding-window call tracker."""
+    """Sliding-window call tracker.
+
+    Call timestamps (from the monotonic clock, so wall-clock adjustments do not
+    distort windows) are kept in an exact sliding log. Entries older than
+    `retention_seconds` are expired lazily when a log is touched, and shorter
+    windows are counted by binary search over the (time-ordered) log, so a
+    burst-window query never discards history the per-minute window still needs.
+
+    Per-function logs are spread over lock shards keyed by function name, so
+    concurrent calls to different functions do not contend on one lock. Each
+    log keeps at most `max_calls_per_function` timestamps (counts saturate
+    there), and at most `max_functions` logs are kept; the least recently
+    called function is dropped first.
+    """
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        retention_seconds: float = 60.0,
+        max_calls_per_function: int | None = None,
+        max_functions: int = 4096,
+    ) -> None:
+        self.retention_seconds = retention_seconds
+        self._max_calls_per_function = max_calls_per_function
+        self._max_functions_per_shard = max(1, max_functions // _NUM_SHARDS)
         self._lock = threading.Lock()
         self._global_calls: deque[float] = deque()
-        self._function_calls: dict[str, deque[float]] = {}
+        self._shard_locks = tuple(threading.Lock() for _ in range(_NUM_SHARDS))
+        self._shards: tuple[dict[str, deque[float]], ...] = tuple({} for _ in range(_NUM_SHARDS))
         self._session_counts: dict[str, int] = {}
-        self._recent_calls: deque[tuple[str, str]] = deque(maxlen=50)  # (func, args_hash)
+        self._recent_calls: deque[bytes] = deque(maxlen=50)  # call digests, oldest first
         self._cooldown_until: float = 0.0
 
-    def record(self, ctx: CallContext) -> None:
-        now = time.time()
+    def set_max_calls_per_function(self, max_calls: int | None) -> None:
+        """Change the per-function cap, keeping the newest timestamps of each log."""
+        self._max_calls_per_function = max_calls
+        for lock, logs in zip(self._shard_locks, self._shards, strict=True):
+            with lock:
+                for name, calls in logs.items():
+                    if calls.maxlen != max_calls:
+                        logs[name] = deque(calls, maxlen=max_calls)
+
+    def _shard(self, function_name: str) -> int:
+        return hash(function_name) % _NUM_SHARDS
+
+    def record(self, ctx: CallContext, digest: bytes | None = None) -> None:
+        """Record a call. Pass `digest` if its _call_digest() is already known."""
+        now = monotonic()
+        if digest is None:
+            digest = _call_digest(ctx.function_name, ctx.arguments)
         with self._lock:
             self._global_calls.append(now)
-            fn_calls = self._function_calls.setdefault(ctx.function_name, deque())
-            fn_calls.append(now)
             if ctx.session_id:
                 self._session_counts[ctx.session_id] = (
                     self._session_counts.get(ctx.session_id, 0) + 1
                 )
-            args_hash = str(sorted(ctx.arguments.items()))
-            self._recent_calls.append((ctx.function_name, args_hash))
+            self._recent_calls.append(digest)
+        shard = self._shard(ctx.function_name)
+        with self._shard_locks[shard]:
+            logs = self._shards[shard]
+            # Re-insert so dict order is least recently called first
+            calls = logs.pop(ctx.function_name, None)
+            if calls is None:
+                calls = deque(maxlen=self._max_calls_per_function)
+                if len(logs) >= self._max_functions_per_shard:
+                    del logs[next(iter(logs))]
+            logs[ctx.function_name] = calls
+            self._expire(calls, now)
+            calls.append(now)
 
     def get_calls_in_window(self, window_seconds: float) -> int:
-        cutoff = time.time() - window_seconds
+        now = monotonic()
         with self._lock:
-            self._prune(self._global_calls, cutoff)
-            return len(self._global_calls)
+            self._expire(self._global_calls, now)
+            return self._count_since(self._global_calls, now - window_seconds)
 
     def get_function_calls_in_window(self, function_name: str, window_seconds: float) -> int:
-        cutoff = time.time() - window_seconds
-        with self._lock:
-            calls = self._function_calls.get(function_name, deque())
-            self._prune(calls, cutoff)
-            return len(calls)
+        now = monotonic()
+        shard = self._shard(function_name)
+        with self._shard_locks[shard]:
+            return self._function_count(shard, function_name, now, window_seconds)
+
+    def _function_count(
+        self, shard: int, function_name: str, now: float, window_seconds: float
+    ) -> int:
+        """Count a function's calls in the window. Caller MUST hold its shard lock."""
+        calls = self._shards[shard].get(function_name)
+        if calls is None:
+            return 0
+        self._expire(calls, now)
+        if not calls:
+            del self._shards[shard][function_name]
+            return 0
+        return self._count_since(calls, now - window_seconds)
 
     def get_session_count(self, session_id: str) -> int:
         with self._lock:
             return self._session_counts.get(session_id, 0)
 
-    def count_identical_tail(self, function_name: str, args_hash: str) -> int:
-        """Count how many of the most recent calls are identical to this one."""
+    def snapshot(
+        self,
+        function_name: str,
+        session_id: str | None,
+        digest: bytes,
+        burst_window_seconds: float,
+    ) -> tuple[int, int, int, int, int]:
+        """Read everything a guard check needs in one pass at a single instant.
+
+        Returns (calls in the last minute, calls to `function_name` in the last
+        minute, calls in the burst window, session call count, identical-tail
+        count). The global lock is taken once, with the function's shard lock
+        nested inside it.
+        """
+        now = monotonic()
+        shard = self._shard(function_name)
+        with self._lock, self._shard_locks[shard]:
+            calls = self._global_calls
+            self._expire(calls, now)
+            return (
+                self._count_since(calls, now - 60.0),
+                self._function_count(shard, function_name, now, 60.0),
+                self._count_since(calls, now - burst_window_seconds),
+                self._session_counts.get(session_id, 0) if session_id else 0,
+                self._identical_tail(digest),
+            )
+
+    def count_identical_tail(self, digest: bytes) -> int:
+        """Count how many of the most recent calls have this call digest."""
         with self._lock:
-            count = 0
-            for fn, ah in reversed(self._recent_calls):
-                if fn == function_name and ah == args_hash:
-                    count += 1
-                else:
-                    break
-            return count
+            return self._identical_tail(digest)
+
+    def _identical_tail(self, digest: bytes) -> int:
+        count = 0
+        for recent in reversed(self._recent_calls):
+            if recent == digest:
+                count += 1
+            else:
+                break
+        return count
 
     @property
     def in_cooldown(self) -> bool:
-        return time.time() < self._cooldown_until
+        return monotonic() < self._cooldown_until
 
     @property
     def cooldown_remaining(self) -> float:
-        return max(0.0, self._cooldown_until - time.time())
+        return max(0.0, self._cooldown_until - monotonic())
 
     def set_cooldown(self, seconds: float) -> None:
-        with self._lock:
-            self._cooldown_until = time.time() + seconds
+        # A single attribute store is atomic; readers never lock either
+        self._cooldown_until = monotonic() + seconds
 
-    @staticmethod
-    def _prune(q: deque[float], cutoff: float) -> None:
+    def _expire(self, q: deque[float], now: float) -> None:
+        cutoff = now - self.retention_seconds
         while q and q[0] < cutoff:
             q.popleft()
 
+    def _count_since(self, q: deque[float], cutoff: float) -> int:
+        # Timestamps are appended in order, so binary search finds the window start
+        if not q or q[0] >= cutoff:
+            return len(q)
+        return len(q) - bisect_left(q, cutoff)
+
 
-class RateLimitGuard(Guard):
+class RateLimitGuard(SyncGuard):
     """Guard that prevents runaway agent loops and excessive API calls.
 
     Detects and blocks:
@@ -124,55 +236,79 @@ class RateLimitGuard(Guard):
         ))
     """
 
+    cost_hint = 5
+
     def __init__(self, config: RateLimitConfig) -> None:
         super().__init__(name="rate_limit")
         self.config = config
-        self.window = CallWindow()
+        self.window = CallWindow(
+            retention_seconds=self._retention(config),
+            max_calls_per_function=self._max_calls(config),
+        )
 
-    async def evaluate(self, ctx: CallContext) -> Decision:
+    @staticmethod
+    def _retention(config: RateLimitConfig) -> float:
+        return max(60.0, config.burst_window_seconds)
+
+    @staticmethod
+    def _max_calls(config: RateLimitConfig) -> int:
+        # Counts only need to reach the per-function limit to trigger a deny
+        return 2 * (config.max_calls_per_minute_per_function or 128)
+
+    def reconfigure(self) -> None:
+        """Resize the call window for ``self.config``, keeping the recorded calls.
+
+        The limits themselves are read on every call; call this (or
+        ``PolicyEngine.invalidate_caches()``) after changing the burst window or
+        the per-function limit in place.
+        """
+        self.window.retention_seconds = self._retention(self.config)
+        self.window.set_max_calls_per_function(self._max_calls(self.config))
+
+    def evaluate_sync(self, ctx: CallContext) -> Decision:
         details: dict[str, Any] = {"function": ctx.function_name}
 
-        # Check cooldown
-        if self.window.in_cooldown:
-            remaining = self.window.cooldown_remaining
+        # Check cooldown (one clock read; positive only while a cooldown is active)
+        remaining = self.window.cooldown_remaining
+        if remaining > 0.0:
             return self.deny(
                 f"Rate limit cooldown active: {remaining:.1f}s remaining",
                 details={**details, "cooldown_remaining": remaining},
             )
 
+        # Digest once; record() below reuses it. All counters come from one
+        # snapshot, so the checks below take no further locks.
+        digest = _call_digest(ctx.function_name, ctx.arguments)
+        count, fn_count, burst_count, session_count, identical_count = self.window.snapshot(
+            ctx.function_name, ctx.session_id, digest, self.config.burst_window_seconds
+        )
+
         # Check global rate limit
-        if self.config.max_calls_per_minute is not None:
-            count = self.window.get_calls_in_window(60.0)
-            if count >= self.config.max_calls_per_minute:
-                return self.deny(
-                    f"Global rate limit exceeded: "
-                    f"{count}/{self.config.max_calls_per_minute} calls/min",
-                    details={**details, "global_calls_per_min": count},
-                )
+        max_per_minute = self.config.max_calls_per_minute
+        if max_per_minute is not None and count >= max_per_minute:
+            return self.deny(
+                f"Global rate limit exceeded: {count}/{max_per_minute} calls/min",
+                details={**details, "global_calls_per_min": count},
+            )
 
         # Check per-function rate limit
-        if self.config.max_calls_per_minute_per_function is not None:
-            fn_count = self.window.get_function_calls_in_window(ctx.function_name, 60.0)
-            if fn_count >= self.config.max_calls_per_minute_per_function:
-                return self.deny(
-                    f"Function rate limit exceeded for '{ctx.function_name}': "
-                    f"{fn_count}/{self.config.max_calls_per_minute_per_function} calls/min",
-                    details={**details, "function_calls_per_min": fn_count},
-                )
+        max_per_function = self.config.max_calls_per_minute_per_function
+        if max_per_function is not None and fn_count >= max_per_function:
+            return self.deny(
+                f"Function rate limit exceeded for '{ctx.function_name}': "
+                f"{fn_count}/{max_per_function} calls/min",
+                details={**details, "function_calls_per_min": fn_count},
+            )
 
         # Check session limit
-        if self.config.max_calls_per_session is not None and ctx.session_id:
-            session_count = self.window.get_session_count(ctx.session_id)
-            if session_count >= self.config.max_calls_per_session:
-                return self.deny(
-                    f"Session call limit exceeded: "
-                    f"{session_count}/{self.config.max_calls_per_session}",
-                    details={**details, "session_calls": session_count},
-                )
+        max_session = self.config.max_calls_per_session
+        if max_session is not None and ctx.session_id and session_count >= max_session:
+            return self.deny(
+                f"Session call limit exceeded: {session_count}/{max_session}",
+                details={**details, "session_calls": session_count},
+            )
 
         # Check identical consecutive calls (loop detection)
-        args_hash = str(sorted(ctx.arguments.items()))
-        identical_count = self.window.count_identical_tail(ctx.function_name, args_hash)
         if identical_count >= self.config.max_identical_calls:
             return self.deny(
                 f"Possible agent loop detected: '{ctx.function_name}'"
@@ -182,7 +318,6 @@ class RateLimitGuard(Guard):
             )
 
         # Check burst pattern
-        burst_count = self.window.get_calls_in_window(self.config.burst_window_seconds)
         if burst_count >= self.config.burst_threshold:
             self.window.set_cooldown(self.config.cooldown_seconds)
             return self.deny(
@@ -192,5 +327,5 @@ class RateLimitGuard(Guard):
             )
 
         # All checks passed
-        self.window.record(ctx)
+        self.window.record(ctx, digest)
         return self.allow()
@@ -2,14 +2,14 @@
 
 from __future__ import annotations
 
-import fnmatch
 from typing import Any
 
 from pydantic import BaseModel, Field
 
 from agenthalt.core.context import CallContext
 from agenthalt.core.decision import Decision
-from agenthalt.core.guard import Guard
+from agenthalt.core.guard import SyncGuard
+from agenthalt.core.matching import GlobMatcher
 
 
 class ScopeConfig(BaseModel):
@@ -52,7 +52,7 @@ class ScopeConfig(BaseModel):
     )
 
 
-class ScopeGuard(Guard):
+class ScopeGuard(SyncGuard):
     """Guard that restricts which functions an agent is allowed to call.
 
     Implements a flexible allow/deny system with per-agent overrides,
@@ -74,61 +74,104 @@ class ScopeGuard(Guard):
         guard = ScopeGuard(ScopeConfig(read_only_mode=True))
     """
 
+    pure = True
+    cost_hint = 1
+    applies_by_function_name = True
+
     def __init__(self, config: ScopeConfig) -> None:
         super().__init__(name="scope")
         self.config = config
-
-    def _matches_any(self, function_name: str, patterns: list[str]) -> bool:
-        """Check if function_name matches any of the glob patterns."""
-        return any(fnmatch.fnmatch(function_name, p) for p in patterns)
-
-    async def evaluate(self, ctx: CallContext) -> Decision:
+        self.reconfigure()
+
+    def reconfigure(self) -> None:
+        """Recompile the patterns from ``self.config``.
+
+        Call this (or ``PolicyEngine.invalidate_caches()``) after editing the
+        config in place; until then the guard keeps using the old patterns.
+        """
+        config = self.config
+        self._read_only_mode = config.read_only_mode
+        self._read_only = GlobMatcher(config.read_only_patterns)
+        self._deny = GlobMatcher(config.deny_functions)
+        self._allow = GlobMatcher(config.allow_functions)
+        self._require_approval = GlobMatcher(config.require_approval_functions)
+        # Per-agent lists can be long while a call names one agent: each agent's
+        # patterns are compiled the first time that agent calls
+        self._deny_by_agent: dict[str, GlobMatcher] = {}
+        self._allow_by_agent: dict[str, GlobMatcher] = {}
+        # With nothing configured every call is allowed, so the engine can skip the guard
+        self._restricts = bool(
+            config.read_only_mode
+            or config.deny_functions
+            or config.allow_functions
+            or config.require_approval_functions
+            or config.deny_by_agent
+            or config.allow_by_agent
+        )
+
+    def should_apply(self, ctx: CallContext) -> bool:
+        return self._restricts
+
+    @staticmethod
+    def _agent_matcher(
+        matchers: dict[str, GlobMatcher], patterns: dict[str, list[str]], agent_id: str | None
+    ) -> GlobMatcher | None:
+        """Return the compiled matcher for an agent's list, or None if it has no list."""
+        if not agent_id:
+            return None
+        matcher = matchers.get(agent_id)
+        if matcher is None and agent_id in patterns:
+            # Two threads may both compile; both results are equivalent
+            matcher = matchers.setdefault(agent_id, GlobMatcher(patterns[agent_id]))
+        return matcher
+
+    def evaluate_sync(self, ctx: CallContext) -> Decision:
         fn = ctx.function_name
         details: dict[str, Any] = {"function": fn, "agent_id": ctx.agent_id}
 
         # Read-only mode check
-        if self.config.read_only_mode and not self._matches_any(fn, self.config.read_only_patterns):
+        if self._read_only_mode and not self._read_only.matches(fn):
             return self.deny(
                 f"Read-only mode: '{fn}' is not a read-only operation",
                 details=details,
             )
 
         # Per-agent deny check
-        if ctx.agent_id and ctx.agent_id in self.config.deny_by_agent:
-            agent_deny = self.config.deny_by_agent[ctx.agent_id]
-            if self._matches_any(fn, agent_deny):
-                return self.deny(
-                    f"Agent '{ctx.agent_id}' is not allowed to call '{fn}'",
-                    details=details,
-                )
+        agent_deny = self._agent_matcher(
+            self._deny_by_agent, self.config.deny_by_agent, ctx.agent_id
+        )
+        if agent_deny is not None and agent_deny.matches(fn):
+            return self.deny(
+                f"Agent '{ctx.agent_id}' is not allowed to call '{fn}'",
+                details=details,
+            )
 
         # Per-agent allow check
-        if ctx.agent_id and ctx.agent_id in self.config.allow_by_agent:
-            agent_allow = self.config.allow_by_agent[ctx.agent_id]
-            if not self._matches_any(fn, agent_allow):
-                return self.deny(
-                    f"Agent '{ctx.agent_id}' is not in allow list for '{fn}'",
-                    details=details,
-                )
+        agent_allow = self._agent_matcher(
+            self._allow_by_agent, self.config.allow_by_agent, ctx.agent_id
+        )
+        if agent_allow is not None and not agent_allow.matches(fn):
+            return self.deny(
+                f"Agent '{ctx.agent_id}' is not in allow list for '{fn}'",
+                details=details,
+            )
 
         # Global deny check
-        if self.config.deny_functions and self._matches_any(fn, self.config.deny_functions):
+        if self._deny and self._deny.matches(fn):
             return self.deny(
                 f"Function '{fn}' is in the deny list",
                 details=details,
             )
 
         # Global allow check (whitelist mode)
-        if self.config.allow_functions and not self._matches_any(fn, self.config.allow_functions):
+        if self._allow and not self._allow.matches(fn):
             return self.deny(
                 f"Function '{fn}' is not in the allow list",
                 details=details,
             )
 
         # Require approval check
-        if self.config.require_approval_functions and self._matches_any(
-            fn, self.config.require_approval_functions
-        ):
+        if self._require_approval and self._require_approval.matches(fn):
             return self.require_approval(
                 f"Function '{fn}' requires human approval",
                 details=details,
@@ -2,14 +2,17 @@
 
 from __future__ import annotations
 
+import copy
+import functools
 import re
+from collections.abc import Callable, Iterable
 from typing import Any
 
 from pydantic import BaseModel, Field
 
 from agenthalt.core.context import CallContext
 from agenthalt.core.decision import Decision
-from agenthalt.core.guard import Guard
+from agenthalt.core.guard import SyncGuard
 
 # Pre-compiled patterns for common sensitive data types
 _BUILTIN_PATTERNS: dict[str, re.Pattern[str]] = {
@@ -26,6 +29,84 @@ _BUILTIN_PATTERNS: dict[str, re.Pattern[str]] = {
     "password_field": re.compile(r"\b(?:password|passwd|pwd|secret|token)\b", re.IGNORECASE),
 }
 
+_DIGITS = tuple("0123456789")
+
+# For each builtin pattern, lowercase substrings of which every match of it in an
+# ASCII string contains at least one. Absence of all of them in value.lower()
+# rules the pattern out without running it. (Non-ASCII strings skip this check:
+# \d and case-insensitive matching reach beyond ASCII there.)
+_BUILTIN_TRIGGERS: dict[str, tuple[str, ...]] = {
+    "email": ("@",),
+    "ssn": _DIGITS,
+    "credit_card": _DIGITS,
+    "phone_us": _DIGITS,
+    "api_key": ("sk", "pk", "api", "key", "token", "secret", "password"),
+    "aws_key": ("akia",),
+    "jwt": ("eyj",),
+    "ip_address": _DIGITS,
+    "password_field": ("password", "passwd", "pwd", "secret", "token"),
+}
+
+# Below this length the combined regex is cheaper than the substring checks
+_TRIGGER_MIN_LENGTH = 16
+
+# (pattern name, path, scanned string or dict key, whether it is a key finding).
+# The preview shown in decision details is only built for findings that are shown.
+_Finding = tuple[str, str, Any, bool]
+
+
+def _finding_details(finding: _Finding) -> dict[str, str]:
+    pattern, path, text, is_field = finding
+    preview = (
+        f"[field name '{text}' is sensitive]"
+        if is_field
+        else text[:50] + ("..." if len(text) > 50 else "")
+    )
+    return {"pattern": pattern, "path": path, "preview": preview}
+
+
+# Stack marker for scan entries that were not reached through a dict key
+_NO_KEY = object()
+
+# Value types the scan looks into
+_SCANNED_TYPES = (str, dict, list, tuple)
+
+# Flags that can be scoped to a single alternative with an inline (?flags:...) group
+_INLINE_FLAGS = ((re.IGNORECASE, "i"), (re.MULTILINE, "m"), (re.DOTALL, "s"), (re.VERBOSE, "x"))
+
+# A global inline-flag group such as "(?i)"; merged into an alternation it
+# would apply to every alternative (Python 3.10 only warns, 3.11+ raises)
+_GLOBAL_INLINE_FLAGS = re.compile(r"\(\?[aiLmsux]+\)")
+
+
+def _combine_patterns(
+    patterns: Iterable[re.Pattern[str]],
+) -> Callable[[str], re.Match[str] | None] | None:
+    """Join patterns into one alternation that matches wherever any of them matches.
+
+    Each alternative is a named group `_p<i>` (i = index in `patterns`), so the
+    match's `lastgroup` tells which pattern fired. Returns the bound `search` of
+    the combined pattern, or None if the patterns cannot be merged safely
+    (capturing groups, ASCII mode, global inline flags).
+    """
+    parts: list[str] = []
+    for i, pattern in enumerate(patterns):
+        if (
+            pattern.groups
+            or pattern.flags & re.ASCII
+            or _GLOBAL_INLINE_FLAGS.search(pattern.pattern)
+        ):
+            return None
+        flags = "".join(c for flag, c in _INLINE_FLAGS if pattern.flags & flag)
+        body = f"(?{flags}:{pattern.pattern})" if flags else pattern.pattern
+        parts.append(f"(?P<_p{i}>{body})")
+    if not parts:
+        return None
+    try:
+        return re.compile("|".join(parts)).search
+    except re.error:
+        return None
+
 
 class SensitiveDataConfig(BaseModel):
     """Configuration for the Sensitive Data Guard.
@@ -38,6 +119,10 @@ class SensitiveDataConfig(BaseModel):
         sensitive_fields: Field names that should never be passed to agent functions.
         redact_on_modify: If True, use MODIFY to redact sensitive data instead of DENY.
         allow_functions: Functions exempt from sensitive data scanning.
+        stop_on_first_finding: If True (and not redacting), stop scanning at the first
+            finding. The call is denied either way; details then list only that finding.
+        field_cache_size: Number of argument key names whose sensitive-field verdict is
+            cached. 0 disables the cache.
     """
 
     scan_arguments: bool = True
@@ -60,9 +145,11 @@ class SensitiveDataConfig(BaseModel):
     )
     redact_on_modify: bool = False
     allow_functions: list[str] = Field(default_factory=list)
+    stop_on_first_finding: bool = False
+    field_cache_size: int = 4096
 
 
-class SensitiveDataGuard(Guard):
+class SensitiveDataGuard(SyncGuard):
     """Guard that detects and blocks exposure of sensitive data in function calls.
 
     Scans function arguments for PII (SSNs, credit cards), credentials
@@ -75,15 +162,61 @@ class SensitiveDataGuard(Guard):
         ))
     """
 
+    pure = True
+    cost_hint = 10
+    applies_by_function_name = True
+
     def __init__(self, config: SensitiveDataConfig) -> None:
         super().__init__(name="sensitive_data")
         self.config = config
+        self.reconfigure()
+
+    def reconfigure(self) -> None:
+        """Recompile the patterns and flags from ``self.config``.
+
+        Call this (or ``PolicyEngine.invalidate_caches()``) after editing the
+        config in place; until then the guard keeps scanning with the old ones.
+        """
+        config = self.config
+        self._allow_functions = frozenset(config.allow_functions)
+        # Flags read on every call
+        self._scan_arguments = config.scan_arguments
+        self._scan_depth = config.scan_depth
+        self._redact = config.redact_on_modify
+        # A deny needs only one finding; redaction needs all of them
+        self._stop = config.stop_on_first_finding and not config.redact_on_modify
         self._compiled_custom: dict[str, re.Pattern[str]] = {
             name: re.compile(pattern) for name, pattern in config.custom_patterns.items()
         }
+        # Merged once per configuration
+        self._active_patterns = tuple(self._get_active_patterns().items())
+        # One pass over each string decides whether any pattern can match at all;
+        # only strings that hit are classified pattern by pattern.
+        self._any_pattern = _combine_patterns(p for _, p in self._active_patterns)
+        # Custom patterns have no known triggers, so they turn the substring check off
+        self._triggers: tuple[str, ...] | None = (
+            tuple(sorted({t for name, _ in self._active_patterns for t in _BUILTIN_TRIGGERS[name]}))
+            if self._active_patterns and not self._compiled_custom
+            else None
+        )
+        self._sensitive_field = (
+            re.compile("|".join(re.escape(sf) for sf in config.sensitive_fields)).search
+            if config.sensitive_fields
+            else None
+        )
+        # Nothing to look for (or scanning off) means every call is allowed
+        self._scans = self._scan_arguments and bool(
+            self._active_patterns or self._sensitive_field is not None
+        )
+        # Argument key names repeat from call to call; typed, so 1 and True differ
+        self.__dict__.pop("_is_sensitive_field", None)
+        if config.field_cache_size > 0 and self._sensitive_field is not None:
+            self._is_sensitive_field = functools.lru_cache(config.field_cache_size, typed=True)(
+                self._is_sensitive_field
+            )
 
     def should_apply(self, ctx: CallContext) -> bool:
-        return ctx.function_name not in self.config.allow_functions
+        return self._scans and ctx.function_name not in self._allow_functions
 
     def _get_active_patterns(self) -> dict[str, re.Pattern[str]]:
         patterns: dict[str, re.Pattern[str]] = {}
@@ -93,86 +226,127 @@ class SensitiveDataGuard(Guard):
         patterns.update(self._compiled_custom)
         return patterns
 
-    def _scan_value(self, value: Any, path: str, depth: int) -> list[dict[str, str]]:
-        """Recursively scan a value for sensitive data. Returns list of findings."""
-        if depth <= 0:
-            return []
-
-        findings: list[dict[str, str]] = []
-
-        if isinstance(value, str):
-            patterns = self._get_active_patterns()
-            for name, pattern in patterns.items():
-                if pattern.search(value):
-                    findings.append(
-                        {
-                            "pattern": name,
-                            "path": path,
-                            "preview": value[:50] + ("..." if len(value) > 50 else ""),
-                        }
-                    )
-        elif isinstance(value, dict):
-            for k, v in value.items():
-                # Check if the field name itself is sensitive
-                if any(sf in str(k).lower() for sf in self.config.sensitive_fields):
-                    findings.append(
-                        {
-                            "pattern": "sensitive_field",
-                            "path": f"{path}.{k}",
-                            "preview": f"[field name '{k}' is sensitive]",
-                        }
-                    )
-                findings.extend(self._scan_value(v, f"{path}.{k}", depth - 1))
-        elif isinstance(value, (list, tuple)):
-            for i, item in enumerate(value):
-                findings.extend(self._scan_value(item, f"{path}[{i}]", depth - 1))
+    def _is_sensitive_field(self, key: Any) -> bool:
+        return self._sensitive_field is not None and (
+            self._sensitive_field(str(key).lower()) is not None
+        )
+
+    def _scan_value(self, value: Any, path: str, depth: int, stop: bool = False) -> list[_Finding]:
+        """Scan a value and everything nested in it for sensitive data.
+
+        Walks the value depth-first with an explicit stack, so deeply nested
+        input cannot hit the recursion limit; findings come out in the order a
+        recursive pre-order walk would produce them. With `stop`, returns as soon
+        as one finding is known.
+        """
+        findings: list[_Finding] = []
+        is_sensitive_field = self._is_sensitive_field
+        any_pattern = self._any_pattern
+        triggers = self._triggers
+        # (value, path, depth, dict key that led here or _NO_KEY)
+        stack: list[tuple[Any, str, int, Any]] = [(value, path, depth, _NO_KEY)]
+        push, pop = stack.append, stack.pop
+        while stack:
+            value, path, depth, key = pop()
+
+            # Check if the field name itself is sensitive (the parent was in range)
+            if key is not _NO_KEY and is_sensitive_field(key):
+                findings.append(("sensitive_field", path, key, True))
+                if stop:
+                    break
+
+            if depth <= 0:
+                continue
+
+            if isinstance(value, str):
+                if triggers is not None and len(value) >= _TRIGGER_MIN_LENGTH and value.isascii():
+                    lowered = value.lower()
+                    if not any(t in lowered for t in triggers):
+                        continue
+                # The combined search finds the leftmost hit of any pattern and names
+                # the pattern that fired; no pattern matches before that position, so
+                # the others only need to be searched from there on.
+                fired, start = -1, 0
+                if any_pattern is not None:
+                    match = any_pattern(value)
+                    if match is None:
+                        continue
+                    fired, start = int(match.lastgroup[2:]), match.start()
+                for i, (name, pattern) in enumerate(self._active_patterns):
+                    if i == fired or pattern.search(value, start):
+                        findings.append((name, path, value, False))
+                        if stop:
+                            return findings
+            elif isinstance(value, dict):
+                # Pushed in reverse so they pop in iteration order. Scalars other
+                # than strings cannot produce findings and are only pushed for
+                # their key.
+                depth -= 1
+                for k, v in reversed(value.items()):
+                    if isinstance(v, _SCANNED_TYPES):
+                        push((v, f"{path}.{k}", depth, k))
+                    else:
+                        push((None, f"{path}.{k}", 0, k))
+            elif isinstance(value, (list, tuple)):
+                depth -= 1
+                for i in range(len(value) - 1, -1, -1):
+                    item = value[i]
+                    if isinstance(item, _SCANNED_TYPES):
+                        push((item, f"{path}[{i}]", depth, _NO_KEY))
 
         return findings
 
-    async def evaluate(self, ctx: CallContext) -> Decision:
-        if not self.config.scan_arguments:
+    def evaluate_sync(self, ctx: CallContext) -> Decision:
+        if not self._scan_arguments:
             return self.allow()
 
-        findings: list[dict[str, str]] = []
+        stop = self._stop
+        depth = self._scan_depth
+        findings: list[_Finding] = []
+        hit_keys: list[str] = []  # top-level arguments with at least one finding
         for key, value in ctx.arguments.items():
+            found = len(findings)
             # Check if the top-level argument key itself is sensitive
-            if any(sf in str(key).lower() for sf in self.config.sensitive_fields):
-                findings.append(
-                    {
-                        "pattern": "sensitive_field",
-                        "path": key,
-                        "preview": f"[field name '{key}' is sensitive]",
-                    }
-                )
-            findings.extend(self._scan_value(value, key, self.config.scan_depth))
+            if self._is_sensitive_field(key):
+                findings.append(("sensitive_field", key, key, True))
+                if stop:
+                    break
+            findings.extend(self._scan_value(value, key, depth, stop))
+            if len(findings) > found:
+                if stop:
+                    break
+                hit_keys.append(key)
 
         # Also scan metadata
-        for key, value in ctx.metadata.items():
-            findings.extend(self._scan_value(value, f"metadata.{key}", self.config.scan_depth))
+        if not (stop and findings):
+            for key, value in ctx.metadata.items():
+                findings.extend(self._scan_value(value, f"metadata.{key}", depth, stop))
+                if stop and findings:
+                    break
 
         if not findings:
             return self.allow()
 
         details = {
             "findings_count": len(findings),
-            "findings": findings[:10],  # Cap to prevent huge payloads
-            "patterns_detected": list({f["pattern"] for f in findings}),
+            "findings": [_finding_details(f) for f in findings[:10]],  # Cap payload size
+            "patterns_detected": list({f[0] for f in findings}),
         }
 
-        if self.config.redact_on_modify:
-            # Build modified arguments with sensitive data redacted
-            redacted = dict(ctx.arguments)
-            for finding in findings:
-                path_parts = finding["path"].split(".")
-                if path_parts[0] in redacted and isinstance(redacted[path_parts[0]], str):
-                    redacted[path_parts[0]] = "[REDACTED]"
+        if self._redact:
+            # Build modified arguments with sensitive string arguments redacted;
+            # a deep copy, so editing them cannot reach the caller's arguments
+            redacted = copy.deepcopy(ctx.arguments)
+            for key in hit_keys:
+                if isinstance(redacted[key], str):
+                    redacted[key] = "[REDACTED]"
             return self.modify(
                 f"Redacted {len(findings)} sensitive data finding(s)",
                 modified_arguments=redacted,
                 details=details,
             )
 
-        pattern_names = ", ".join(sorted({f["pattern"] for f in findings}))
+        pattern_names = ", ".join(sorted({f[0] for f in findings}))
         return self.deny(
             f"Sensitive data detected in arguments: {pattern_names} ({len(findings)} finding(s))",
             details=details,
@@ -7,6 +7,7 @@ to webhook-based async approval flows.
 from __future__ import annotations
 
 import asyncio
+import concurrent.futures
 import json
 import logging
 import time
@@ -77,15 +78,21 @@ class ApprovalHandler(ABC):
         )
 
 
+def _read_answer() -> str:
+    return input("Approve? [y/N]: ").strip().lower()
+
+
 class ConsoleApprovalHandler(ApprovalHandler):
     """Simple console-based approval handler for development and testing.
 
-    Prints the approval request to stdout and waits for user input.
+    Prints the approval request to stdout and waits for user input. Prompts are
+    read on one worker thread per handler, so they are answered in order.
     """
 
     def __init__(self, *, timeout: float = 300.0, default_deny: bool = True) -> None:
         self.timeout = timeout
         self.default_deny = default_deny
+        self._executor: concurrent.futures.ThreadPoolExecutor | None = None
 
     async def request_approval(self, request: ApprovalRequest) -> ApprovalResponse:
         print("\n" + "=" * 60)
@@ -106,9 +113,13 @@ class ConsoleApprovalHandler(ApprovalHandler):
 
         try:
             # Run input() in a thread to avoid blocking the event loop
-            loop = asyncio.get_event_loop()
+            if self._executor is None:
+                self._executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="agenthalt-approval"
+                )
+            loop = asyncio.get_running_loop()
             response_str = await asyncio.wait_for(
-                loop.run_in_executor(None, lambda: input("Approve? [y/N]: ").strip().lower()),
+                loop.run_in_executor(self._executor, _read_answer),
                 timeout=self.timeout,
             )
         except (asyncio.TimeoutError, EOFError):
@@ -4,8 +4,10 @@ from __future__ import annotations
 
 import json
 import logging
+from collections.abc import Sequence
 from typing import Any
 
+from agenthalt.core._loop import run_coroutine
 from agenthalt.core.context import CallContext
 from agenthalt.core.engine import GuardResult, PolicyEngine
 from agenthalt.hil.approval import ApprovalHandler, ApprovalRequest
@@ -60,6 +62,36 @@ class OpenAIGuardedClient:
         self.agent_id = agent_id
         self.session_id = session_id
 
+    def _tool_call_context(
+        self, tool_call: Any, agent_id: str | None, session_id: str | None
+    ) -> CallContext:
+        """Parse an OpenAI tool_call into a CallContext."""
+        try:
+            arguments = json.loads(tool_call.function.arguments)
+        except (json.JSONDecodeError, AttributeError):
+            arguments = {}
+
+        return CallContext(
+            function_name=tool_call.function.name,
+            arguments=arguments,
+            agent_id=agent_id or self.agent_id,
+            session_id=session_id or self.session_id,
+            metadata={"openai_tool_call_id": tool_call.id},
+        )
+
+    async def _request_approval(self, ctx: CallContext, result: GuardResult) -> None:
+        """Route a result that needs approval to the approval handler, if any."""
+        if not (result.needs_approval and self.approval_handler):
+            return
+        request = ApprovalRequest(
+            call_context=ctx,
+            decisions=result.decisions,
+            reason=result.final_decision.reason,
+            risk_score=result.max_risk_score,
+        )
+        response = await self.approval_handler.request_approval(request)
+        result.approved = response.approved
+
     async def evaluate_tool_call(
         self,
         tool_call: Any,
@@ -77,54 +109,58 @@ class OpenAIGuardedClient:
         Returns:
             GuardResult with the evaluation outcome.
         """
-        # Parse the tool call
-        function_name = tool_call.function.name
-        try:
-            arguments = json.loads(tool_call.function.arguments)
-        except (json.JSONDecodeError, AttributeError):
-            arguments = {}
-
-        ctx = CallContext(
-            function_name=function_name,
-            arguments=arguments,
-            agent_id=agent_id or self.agent_id,
-            session_id=session_id or self.session_id,
-            metadata={"openai_tool_call_id": tool_call.id},
-        )
-
+        ctx = self._tool_call_context(tool_call, agent_id, session_id)
         result = await self.engine.evaluate(ctx)
-
-        # Handle approval flow
-        if result.needs_approval and self.approval_handler:
-            request = ApprovalRequest(
-                call_context=ctx,
-                decisions=result.decisions,
-                reason=result.final_decision.reason,
-                risk_score=result.max_risk_score,
-            )
-            response = await self.approval_handler.request_approval(request)
-            result.approved = response.approved
-
+        await self._request_approval(ctx, result)
         return result
 
     def evaluate_tool_call_sync(
         self,
         tool_call: Any,
-        **kwargs: Any,
+        *,
+        agent_id: str | None = None,
+        session_id: str | None = None,
     ) -> GuardResult:
-        """Synchronous version of evaluate_tool_call."""
-        import asyncio
+        """Synchronous version of evaluate_tool_call.
 
-        try:
-            asyncio.get_running_loop()
-        except RuntimeError:
-            return asyncio.run(self.evaluate_tool_call(tool_call, **kwargs))
-        else:
-            import concurrent.futures
+        Uses the engine's synchronous path, so when every applicable guard is a
+        SyncGuard no event loop is involved unless approval is needed.
+        """
+        ctx = self._tool_call_context(tool_call, agent_id, session_id)
+        result = self.engine.evaluate_sync(ctx)
+        if result.needs_approval and self.approval_handler:
+            run_coroutine(self._request_approval(ctx, result))
+        return result
 
-            with concurrent.futures.ThreadPoolExecutor() as pool:
-                future = pool.submit(asyncio.run, self.evaluate_tool_call(tool_call, **kwargs))
-                return future.result()
+    async def evaluate_tool_calls(
+        self,
+        tool_calls: Sequence[Any],
+        *,
+        agent_id: str | None = None,
+        session_id: str | None = None,
+    ) -> list[GuardResult]:
+        """Evaluate all tool_calls of a response, returning one result per call in order.
+
+        Calls are evaluated one after another so stateful guards (budget, rate
+        limit) observe them in the order the model issued them.
+        """
+        return [
+            await self.evaluate_tool_call(tc, agent_id=agent_id, session_id=session_id)
+            for tc in tool_calls
+        ]
+
+    def evaluate_tool_calls_sync(
+        self,
+        tool_calls: Sequence[Any],
+        *,
+        agent_id: str | None = None,
+        session_id: str | None = None,
+    ) -> list[GuardResult]:
+        """Synchronous version of evaluate_tool_calls."""
+        return [
+            self.evaluate_tool_call_sync(tc, agent_id=agent_id, session_id=session_id)
+            for tc in tool_calls
+        ]
 
     async def evaluate_function_call(
         self,
@@ -146,15 +182,5 @@ class OpenAIGuardedClient:
         )
 
         result = await self.engine.evaluate(ctx)
-
-        if result.needs_approval and self.approval_handler:
-            request = ApprovalRequest(
-                call_context=ctx,
-                decisions=result.decisions,
-                reason=result.final_decision.reason,
-                risk_score=result.max_risk_score,
-            )
-            response = await self.approval_handler.request_approval(request)
-            result.approved = response.approved
-
+        await self._request_approval(ctx, result)
         return result
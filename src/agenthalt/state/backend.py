@@ -7,13 +7,80 @@ Provides a protocol for state persistence and implementations:
 
 from __future__ import annotations
 
+import contextlib
 import json
+import math
 import sqlite3
 import threading
 import time
 from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from itertools import islice
 from pathlib import Path
-from typing import Any
+from typing import Any, Literal
+
+# Hot statements are module constants: sqlite3 prepares each distinct SQL text
+# once per connection and reuses it from its statement cache.
+# Expired rows are filtered here and deleted later by a periodic sweep, so reads never write
+_SQL_GET = (
+    "SELECT value FROM kv_store WHERE namespace = ? AND key = ?"
+    " AND (expires_at IS NULL OR expires_at >= ?)"
+)
+_SQL_SET = "INSERT OR REPLACE INTO kv_store (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)"
+_SQL_DELETE_EXPIRED = "DELETE FROM kv_store WHERE expires_at IS NOT NULL AND expires_at < ?"
+# Adds in SQL and returns the new value in one statement. An expired value counts
+# as 0. '%!.17g' renders the double as JSON text that parses back to the same float.
+# A live value that is not a JSON number is left alone and no row is returned;
+# increment() then falls back to reading it in Python, which raises as before.
+_SQL_INCREMENT = (
+    "INSERT INTO kv_store (namespace, key, value, expires_at)"
+    " VALUES (?1, ?2, printf('%!.17g', ?3), NULL)"
+    " ON CONFLICT (namespace, key) DO UPDATE SET"
+    "  value = printf('%!.17g', CASE WHEN expires_at < ?4 THEN 0.0"
+    "   ELSE CAST(value AS REAL) END + ?3),"
+    "  expires_at = NULL"
+    " WHERE expires_at < ?4"
+    "  OR CASE WHEN json_valid(value) THEN json_type(value) IN ('integer', 'real') ELSE 0 END"
+    " RETURNING value"
+)
+
+
+def _has_json_functions() -> bool:
+    with contextlib.closing(sqlite3.connect(":memory:")) as conn:
+        try:
+            conn.execute("SELECT json_valid('1')")
+        except sqlite3.OperationalError:
+            return False
+    return True
+
+
+# UPSERT ... RETURNING needs SQLite 3.35 and the JSON functions; without them
+# increment() reads and writes separately
+_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0) and _has_json_functions()
+_SQL_GET_LIST = (
+    "SELECT value FROM list_store WHERE namespace = ? AND key = ? ORDER BY id DESC LIMIT ?"
+)
+_SQL_APPEND = "INSERT INTO list_store (namespace, key, value, created_at) VALUES (?, ?, ?, ?)"
+# Deletes everything older than the newest `max_size` entries (nothing if there are fewer)
+_SQL_TRIM_LIST = (
+    "DELETE FROM list_store WHERE namespace = ? AND key = ? AND id <= ("
+    "  SELECT id FROM list_store"
+    "  WHERE namespace = ? AND key = ? ORDER BY id DESC LIMIT 1 OFFSET ?"
+    ")"
+)
+
+# Same output as json.loads/json.dumps with default arguments, minus their
+# per-call keyword checks
+_json_loads = json.JSONDecoder().decode
+_json_dumps = json.JSONEncoder().encode
+
+# Minimum seconds between sweeps of expired kv rows (see _cleanup_expired)
+_CLEANUP_INTERVAL = 60.0
+# Lists are trimmed once per this fraction of max_size appends (see append_list)
+_TRIM_SLACK = 100
+_MAX_TRIM_COUNTERS = 10_000
 
 
 class StateBackend(ABC):
@@ -50,11 +117,35 @@ class StateBackend(ABC):
         """Append to a list, trimming to max_size."""
         ...
 
+    def extend_list(
+        self,
+        namespace: str,
+        key: str,
+        values: Iterable[dict[str, Any]],
+        max_size: int = 10000,
+    ) -> None:
+        """Append several entries in order, trimming to max_size.
+
+        The default calls append_list() per entry; backends override it to
+        write the batch at once.
+        """
+        for value in values:
+            self.append_list(namespace, key, value, max_size)
+
     @abstractmethod
     def clear_namespace(self, namespace: str) -> None:
         """Clear all keys in a namespace."""
         ...
 
+    @contextmanager
+    def bulk_commit(self) -> Iterator[None]:
+        """Group the writes made inside the block into one transaction.
+
+        The default does nothing special; backends with per-write commits
+        override it.
+        """
+        yield
+
     def close(self) -> None:  # noqa: B027
         """Clean up resources. Override in subclasses that need cleanup."""
 
@@ -66,24 +157,25 @@ class InMemoryBackend(StateBackend):
         self._lock = threading.Lock()
         self._data: dict[str, dict[str, Any]] = {}
         self._expiry: dict[str, dict[str, float]] = {}
-        self._lists: dict[str, dict[str, list[dict[str, Any]]]] = {}
+        self._lists: dict[str, dict[str, deque[dict[str, Any]]]] = {}
 
     def _full_key(self, namespace: str, key: str) -> tuple[str, str]:
         return namespace, key
 
-    def _is_expired(self, namespace: str, key: str) -> bool:
-        exp = self._expiry.get(namespace, {}).get(key)
-        if exp is not None and time.time() > exp:
-            self._data.get(namespace, {}).pop(key, None)
-            self._expiry.get(namespace, {}).pop(key, None)
-            return True
-        return False
-
     def get(self, namespace: str, key: str, default: Any = None) -> Any:
         with self._lock:
-            if self._is_expired(namespace, key):
+            ns = self._data.get(namespace)
+            if ns is None:
                 return default
-            return self._data.get(namespace, {}).get(key, default)
+            # Namespaces that never used a TTL skip the clock read
+            expiry = self._expiry.get(namespace)
+            if expiry:
+                exp = expiry.get(key)
+                if exp is not None and time.time() > exp:
+                    del expiry[key]
+                    ns.pop(key, None)
+                    return default
+            return ns.get(key, default)
 
     def set(self, namespace: str, key: str, value: Any, ttl: float | None = None) -> None:
         with self._lock:
@@ -93,27 +185,52 @@ class InMemoryBackend(StateBackend):
 
     def increment(self, namespace: str, key: str, amount: float = 1.0) -> float:
         with self._lock:
-            if self._is_expired(namespace, key):
-                self._data.setdefault(namespace, {})[key] = 0.0
             ns = self._data.setdefault(namespace, {})
-            current = float(ns.get(key, 0.0))
-            ns[key] = current + amount
-            return ns[key]
+            expiry = self._expiry.get(namespace)
+            if expiry:
+                exp = expiry.get(key)
+                if exp is not None and time.time() > exp:
+                    del expiry[key]
+                    ns.pop(key, None)
+            new_val = float(ns.get(key, 0.0)) + amount
+            ns[key] = new_val
+            return new_val
 
     def get_list(self, namespace: str, key: str, limit: int = 100) -> list[dict[str, Any]]:
         with self._lock:
-            items = self._lists.get(namespace, {}).get(key, [])
-            return items[-limit:]
+            items = self._lists.get(namespace, {}).get(key)
+            if not items:
+                return []
+            # Newest `limit` entries, oldest first, without copying the whole list
+            newest = list(islice(reversed(items), max(limit, 0)))
+        newest.reverse()
+        return newest
 
     def append_list(
         self, namespace: str, key: str, value: dict[str, Any], max_size: int = 10000
     ) -> None:
         with self._lock:
             ns = self._lists.setdefault(namespace, {})
-            lst = ns.setdefault(key, [])
+            lst = ns.get(key)
+            if lst is None or lst.maxlen != max_size:
+                # The deque drops its oldest entry on append once full
+                lst = ns[key] = deque(lst or (), maxlen=max_size)
             lst.append(value)
-            if len(lst) > max_size:
-                ns[key] = lst[-max_size:]
+
+    def extend_list(
+        self,
+        namespace: str,
+        key: str,
+        values: Iterable[dict[str, Any]],
+        max_size: int = 10000,
+    ) -> None:
+        values = list(values)
+        with self._lock:
+            ns = self._lists.setdefault(namespace, {})
+            lst = ns.get(key)
+            if lst is None or lst.maxlen != max_size:
+                lst = ns[key] = deque(lst or (), maxlen=max_size)
+            lst.extend(values)
 
     def clear_namespace(self, namespace: str) -> None:
         with self._lock:
@@ -128,22 +245,48 @@ class SQLiteBackend(StateBackend):
     Zero external dependencies. Data survives process restarts.
     Thread-safe via SQLite's built-in locking.
 
+    The database runs in WAL mode. `synchronous` sets durability: "NORMAL"
+    (default) syncs at checkpoints, so a power loss can drop the most recent
+    commits but never corrupts the file; "FULL" syncs on every commit; "OFF"
+    leaves syncing to the OS. `cache_mb` is the page cache size per connection.
+
+    `append_list` trims lazily: a list may hold up to 1% more than `max_size`
+    entries between trims.
+
     Usage:
         backend = SQLiteBackend("agenthalt_state.db")
         engine = PolicyEngine()
         # Guards automatically use the backend when set
     """
 
-    def __init__(self, db_path: str | Path = "agenthalt_state.db") -> None:
+    def __init__(
+        self,
+        db_path: str | Path = "agenthalt_state.db",
+        *,
+        synchronous: Literal["OFF", "NORMAL", "FULL"] = "NORMAL",
+        cache_mb: int = 20,
+    ) -> None:
+        if synchronous not in ("OFF", "NORMAL", "FULL"):
+            raise ValueError(f"Invalid synchronous mode: {synchronous!r}")
         self._db_path = str(db_path)
+        self._synchronous = synchronous
+        self._cache_kib = int(cache_mb) * 1024
         self._local = threading.local()
+        # Appends since the last trim, per (namespace, key); approximate under threads
+        self._appends_since_trim: dict[tuple[str, str], int] = {}
+        self._last_cleanup = 0.0
         self._init_db()
 
     def _get_conn(self) -> sqlite3.Connection:
         if not hasattr(self._local, "conn") or self._local.conn is None:
-            self._local.conn = sqlite3.connect(self._db_path, timeout=10.0)
-            self._local.conn.execute("PRAGMA journal_mode=WAL")
-            self._local.conn.execute("PRAGMA busy_timeout=5000")
+            conn = sqlite3.connect(self._db_path, timeout=10.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA busy_timeout=5000")
+            conn.execute(f"PRAGMA synchronous={self._synchronous}")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            conn.execute(f"PRAGMA cache_size=-{self._cache_kib}")
+            conn.execute("PRAGMA mmap_size=268435456")
+            self._local.conn = conn
         return self._local.conn
 
     def _init_db(self) -> None:
@@ -167,89 +310,145 @@ class SQLiteBackend(StateBackend):
 
             CREATE INDEX IF NOT EXISTS idx_list_ns_key ON list_store(namespace, key);
             CREATE INDEX IF NOT EXISTS idx_list_created ON list_store(created_at);
-            CREATE INDEX IF NOT EXISTS idx_kv_expires ON kv_store(expires_at);
+            -- Only rows with a TTL are indexed, so counter writes skip the index
+            DROP INDEX IF EXISTS idx_kv_expires;
+            CREATE INDEX IF NOT EXISTS idx_kv_expiring ON kv_store(expires_at)
+                WHERE expires_at IS NOT NULL;
         """)
         conn.commit()
 
-    def _cleanup_expired(self, conn: sqlite3.Connection) -> None:
-        conn.execute(
-            "DELETE FROM kv_store WHERE expires_at IS NOT NULL AND expires_at < ?", (time.time(),)
-        )
+    def _commit(self, conn: sqlite3.Connection) -> None:
+        # Inside bulk_commit() the block commits once at the end
+        if not getattr(self._local, "bulk_depth", 0):
+            conn.commit()
+
+    @contextmanager
+    def bulk_commit(self) -> Iterator[None]:
+        """Group the writes this thread makes inside the block into one transaction.
+
+        Commits (one fsync) when the block exits and rolls the block's writes
+        back if it raises. Nested blocks join the outermost one.
+
+        Usage:
+            with backend.bulk_commit():
+                backend.increment("budget", "daily", cost)
+                backend.append_list("budget", "calls", record)
+        """
+        conn = self._get_conn()
+        depth = getattr(self._local, "bulk_depth", 0)
+        if depth == 0 and not conn.in_transaction:
+            # Take the write lock up front so reads in the block cannot go stale
+            conn.execute("BEGIN IMMEDIATE")
+        self._local.bulk_depth = depth + 1
+        try:
+            yield
+        except BaseException:
+            if depth == 0:
+                conn.rollback()
+            raise
+        else:
+            if depth == 0:
+                conn.commit()
+        finally:
+            self._local.bulk_depth = depth
+
+    def _cleanup_expired(self, conn: sqlite3.Connection, now: float) -> None:
+        # Reads already skip expired rows; deleting them only reclaims space,
+        # so it runs from a write at most once per _CLEANUP_INTERVAL
+        if now - self._last_cleanup >= _CLEANUP_INTERVAL:
+            self._last_cleanup = now
+            conn.execute(_SQL_DELETE_EXPIRED, (now,))
 
     def get(self, namespace: str, key: str, default: Any = None) -> Any:
         conn = self._get_conn()
-        self._cleanup_expired(conn)
-        row = conn.execute(
-            "SELECT value FROM kv_store WHERE namespace = ? AND key = ?",
-            (namespace, key),
-        ).fetchone()
+        row = conn.execute(_SQL_GET, (namespace, key, time.time())).fetchone()
         if row is None:
             return default
-        return json.loads(row[0])
+        return _json_loads(row[0])
 
     def set(self, namespace: str, key: str, value: Any, ttl: float | None = None) -> None:
         conn = self._get_conn()
-        expires_at = (time.time() + ttl) if ttl else None
-        conn.execute(
-            "INSERT OR REPLACE INTO kv_store"
-            " (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)",
-            (namespace, key, json.dumps(value), expires_at),
-        )
-        conn.commit()
+        now = time.time()
+        expires_at = (now + ttl) if ttl else None
+        conn.execute(_SQL_SET, (namespace, key, _json_dumps(value), expires_at))
+        self._cleanup_expired(conn, now)
+        self._commit(conn)
 
     def increment(self, namespace: str, key: str, amount: float = 1.0) -> float:
         conn = self._get_conn()
-        self._cleanup_expired(conn)
-        row = conn.execute(
-            "SELECT value FROM kv_store WHERE namespace = ? AND key = ?",
-            (namespace, key),
-        ).fetchone()
-        current = json.loads(row[0]) if row else 0.0
-        new_val = float(current) + amount
-        conn.execute(
-            "INSERT OR REPLACE INTO kv_store"
-            " (namespace, key, value, expires_at) VALUES (?, ?, ?, NULL)",
-            (namespace, key, json.dumps(new_val)),
-        )
-        conn.commit()
+        amount = float(amount)
+        # printf() renders infinities as 'Inf', which is not JSON; leave those to json
+        if _HAS_RETURNING and math.isfinite(amount):
+            row = conn.execute(_SQL_INCREMENT, (namespace, key, amount, time.time())).fetchone()
+            if row is not None:
+                new_val = float(row[0])
+                if not math.isfinite(new_val):  # the sum overflowed
+                    conn.execute(_SQL_SET, (namespace, key, _json_dumps(new_val), None))
+                self._commit(conn)
+                return new_val
+        try:
+            row = conn.execute(_SQL_GET, (namespace, key, time.time())).fetchone()
+            current = _json_loads(row[0]) if row else 0.0
+            new_val = float(current) + amount
+        except Exception:
+            # Do not leave the write transaction the UPSERT opened holding the lock
+            if not getattr(self._local, "bulk_depth", 0):
+                conn.rollback()
+            raise
+        conn.execute(_SQL_SET, (namespace, key, _json_dumps(new_val), None))
+        self._commit(conn)
         return new_val
 
     def get_list(self, namespace: str, key: str, limit: int = 100) -> list[dict[str, Any]]:
         conn = self._get_conn()
-        rows = conn.execute(
-            "SELECT value FROM list_store WHERE namespace = ? AND key = ? ORDER BY id DESC LIMIT ?",
-            (namespace, key, limit),
-        ).fetchall()
-        return [json.loads(r[0]) for r in reversed(rows)]
+        rows = conn.execute(_SQL_GET_LIST, (namespace, key, limit)).fetchall()
+        rows.reverse()
+        return [_json_loads(value) for (value,) in rows]
 
     def append_list(
         self, namespace: str, key: str, value: dict[str, Any], max_size: int = 10000
     ) -> None:
         conn = self._get_conn()
-        conn.execute(
-            "INSERT INTO list_store (namespace, key, value, created_at) VALUES (?, ?, ?, ?)",
-            (namespace, key, json.dumps(value), time.time()),
-        )
-        # Trim old entries
-        count = conn.execute(
-            "SELECT COUNT(*) FROM list_store WHERE namespace = ? AND key = ?",
-            (namespace, key),
-        ).fetchone()[0]
-        if count > max_size:
-            conn.execute(
-                "DELETE FROM list_store WHERE id IN ("
-                "  SELECT id FROM list_store"
-                "  WHERE namespace = ? AND key = ? ORDER BY id ASC LIMIT ?"
-                ")",
-                (namespace, key, count - max_size),
-            )
-        conn.commit()
+        conn.execute(_SQL_APPEND, (namespace, key, _json_dumps(value), time.time()))
+        self._trim_list(conn, namespace, key, 1, max_size)
+        self._commit(conn)
+
+    def extend_list(
+        self,
+        namespace: str,
+        key: str,
+        values: Iterable[dict[str, Any]],
+        max_size: int = 10000,
+    ) -> None:
+        conn = self._get_conn()
+        now = time.time()
+        rows = [(namespace, key, _json_dumps(value), now) for value in values]
+        if not rows:
+            return
+        # One prepared INSERT for the batch and one commit
+        conn.executemany(_SQL_APPEND, rows)
+        self._trim_list(conn, namespace, key, len(rows), max_size)
+        self._commit(conn)
+
+    def _trim_list(
+        self, conn: sqlite3.Connection, namespace: str, key: str, added: int, max_size: int
+    ) -> None:
+        # Trimming walks max_size index entries, so it runs once per 1% of max_size
+        # appends; a list may briefly hold up to that many extra entries.
+        counters = self._appends_since_trim
+        appended = counters.get((namespace, key), 0) + added
+        if appended >= max(1, max_size // _TRIM_SLACK):
+            conn.execute(_SQL_TRIM_LIST, (namespace, key, namespace, key, max_size))
+            appended = 0
+        if len(counters) >= _MAX_TRIM_COUNTERS:
+            counters.clear()
+        counters[(namespace, key)] = appended
 
     def clear_namespace(self, namespace: str) -> None:
         conn = self._get_conn()
         conn.execute("DELETE FROM kv_store WHERE namespace = ?", (namespace,))
         conn.execute("DELETE FROM list_store WHERE namespace = ?", (namespace,))
-        conn.commit()
+        self._commit(conn)
 
     def close(self) -> None:
         if hasattr(self._local, "conn") and self._local.conn:
@@ -268,3 +467,102 @@ class SQLiteBackend(StateBackend):
             "namespaces": [r[0] for r in namespaces],
             "db_path": self._db_path,
         }
+
+
+_MISSING = object()
+
+
+class CachedBackend(StateBackend):
+    """Read cache in front of another backend, for keys read far more than written.
+
+    get() serves a key from memory for up to `max_age` seconds after it was
+    last read or written through this wrapper, then reads the inner backend
+    again. Writes go straight through, so nothing is lost on a crash, and
+    increment() caches the total the inner backend returns. Writes made by
+    other processes (or other wrappers) on the same store become visible
+    within `max_age`. Lists are not cached.
+
+    Cached values are shared between callers, so treat them as read-only.
+
+    Usage:
+        backend = CachedBackend(SQLiteBackend("agenthalt_state.db"), max_age=0.1)
+    """
+
+    def __init__(
+        self, inner: StateBackend, *, max_entries: int = 1024, max_age: float = 0.1
+    ) -> None:
+        self._inner = inner
+        self._max_entries = max_entries
+        self._max_age = max_age
+        self._lock = threading.Lock()
+        # (namespace, key) -> (value or _MISSING, monotonic deadline); oldest first
+        self._cache: OrderedDict[tuple[str, str], tuple[Any, float]] = OrderedDict()
+
+    def _remember(self, namespace: str, key: str, value: Any, max_age: float) -> None:
+        entry = (value, time.monotonic() + max_age)
+        with self._lock:
+            cache = self._cache
+            cache[(namespace, key)] = entry
+            cache.move_to_end((namespace, key))
+            if len(cache) > self._max_entries:
+                cache.popitem(last=False)
+
+    def get(self, namespace: str, key: str, default: Any = None) -> Any:
+        entry = self._cache.get((namespace, key))
+        if entry is not None and time.monotonic() < entry[1]:
+            value = entry[0]
+            return default if value is _MISSING else value
+        value = self._inner.get(namespace, key, _MISSING)
+        self._remember(namespace, key, value, self._max_age)
+        return default if value is _MISSING else value
+
+    def set(self, namespace: str, key: str, value: Any, ttl: float | None = None) -> None:
+        self._inner.set(namespace, key, value, ttl)
+        self._remember(namespace, key, value, min(self._max_age, ttl) if ttl else self._max_age)
+
+    def increment(self, namespace: str, key: str, amount: float = 1.0) -> float:
+        value = self._inner.increment(namespace, key, amount)
+        self._remember(namespace, key, value, self._max_age)
+        return value
+
+    def get_list(self, namespace: str, key: str, limit: int = 100) -> list[dict[str, Any]]:
+        return self._inner.get_list(namespace, key, limit)
+
+    def append_list(
+        self, namespace: str, key: str, value: dict[str, Any], max_size: int = 10000
+    ) -> None:
+        self._inner.append_list(namespace, key, value, max_size)
+
+    def extend_list(
+        self,
+        namespace: str,
+        key: str,
+        values: Iterable[dict[str, Any]],
+        max_size: int = 10000,
+    ) -> None:
+        self._inner.extend_list(namespace, key, values, max_size)
+
+    def clear_namespace(self, namespace: str) -> None:
+        self._inner.clear_namespace(namespace)
+        with self._lock:
+            for cache_key in [k for k in self._cache if k[0] == namespace]:
+                del self._cache[cache_key]
+
+    def clear_cache(self) -> None:
+        """Forget every cached value; the next reads go to the inner backend."""
+        with self._lock:
+            self._cache.clear()
+
+    @contextmanager
+    def bulk_commit(self) -> Iterator[None]:
+        try:
+            with self._inner.bulk_commit():
+                yield
+        except BaseException:
+            # Values cached inside the block may have been rolled back
+            self.clear_cache()
+            raise
+
+    def close(self) -> None:
+        self.clear_cache()
+        self._inner.close()
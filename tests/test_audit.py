@@ -0,0 +1,159 @@
+"""Tests for the AuditLogger."""
+
+import json
+
+from agenthalt import AuditLogger, CallContext
+from agenthalt.audit.logger import AuditEntry, CallbackSink, JsonFileSink
+from agenthalt.core.decision import Decision, DecisionType
+
+
+def make_ctx(fn: str = "test_func", **kwargs) -> CallContext:
+    return CallContext(function_name=fn, agent_id="a1", arguments=kwargs)
+
+
+def deny(guard: str = "g") -> Decision:
+    return Decision(decision=DecisionType.DENY, guard_name=guard, reason="no", risk_score=0.9)
+
+
+def test_log_dispatches_to_sinks():
+    seen = []
+    audit = AuditLogger()
+    audit.add_sink(CallbackSink(seen.append))
+    entry = audit.log(make_ctx(query="x"), [deny()])
+    assert seen == [entry]
+    assert entry.final_decision == "deny"
+    assert entry.risk_score == 0.9
+    assert entry.arguments_summary == {"query": "x"}
+
+
+def test_query_filters():
+    audit = AuditLogger()
+    audit.log(make_ctx("a"), [deny()])
+    audit.log(make_ctx("b"), [])
+    assert [e.function_name for e in audit.query(decision="deny")] == ["a"]
+    assert [e.function_name for e in audit.query(function_name="b")] == ["b"]
+
+
+def test_buffered_logger_writes_in_background(tmp_path):
+    path = tmp_path / "audit.jsonl"
+    audit = AuditLogger(buffered=True)
+    audit.add_sink(JsonFileSink(path))
+    for i in range(20):
+        audit.log(make_ctx(f"fn_{i}"), [deny()])
+    audit.flush()
+    lines = path.read_text().splitlines()
+    assert [json.loads(line)["function_name"] for line in lines] == [f"fn_{i}" for i in range(20)]
+    audit.close()
+
+
+def test_buffered_logger_drops_when_full():
+    audit = AuditLogger(buffered=True, max_queue_size=1)
+    audit._ensure_worker = lambda: None  # keep the queue from draining
+    for _ in range(3):
+        audit.log(make_ctx(), [])
+    assert audit.dropped == 2
+    assert len(audit.entries) == 3
+
+
+def test_buffered_logger_writes_batches():
+    batches = []
+
+    class BatchSink(CallbackSink):
+        def write_batch(self, entries):
+            batches.append(len(entries))
+
+    audit = AuditLogger(buffered=True, batch_size=4, flush_interval_s=10.0)
+    audit.add_sink(BatchSink(lambda e: None))
+    for _ in range(10):
+        audit.log(make_ctx(), [])
+    audit.flush()
+    assert sum(batches) == 10
+    assert max(batches) <= 4
+    audit.close()
+
+
+def test_json_line_is_serialized_once(tmp_path):
+    audit = AuditLogger()
+    audit.add_sink(JsonFileSink(tmp_path / "a.jsonl"))
+    audit.add_sink(JsonFileSink(tmp_path / "b.jsonl"))
+    entry = audit.log(make_ctx(query="x"), [deny()])
+    audit.flush()
+    assert entry.json_line() is entry.json_line()
+    assert (tmp_path / "a.jsonl").read_bytes() == entry.json_line()
+    assert (tmp_path / "b.jsonl").read_bytes() == entry.json_line()
+    assert json.loads(entry.json_line())["call_id"] == entry.call_id
+
+
+def test_memory_cap_and_query_limit():
+    audit = AuditLogger(max_memory_entries=5)
+    for i in range(8):
+        audit.log(make_ctx(f"fn_{i}"), [deny()] if i % 2 else [])
+    assert [e.function_name for e in audit.entries] == [f"fn_{i}" for i in range(3, 8)]
+    assert [e.function_name for e in audit.query(decision="deny", limit=2)] == ["fn_5", "fn_7"]
+    assert [e.function_name for e in audit.query(function_name="fn_1")] == []
+    assert audit._index[("function_name", "fn_7")][-1].function_name == "fn_7"
+    assert ("function_name", "fn_2") not in audit._index
+
+
+def test_json_file_sink_matches_model_dump(tmp_path):
+    path = tmp_path / "audit.jsonl"
+    audit = AuditLogger()
+    audit.add_sink(JsonFileSink(path))
+    entry = audit.log(make_ctx(query="héllo"), [deny()])
+    audit.close()
+    assert path.read_text(encoding="utf-8") == entry.model_dump_json() + "\n"
+
+
+def test_argument_summary_matches_str_and_bounds_large_values():
+    from agenthalt.audit.logger import _summarize
+
+    small = [
+        "text",
+        42,
+        [1, "a", None],
+        {"b": 1, "a": [2.5, (3,)]},
+        {3, 1},
+        frozenset({"x"}),
+        (1,),
+        [],
+        {},
+    ]
+    for value in small:
+        assert _summarize(value) == str(value)
+
+    big = {f"key{i}": "x" * 10_000 for i in range(1000)}
+    summary = _summarize(big)
+    assert summary.startswith("{'key0': 'xxx")
+    assert summary.endswith("...") and len(summary) == 103
+    assert _summarize("y" * 500) == "y" * 100 + "..."
+
+
+def test_json_file_sink_fsync_policy(tmp_path, monkeypatch):
+    import pytest
+
+    from agenthalt.audit import logger as audit_logger
+
+    syncs = []
+    monkeypatch.setattr(audit_logger, "_fdatasync", syncs.append)
+    entries = [AuditLogger().log(make_ctx(f"fn_{i}"), []) for i in range(3)]
+
+    sink = JsonFileSink(tmp_path / "batch.jsonl", fsync="batch")
+    sink.write_batch(entries)
+    assert len(syncs) == 1
+    sink.close()
+
+    sink = JsonFileSink(tmp_path / "always.jsonl", fsync="always")
+    sink.write_batch(entries)
+    assert len(syncs) == 4
+    sink.close()
+    assert (tmp_path / "always.jsonl").read_bytes() == (tmp_path / "batch.jsonl").read_bytes()
+
+    with pytest.raises(ValueError):
+        JsonFileSink(tmp_path / "x.jsonl", fsync="sometimes")
+
+
+def test_entry_metadata_is_a_snapshot():
+    ctx = CallContext(function_name="f", metadata={"k": 1})
+    entry = AuditEntry.from_evaluation(ctx, [deny()])
+    ctx.metadata["k"] = 2  # e.g. a pre-hook updating metadata in place
+    assert entry.metadata == {"k": 1}
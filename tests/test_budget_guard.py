@@ -101,3 +101,101 @@ async def test_daily_spend_limit():
     r = await guard.evaluate(make_ctx(session="s3"))
     assert r.decision == DecisionType.DENY
     assert "Daily spend" in r.reason
+
+
+@pytest.mark.asyncio
+async def test_denied_call_not_recorded():
+    guard = BudgetGuard(BudgetConfig(max_session_spend=10.0, max_daily_spend=0.5, default_cost=0.3))
+    r1 = await guard.evaluate(make_ctx())
+    assert r1.decision == DecisionType.ALLOW
+    r2 = await guard.evaluate(make_ctx())
+    assert r2.decision == DecisionType.DENY
+    assert r2.reason.startswith("Daily spend")
+    assert r2.details["session_spend"] == pytest.approx(0.6)
+    assert r2.details["daily_limit"] == 0.5
+    assert guard.tracker.daily_spend == pytest.approx(0.3)
+
+
+@pytest.mark.asyncio
+async def test_call_history_bounded_and_opt_in():
+    guard = BudgetGuard(BudgetConfig(default_cost=0.01))
+    await guard.evaluate(make_ctx())
+    assert guard.tracker._call_history is None
+
+    guard = BudgetGuard(BudgetConfig(default_cost=0.01, history_size=2))
+    for _ in range(3):
+        await guard.evaluate(make_ctx())
+    history = guard.tracker._call_history
+    assert history is not None and len(history) == 2
+    assert history[-1][:2] == (0.01, make_ctx().session_id)
+
+
+def test_concurrent_sessions_record_exact_totals():
+    import threading
+
+    guard = BudgetGuard(
+        BudgetConfig(max_session_spend=1000.0, max_daily_spend=1000.0, default_cost=0.5)
+    )
+    sessions = [f"s{i}" for i in range(8)]
+
+    def run(session: str) -> None:
+        for _ in range(50):
+            guard.evaluate_sync(CallContext(function_name="f", session_id=session))
+
+    threads = [threading.Thread(target=run, args=(s,)) for s in sessions]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert guard.tracker.daily_spend == pytest.approx(8 * 50 * 0.5)
+    for s in sessions:
+        assert guard.tracker.get_session_spend(s) == pytest.approx(25.0)
+
+
+def test_reset_boundaries_are_utc_midnights(monkeypatch):
+    import calendar
+    import time
+
+    from agenthalt.guards.budget import SpendingTracker
+
+    dec_31 = calendar.timegm((2025, 12, 31, 23, 59, 59))
+    real_gmtime = time.gmtime
+    monkeypatch.setattr(time, "time", lambda: float(dec_31))
+    monkeypatch.setattr(time, "gmtime", lambda *a: real_gmtime(dec_31))
+    jan_1 = calendar.timegm((2026, 1, 1, 0, 0, 0))
+    assert SpendingTracker._next_day_boundary() == jan_1
+    assert SpendingTracker._next_month_boundary() == jan_1
+
+
+def test_cost_from_metadata(budget_guard: BudgetGuard):
+    ctx = CallContext(function_name="cheap_call", metadata={"estimated_cost": 0.5})
+    assert budget_guard._estimate_cost(ctx) == 0.5
+    ctx = CallContext(function_name="cheap_call", arguments={"estimated_cost": 0.25})
+    assert budget_guard._estimate_cost(ctx) == 0.25
+    assert budget_guard._estimate_cost(CallContext(function_name="cheap_call")) == 0.01
+
+
+def test_per_call_only_config_skips_tracking():
+    guard = BudgetGuard(BudgetConfig(max_call_cost=1.0, default_cost=0.5))
+    assert guard.evaluate_sync(make_ctx()).decision == DecisionType.ALLOW
+    assert guard.evaluate_sync(make_ctx(estimated_cost=2.0)).decision == DecisionType.DENY
+    assert guard.tracker.daily_spend == 0.0
+
+
+def test_allow_decisions_shared_for_configured_costs(budget_guard: BudgetGuard):
+    first = budget_guard.evaluate_sync(make_ctx("cheap_call"))
+    second = budget_guard.evaluate_sync(make_ctx("cheap_call", session="s2"))
+    assert first is second
+    assert first.reason == "Budget OK (cost: $0.0100)"
+    other = budget_guard.evaluate_sync(make_ctx(estimated_cost=0.123))
+    assert other.reason == "Budget OK (cost: $0.1230)"
+
+
+def test_tracked_sessions_evict_least_recently_charged():
+    guard = BudgetGuard(BudgetConfig(max_session_spend=10.0, max_tracked_sessions=2))
+    for session in ("a", "b", "a", "c"):
+        guard.evaluate_sync(make_ctx(session=session))
+    assert guard.tracker.get_session_spend("a") == pytest.approx(0.02)
+    assert guard.tracker.get_session_spend("b") == 0.0
+    assert guard.tracker.get_session_spend("c") == pytest.approx(0.01)
@@ -85,3 +85,19 @@ def test_all_guards():
         }
     )
     assert len(engine.guards) == 6
+
+
+def test_yaml_reload_picks_up_changes(tmp_path):
+    import os
+
+    path = tmp_path / "policy.yaml"
+    path.write_text("guards:\n  budget:\n    max_daily_spend: 5.0\n")
+    first = load_config(path)
+    again = load_config(path)
+    # Each load builds a fresh engine (guards keep their own state)
+    assert first.guards[0] is not again.guards[0]
+
+    path.write_text("guards:\n  scope:\n    deny_functions: ['drop_*']\n")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert [g.name for g in load_config(path).guards] == ["scope"]
@@ -0,0 +1,134 @@
+"""Tests for the guarded decorator."""
+
+import inspect
+import re
+
+import pytest
+from pydantic import ValidationError
+
+from agenthalt import CallContext, PolicyEngine, guarded
+from agenthalt.core.decision import Decision
+from agenthalt.core.guard import Guard
+from agenthalt.decorators import GuardedCallBlocked
+
+
+class RecordingGuard(Guard):
+    def __init__(self, deny_function: str | None = None):
+        super().__init__(name="recording")
+        self.deny_function = deny_function
+        self.seen: list[CallContext] = []
+
+    async def evaluate(self, ctx: CallContext) -> Decision:
+        self.seen.append(ctx)
+        if ctx.function_name == self.deny_function:
+            return self.deny("blocked")
+        return self.allow()
+
+
+def test_sync_call_binds_arguments_with_defaults():
+    engine = PolicyEngine()
+    guard = RecordingGuard()
+    engine.add_guard(guard)
+
+    @guarded(engine, agent_id="agent", session_id="s1")
+    def call_api(prompt, model="gpt-4"):
+        return f"{model}: {prompt}"
+
+    assert call_api("hi") == "gpt-4: hi"
+    assert call_api("yo", model="small") == "small: yo"
+    ctx = guard.seen[0]
+    assert ctx.function_name == "call_api"
+    assert ctx.agent_id == "agent"
+    assert ctx.session_id == "s1"
+    assert guard.seen[0].arguments == {"prompt": "hi", "model": "gpt-4"}
+    assert guard.seen[1].arguments == {"prompt": "yo", "model": "small"}
+
+
+def test_sync_call_blocked():
+    engine = PolicyEngine()
+    engine.add_guard(RecordingGuard(deny_function="drop_table"))
+
+    @guarded(engine)
+    def drop_table(name):
+        raise AssertionError("should not run")
+
+    with pytest.raises(GuardedCallBlocked):
+        drop_table("users")
+
+
+def test_method_self_not_in_arguments():
+    engine = PolicyEngine()
+    guard = RecordingGuard()
+    engine.add_guard(guard)
+
+    class Client:
+        @guarded(engine)
+        def send(self, to, body=""):
+            return to
+
+    assert Client().send("bob") == "bob"
+    assert guard.seen[0].arguments == {"to": "bob", "body": ""}
+
+
+@pytest.mark.asyncio
+async def test_async_call():
+    engine = PolicyEngine()
+    guard = RecordingGuard(deny_function="blocked_call")
+    engine.add_guard(guard)
+
+    @guarded(engine)
+    async def search(query, limit=10):
+        return [query] * limit
+
+    @guarded(engine, raise_on_deny=False)
+    async def blocked_call():
+        raise AssertionError("should not run")
+
+    assert await search("x", limit=2) == ["x", "x"]
+    assert guard.seen[0].arguments == {"query": "x", "limit": 2}
+    assert await blocked_call() is None
+
+
+def test_invalid_fixed_fields_rejected_at_decoration():
+    engine = PolicyEngine()
+    with pytest.raises(ValidationError):
+
+        @guarded(engine, agent_id=123)  # type: ignore[arg-type]
+        def call_api(prompt):
+            return prompt
+
+
+def test_argument_binder_matches_signature_bind():
+    from agenthalt.decorators import _ArgumentBinder
+
+    def plain(a, b=2, *, c, d=4):
+        pass
+
+    def varargs(a, *rest, **extra):
+        pass
+
+    def posonly(a, /, b=1):
+        pass
+
+    calls = [
+        ((1,), {"c": 3}),
+        ((1, 5), {"c": 3, "d": 0}),
+        ((), {"c": 3, "a": 1}),
+        ((1, 2, 3), {}),  # too many positional
+        ((1,), {"a": 1, "c": 3}),  # duplicate value
+        ((1,), {"c": 3, "zzz": 0}),  # unknown keyword
+        ((1,), {}),  # missing keyword-only
+    ]
+    for func in (plain, varargs, posonly):
+        sig = inspect.signature(func)
+        binder = _ArgumentBinder(sig)
+        for args, kwargs in calls:
+            try:
+                bound = sig.bind(*args, **kwargs)
+                bound.apply_defaults()
+                expected = list(bound.arguments.items())
+            except TypeError as e:
+                with pytest.raises(TypeError, match=re.escape(str(e))):
+                    binder.bind(args, kwargs)
+                continue
+            assert list(binder.bind(args, kwargs).items()) == expected
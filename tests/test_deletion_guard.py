@@ -102,3 +102,36 @@ async def test_alternative_id_fields():
     # Test document_id field
     r = await guard.evaluate(make_ctx(document_id="doc_456"))
     assert r.decision == DecisionType.ALLOW
+
+
+def test_deletion_history_bounded_and_opt_in(deletion_guard: DeletionGuard):
+    deletion_guard.evaluate_sync(make_ctx(resource_id="temp_a"))
+    assert deletion_guard.tracker._history is None
+    assert deletion_guard.tracker.get_session_count("s1") == 1
+
+    guard = DeletionGuard(DeletionConfig(allow_patterns=["temp_*"], history_size=2))
+    for rid in ("temp_a", "temp_b", "temp_c"):
+        guard.evaluate_sync(make_ctx(resource_id=rid))
+    history = guard.tracker._history
+    assert history is not None
+    assert [entry[1]["resource_id"] for entry in history] == ["temp_b", "temp_c"]
+
+
+def test_pattern_verdicts_cached_per_resource(deletion_guard: DeletionGuard):
+    for _ in range(3):
+        assert deletion_guard._check_pattern("db_production")[0] is False
+        assert deletion_guard._check_pattern("temp_1")[0] is True
+    info = deletion_guard._check_pattern.cache_info()
+    assert (info.hits, info.misses) == (4, 2)
+
+    uncached = DeletionGuard(DeletionConfig(pattern_cache_size=0))
+    assert not hasattr(uncached._check_pattern, "cache_info")
+
+
+def test_reconfigure_rebuilds_pattern_cache(deletion_guard: DeletionGuard):
+    assert deletion_guard._check_pattern("temp_1")[0] is True
+    deletion_guard.config.deny_patterns.append("temp_*")
+    deletion_guard.reconfigure()
+    assert deletion_guard._check_pattern("temp_1")[0] is False
+    # Re-wrapped from the method, not stacked on the previous cache
+    assert deletion_guard._check_pattern.__wrapped__.__func__ is DeletionGuard._check_pattern
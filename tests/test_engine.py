@@ -1,10 +1,13 @@
 """Tests for the PolicyEngine."""
 
+import asyncio
+
 import pytest
 
 from agenthalt import PolicyEngine, CallContext
+from agenthalt.core.engine import GuardResult
 from agenthalt.core.decision import Decision, DecisionType
-from agenthalt.core.guard import Guard
+from agenthalt.core.guard import Guard, SyncGuard
 
 
 class AlwaysAllowGuard(Guard):
@@ -51,6 +54,34 @@ class ScopedGuard(Guard):
         return self.deny(f"Blocked for {self._applies_to}")
 
 
+class SlowGuard(Guard):
+    def __init__(self):
+        super().__init__(name="slow_guard")
+        self.cancelled = False
+
+    async def evaluate(self, ctx: CallContext) -> Decision:
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return self.allow()
+
+
+class CountingPureGuard(Guard):
+    pure = True
+
+    def __init__(self):
+        super().__init__(name="counting_pure")
+        self.calls = 0
+
+    async def evaluate(self, ctx: CallContext) -> Decision:
+        self.calls += 1
+        if ctx.arguments.get("x") == "bad":
+            return self.deny("bad argument")
+        return self.allow()
+
+
 def make_ctx(fn: str = "test_func") -> CallContext:
     return CallContext(function_name=fn, arguments={})
 
@@ -126,6 +157,102 @@ async def test_error_guard_fail_safe_deny():
     assert "fail-safe" in result.final_decision.reason.lower()
 
 
+@pytest.mark.asyncio
+async def test_deny_cancels_pending_guards():
+    engine = PolicyEngine()
+    slow = SlowGuard()
+    engine.add_guard(slow)
+    engine.add_guard(AlwaysDenyGuard())
+    result = await asyncio.wait_for(engine.evaluate(make_ctx()), timeout=1.0)
+    assert result.is_denied
+    assert slow.cancelled
+    assert [d.guard_name for d in result.decisions] == ["always_deny"]
+
+
+@pytest.mark.asyncio
+async def test_pure_guard_decisions_cached():
+    engine = PolicyEngine()
+    guard = CountingPureGuard()
+    engine.add_guard(guard)
+    for _ in range(5):
+        result = await engine.evaluate(CallContext(function_name="f", arguments={"x": "ok"}))
+        assert result.is_allowed
+    assert guard.calls == 1
+
+    # Different arguments are a different key
+    result = await engine.evaluate(CallContext(function_name="f", arguments={"x": "bad"}))
+    assert result.is_denied
+    assert guard.calls == 2
+
+    # Adding a guard bumps the epoch and invalidates cached decisions
+    engine.add_guard(AlwaysAllowGuard())
+    await engine.evaluate(CallContext(function_name="f", arguments={"x": "ok"}))
+    assert guard.calls == 3
+
+
+class SessionPureGuard(Guard):
+    pure = True
+
+    def __init__(self):
+        super().__init__(name="session_pure")
+
+    async def evaluate(self, ctx: CallContext) -> Decision:
+        if ctx.session_id == "bad":
+            return self.deny("bad session")
+        return self.allow()
+
+
+@pytest.mark.asyncio
+async def test_decision_cache_keys_on_session():
+    engine = PolicyEngine()
+    engine.add_guard(SessionPureGuard())
+    good = CallContext(function_name="f", session_id="good")
+    bad = CallContext(function_name="f", session_id="bad")
+    assert (await engine.evaluate(good)).is_allowed
+    assert (await engine.evaluate(bad)).is_denied
+
+
+@pytest.mark.asyncio
+async def test_decision_cache_hits_share_the_decision():
+    engine = PolicyEngine()
+    engine.add_guard(CountingPureGuard())
+    ctx = CallContext(function_name="f", arguments={"x": "bad"})
+    first = (await engine.evaluate(ctx)).final_decision
+    second = (await engine.evaluate(ctx)).final_decision
+    assert first is second
+    with pytest.raises(TypeError):
+        second.details["leak"] = 1
+
+
+@pytest.mark.asyncio
+async def test_cached_modified_arguments_are_not_shared():
+    from agenthalt import SensitiveDataConfig, SensitiveDataGuard
+
+    engine = PolicyEngine()
+    engine.add_guard(SensitiveDataGuard(SensitiveDataConfig(redact_on_modify=True)))
+    ctx = CallContext(function_name="f", arguments={"payload": {"ssn": "123-45-6789"}})
+    first = await engine.evaluate(ctx)
+    assert first.modified_arguments is not None
+    first.modified_arguments["payload"]["injected"] = True
+    assert "injected" not in ctx.arguments["payload"]
+
+    for _ in range(2):
+        again = await engine.evaluate(ctx)
+        assert again.modified_arguments is not None
+        assert "injected" not in again.modified_arguments["payload"]
+        again.modified_arguments["payload"]["injected"] = True
+
+
+@pytest.mark.asyncio
+async def test_decision_cache_disabled():
+    engine = PolicyEngine(decision_cache_size=0)
+    guard = CountingPureGuard()
+    engine.add_guard(guard)
+    for _ in range(3):
+        await engine.evaluate(make_ctx())
+    assert guard.calls == 3
+
+
 @pytest.mark.asyncio
 async def test_scoped_guard_only_applies_to_target():
     engine = PolicyEngine()
@@ -173,6 +300,22 @@ async def test_pre_hook_modifies_context():
     assert result.is_allowed
 
 
+@pytest.mark.asyncio
+async def test_pre_hook_can_update_metadata_in_place():
+    engine = PolicyEngine()
+    seen = []
+
+    def add_metadata(ctx: CallContext) -> None:
+        ctx.metadata["hook_ran"] = True
+
+    engine.add_pre_hook(add_metadata)
+    engine.add_post_hook(lambda ctx, result: seen.append(ctx.metadata))
+    engine.add_guard(AlwaysAllowGuard())
+    result = await engine.evaluate(make_ctx())
+    assert result.is_allowed
+    assert seen == [{"hook_ran": True}]
+
+
 @pytest.mark.asyncio
 async def test_post_hook_runs():
     engine = PolicyEngine()
@@ -204,3 +347,305 @@ def test_engine_repr():
     r = repr(engine)
     assert "always_allow" in r
     assert "always_deny" in r
+
+
+def test_evaluate_batch_sync_preserves_order():
+    engine = PolicyEngine()
+    engine.add_guard(ScopedGuard("dangerous_func"))
+    contexts = [make_ctx("safe_func"), make_ctx("dangerous_func"), make_ctx("safe_func")]
+    results = engine.evaluate_batch_sync(contexts)
+    assert [r.is_denied for r in results] == [False, True, False]
+
+
+def test_freeze_keys_are_type_exact():
+    from agenthalt.core._hash import freeze
+
+    assert freeze({"a": [1, 2]}) == freeze({"a": [1, 2]})
+    assert freeze({1: "x"}) != freeze({"1": "x"})
+    assert freeze({"a": 1}) != freeze({"a": 1.0}) != freeze({"a": True})
+    assert freeze([1]) != freeze((1,))
+    with pytest.raises(TypeError):
+        freeze({"a": bytearray(b"x")})
+
+
+class LoopFreeGuard(SyncGuard):
+    def __init__(self, fail: bool = False):
+        super().__init__(name="loop_free")
+        self.fail = fail
+        self.saw_loop: bool | None = None
+
+    def evaluate_sync(self, ctx: CallContext) -> Decision:
+        try:
+            asyncio.get_running_loop()
+            self.saw_loop = True
+        except RuntimeError:
+            self.saw_loop = False
+        if self.fail:
+            raise RuntimeError("sync guard crashed")
+        return self.allow()
+
+
+def test_evaluate_sync_runs_sync_guards_without_event_loop():
+    engine = PolicyEngine()
+    guard = LoopFreeGuard()
+    engine.add_guard(guard)
+    result = engine.evaluate_sync(make_ctx())
+    assert result.is_allowed
+    assert guard.saw_loop is False
+
+
+def test_evaluate_sync_fail_safe_and_async_fallback():
+    engine = PolicyEngine()
+    engine.add_guard(LoopFreeGuard(fail=True))
+    result = engine.evaluate_sync(make_ctx())
+    assert result.is_denied
+    assert "fail-safe" in result.final_decision.reason.lower()
+
+    # A coroutine-only guard makes evaluate_sync fall back to an event loop
+    engine = PolicyEngine()
+    engine.add_guard(LoopFreeGuard())
+    engine.add_guard(AlwaysApprovalGuard())
+    assert engine.evaluate_sync(make_ctx()).needs_approval
+
+
+class CountingSyncGuard(SyncGuard):
+    def __init__(self, name: str, cost: int, deny: bool = False):
+        super().__init__(name=name)
+        self.cost_hint = cost
+        self.deny_all = deny
+        self.calls = 0
+
+    def evaluate_sync(self, ctx: CallContext) -> Decision:
+        self.calls += 1
+        return self.deny("no") if self.deny_all else self.allow()
+
+
+def test_cheap_guards_evaluated_first():
+    engine = PolicyEngine()
+    expensive = CountingSyncGuard("expensive", cost=10)
+    cheap_deny = CountingSyncGuard("cheap_deny", cost=1, deny=True)
+    engine.add_guard(expensive)
+    engine.add_guard(cheap_deny)
+    result = engine.evaluate_sync(make_ctx())
+    assert result.is_denied
+    assert expensive.calls == 0
+
+    # Decisions are reported in registration order regardless of evaluation order
+    engine = PolicyEngine()
+    engine.add_guard(CountingSyncGuard("first", cost=10))
+    engine.add_guard(CountingSyncGuard("second", cost=1))
+    result = engine.evaluate_sync(make_ctx())
+    assert [d.guard_name for d in result.decisions] == ["first", "second"]
+
+
+class SlowPureGuard(Guard):
+    pure = True
+
+    def __init__(self):
+        super().__init__(name="slow_pure")
+        self.calls = 0
+
+    async def evaluate(self, ctx: CallContext) -> Decision:
+        self.calls += 1
+        await asyncio.sleep(0.05)
+        return self.allow()
+
+
+@pytest.mark.asyncio
+async def test_identical_concurrent_calls_coalesced():
+    engine = PolicyEngine(decision_cache_size=0)
+    guard = SlowPureGuard()
+    engine.add_guard(guard)
+    contexts = [CallContext(function_name="f", arguments={"q": 1}) for _ in range(5)]
+    results = await asyncio.gather(*(engine.evaluate(c) for c in contexts))
+    assert all(r.is_allowed for r in results)
+    assert guard.calls == 1
+
+    # Different arguments are evaluated separately
+    await asyncio.gather(
+        engine.evaluate(CallContext(function_name="f", arguments={"q": 2})),
+        engine.evaluate(CallContext(function_name="f", arguments={"q": 3})),
+    )
+    assert guard.calls == 3
+
+
+@pytest.mark.asyncio
+async def test_sync_guard_denial_skips_async_guards():
+    engine = PolicyEngine()
+    slow = SlowGuard()
+    deny = CountingSyncGuard("sync_deny", cost=5, deny=True)
+    engine.add_guard(slow)
+    engine.add_guard(deny)
+    result = await engine.evaluate(make_ctx())
+    assert result.is_denied
+    assert deny.calls == 1
+    # The async guard was never started
+    assert [d.guard_name for d in result.decisions] == ["sync_deny"]
+    assert not slow.cancelled
+
+
+class NamedScopeGuard(SyncGuard):
+    applies_by_function_name = True
+
+    def __init__(self, target: str):
+        super().__init__(name=f"named_{target}")
+        self.target = target
+        self.checks = 0
+
+    def should_apply(self, ctx: CallContext) -> bool:
+        self.checks += 1
+        return ctx.function_name == self.target
+
+    def evaluate_sync(self, ctx: CallContext) -> Decision:
+        return self.deny("blocked")
+
+
+def test_applicability_resolved_once_per_function_name():
+    engine = PolicyEngine()
+    named = NamedScopeGuard("delete")
+    engine.add_guard(named)
+    engine.add_guard(ScopedGuard("delete"))
+    for _ in range(3):
+        assert engine.evaluate_sync(make_ctx("delete")).is_denied
+        assert engine.evaluate_sync(make_ctx("read")).is_allowed
+    assert named.checks == 2
+
+    named.enabled = False
+    assert [d.guard_name for d in engine.evaluate_sync(make_ctx("delete")).decisions] == [
+        "scoped_delete"
+    ]
+
+    named.target = "read"
+    engine.invalidate_caches()
+    named.enabled = True
+    assert engine.evaluate_sync(make_ctx("read")).is_denied
+
+
+def test_batch_event_listener_receives_lists():
+    engine = PolicyEngine(event_batch_interval_s=60)
+    single, batches = [], []
+    engine.add_event_listener(single.append)
+    engine.add_event_listener(batches.append, batch=True)
+    engine.add_guard(AlwaysAllowGuard())
+    engine.evaluate_sync(make_ctx("a"))
+    engine.evaluate_sync(make_ctx("b"))
+    assert [e["function_name"] for e in single] == ["a", "b"]
+    assert batches == []
+    engine.flush_events()
+    assert [[e["function_name"] for e in batch] for batch in batches] == [["a", "b"]]
+    engine.flush_events()
+    assert len(batches) == 1
+
+
+def test_event_listener_registered_once():
+    engine = PolicyEngine(event_batch_interval_s=60)
+    events, batches = [], []
+    for _ in range(2):
+        engine.add_event_listener(events.append)
+        engine.add_event_listener(batches.append, batch=True)
+    engine.add_guard(AlwaysAllowGuard())
+    engine.evaluate_sync(make_ctx("a"))
+    engine.flush_events()
+    assert len(events) == 1
+    assert len(batches) == 1 and len(batches[0]) == 1
+
+
+def test_run_coroutine_reuses_background_loop():
+    import contextvars
+    import threading
+
+    from agenthalt.core._loop import run_coroutine
+
+    var = contextvars.ContextVar("var", default="unset")
+
+    async def probe():
+        return threading.current_thread().name, var.get()
+
+    var.set("caller")
+    first = run_coroutine(probe())
+    assert first == ("agenthalt-loop", "caller")
+    assert run_coroutine(probe()) == first
+
+
+def test_run_coroutine_does_not_wait_behind_a_blocked_caller():
+    import threading
+
+    from agenthalt.core._loop import run_coroutine
+
+    started, release = threading.Event(), threading.Event()
+
+    async def blocking():
+        started.set()
+        release.wait(5)  # e.g. a console approval prompt
+
+    async def probe():
+        return threading.current_thread().name
+
+    blocker = threading.Thread(target=run_coroutine, args=(blocking(),))
+    blocker.start()
+    try:
+        assert started.wait(5)
+        # The shared loop is stuck; this call gets its own loop on this thread
+        assert run_coroutine(probe()) == threading.current_thread().name
+    finally:
+        release.set()
+        blocker.join()
+    assert run_coroutine(probe()) == "agenthalt-loop"
+
+
+@pytest.mark.asyncio
+async def test_evaluate_sync_from_running_loop():
+    engine = PolicyEngine()
+    engine.add_guard(AlwaysApprovalGuard())
+    assert engine.evaluate_sync(make_ctx()).needs_approval
+
+
+def test_plain_allow_decision_is_shared_and_frozen():
+    guard = AlwaysAllowGuard()
+    assert guard.allow() is guard.allow()
+    assert guard.allow("why").reason == "why"
+    with pytest.raises(ValueError):
+        guard.allow().reason = "changed"
+    assert GuardResult([]).final_decision is GuardResult([]).final_decision
+
+
+def test_shared_decision_details_cannot_be_mutated():
+    from agenthalt import ScopeConfig, ScopeGuard
+
+    guard = ScopeGuard(ScopeConfig(deny_functions=["drop_*"]))
+    decision = guard.evaluate_sync(make_ctx("read"))
+    with pytest.raises(TypeError):
+        decision.details["leak"] = 1
+    with pytest.raises(TypeError):
+        GuardResult([]).final_decision.details.update(leak=1)
+    assert guard.evaluate_sync(make_ctx("other")).details == {}
+    assert GuardResult([]).final_decision.details == {}
+
+    denied = guard.evaluate_sync(make_ctx("drop_table"))
+    details = dict(denied.details)
+    details["extra"] = 1  # copies are ordinary dicts
+    assert "extra" not in denied.details
+    assert Decision.model_validate_json(denied.model_dump_json()) == denied
+
+
+def test_repeated_guard_errors_share_decision():
+    engine = PolicyEngine()
+    engine.add_guard(ErrorGuard())
+    first = engine.evaluate_sync(make_ctx()).final_decision
+    second = engine.evaluate_sync(make_ctx()).final_decision
+    assert first is second
+    assert first.reason == "Guard error (fail-safe deny): Guard crashed!"
+
+
+def test_invalidate_caches_applies_config_edits():
+    from agenthalt import ScopeConfig, ScopeGuard
+
+    guard = ScopeGuard(ScopeConfig())
+    engine = PolicyEngine()
+    engine.add_guard(guard)
+    assert engine.evaluate_sync(make_ctx("drop_db")).is_allowed
+
+    guard.config.read_only_mode = True
+    guard.config.deny_functions.append("drop_*")
+    engine.invalidate_caches()
+    assert engine.evaluate_sync(make_ctx("drop_db")).is_denied
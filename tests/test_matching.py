@@ -0,0 +1,55 @@
+"""Tests for the compiled glob matcher."""
+
+import fnmatch
+
+import pytest
+
+from agenthalt.core.matching import GlobMatcher, KeywordMatcher
+
+PATTERNS = ["send_email", "drop_*", "*_production", "temp_??", "report_[0-9]*", "*[ab]_x", "*"]
+NAMES = [
+    "send_email",
+    "send_emails",
+    "drop_table",
+    "db_production",
+    "temp_01",
+    "temp_1",
+    "report_7",
+    "report_x",
+    "",
+    "drop_\nline",
+    "db\n_production",
+    "a_x",
+]
+
+
+@pytest.mark.parametrize("pattern", PATTERNS)
+@pytest.mark.parametrize("name", NAMES)
+def test_matches_like_fnmatch(pattern, name):
+    assert GlobMatcher([pattern]).matches(name) == fnmatch.fnmatch(name, pattern)
+
+
+def test_first_match_uses_configured_order():
+    matcher = GlobMatcher(["*_backup", "db_*", "db_backup"])
+    assert matcher.first_match("db_backup") == "*_backup"
+    assert matcher.first_match("db_main") == "db_*"
+    assert matcher.first_match("other") is None
+
+
+def test_empty_matcher():
+    matcher = GlobMatcher([])
+    assert not matcher
+    assert not matcher.matches("anything")
+
+
+@pytest.mark.parametrize("name", NAMES)
+def test_first_match_like_fnmatch_scan(name):
+    for patterns in (PATTERNS, PATTERNS[::-1], PATTERNS[:-1]):
+        expected = next((p for p in patterns if fnmatch.fnmatch(name, p)), None)
+        assert GlobMatcher(patterns).first_match(name) == expected
+
+
+@pytest.mark.parametrize("words", [[], ["delete", "rm"], ["a.b", "x*"], [""]])
+@pytest.mark.parametrize("text", ["delete_file", "confirm", "a.b", "axb", "x*y", ""])
+def test_keyword_matcher_like_any_in(words, text):
+    assert KeywordMatcher(words).matches(text) == any(w in text for w in words)
@@ -0,0 +1,61 @@
+"""Tests for the OpenAI integration."""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from agenthalt import PolicyEngine, ScopeConfig, ScopeGuard
+from agenthalt.hil.approval import ApprovalHandler, ApprovalRequest, ApprovalResponse
+from agenthalt.integrations.openai_adapter import OpenAIGuardedClient
+
+
+def make_tool_call(name: str, arguments: str = "{}", call_id: str = "call_1") -> SimpleNamespace:
+    return SimpleNamespace(id=call_id, function=SimpleNamespace(name=name, arguments=arguments))
+
+
+class RecordingHandler(ApprovalHandler):
+    def __init__(self) -> None:
+        self.requests: list[ApprovalRequest] = []
+
+    async def request_approval(self, request: ApprovalRequest) -> ApprovalResponse:
+        self.requests.append(request)
+        return ApprovalResponse(approved=True)
+
+
+@pytest.fixture
+def engine() -> PolicyEngine:
+    engine = PolicyEngine()
+    engine.add_guard(
+        ScopeGuard(ScopeConfig(deny_functions=["drop_*"], require_approval_functions=["send_*"]))
+    )
+    return engine
+
+
+@pytest.mark.asyncio
+async def test_async_and_sync_agree(engine: PolicyEngine):
+    client = OpenAIGuardedClient(engine=engine, agent_id="a1")
+    for name in ("read_file", "drop_table"):
+        call = make_tool_call(name, json.dumps({"path": "x"}))
+        expected = await client.evaluate_tool_call(call)
+        result = client.evaluate_tool_call_sync(call)
+        assert result.final_decision.decision == expected.final_decision.decision
+
+
+def test_sync_routes_approval_to_handler(engine: PolicyEngine):
+    handler = RecordingHandler()
+    client = OpenAIGuardedClient(engine=engine, approval_handler=handler, session_id="s1")
+    result = client.evaluate_tool_call_sync(make_tool_call("send_email", "not json"))
+    assert result.approved is True
+    ctx = handler.requests[0].call_context
+    assert (ctx.arguments, ctx.session_id) == ({}, "s1")
+    assert ctx.metadata == {"openai_tool_call_id": "call_1"}
+
+
+@pytest.mark.asyncio
+async def test_evaluate_tool_calls_in_order(engine: PolicyEngine):
+    client = OpenAIGuardedClient(engine=engine)
+    calls = [make_tool_call(n, call_id=n) for n in ("read_file", "drop_table", "list_dir")]
+    results = await client.evaluate_tool_calls(calls)
+    assert [r.is_allowed for r in results] == [True, False, True]
+    assert [r.is_allowed for r in client.evaluate_tool_calls_sync(calls)] == [True, False, True]
@@ -91,3 +91,20 @@ async def test_allowed_categories_whitelist():
     assert r1.decision == DecisionType.ALLOW
     r2 = await guard.evaluate(make_ctx(amount=10.0, category="food"))
     assert r2.decision == DecisionType.DENY
+
+
+def test_daily_totals_reset_at_utc_midnight(monkeypatch):
+    import time
+
+    from agenthalt.guards.purchase import PurchaseTracker
+
+    now = 1_700_000_000.0
+    monkeypatch.setattr(time, "time", lambda: now)
+    tracker = PurchaseTracker()
+    assert tracker._reset_time == (int(now) // 86400 + 1) * 86400
+    tracker.record(25.0, CallContext(function_name="buy"))
+    assert (tracker.daily_total, tracker.daily_count) == (25.0, 1)
+
+    now = tracker._reset_time
+    assert (tracker.daily_total, tracker.daily_count) == (0.0, 0)
+    assert tracker._reset_time == now + 86400
@@ -93,3 +93,104 @@ async def test_per_function_rate_limit():
     r = await guard.evaluate(make_ctx("specific_func", query="extra"))
     assert r.decision == DecisionType.DENY
     assert "Function rate limit" in r.reason
+
+
+@pytest.mark.asyncio
+async def test_burst_check_keeps_minute_history(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr("agenthalt.guards.rate_limit.monotonic", lambda: clock[0])
+    guard = RateLimitGuard(
+        RateLimitConfig(
+            max_calls_per_minute=4,
+            max_identical_calls=100,
+            burst_window_seconds=5.0,
+            burst_threshold=100,
+        )
+    )
+    for i in range(3):
+        r = await guard.evaluate(make_ctx(query=f"q{i}"))
+        assert r.decision == DecisionType.ALLOW
+    # Older than the burst window, still inside the minute window
+    clock[0] += 10.0
+    r = await guard.evaluate(make_ctx(query="q3"))
+    assert r.decision == DecisionType.ALLOW
+    r = await guard.evaluate(make_ctx(query="q4"))
+    assert r.decision == DecisionType.DENY
+    assert "Global rate limit" in r.reason
+    # Everything expires once the minute has passed
+    clock[0] += 61.0
+    r = await guard.evaluate(make_ctx(query="q5"))
+    assert r.decision == DecisionType.ALLOW
+
+
+def test_identical_calls_compared_by_fixed_size_digest():
+    guard = RateLimitGuard(RateLimitConfig(max_identical_calls=2, burst_threshold=100))
+    big = {"payload": "x" * 10_000, "n": 1}
+    for _ in range(2):
+        assert guard.evaluate_sync(CallContext(function_name="f", arguments=big)).decision == (
+            DecisionType.ALLOW
+        )
+    assert {len(digest) for digest in guard.window._recent_calls} == {16}
+    reordered = {"n": 1, "payload": "x" * 10_000}
+    r = guard.evaluate_sync(CallContext(function_name="f", arguments=reordered))
+    assert r.decision == DecisionType.DENY
+    other = guard.evaluate_sync(CallContext(function_name="f", arguments={**big, "n": 2}))
+    assert other.decision == DecisionType.ALLOW
+
+
+def test_window_snapshot_matches_individual_reads():
+    guard = RateLimitGuard(RateLimitConfig(max_identical_calls=10, burst_threshold=100))
+    for session in ("a", "a", "b"):
+        guard.evaluate_sync(CallContext(function_name="f", session_id=session))
+    window = guard.window
+    digest = window._recent_calls[-1]
+    individual = (
+        window.get_calls_in_window(60.0),
+        window.get_function_calls_in_window("f", 60.0),
+        window.get_calls_in_window(5.0),
+        window.get_session_count("a"),
+        window.count_identical_tail(digest),
+    )
+    assert window.snapshot("f", "a", digest, 5.0) == individual == (3, 3, 3, 2, 3)
+
+
+def test_call_window_bounds_function_logs():
+    from agenthalt.guards.rate_limit import _NUM_SHARDS, CallWindow
+
+    window = CallWindow(max_calls_per_function=3, max_functions=_NUM_SHARDS)
+    for _ in range(5):
+        window.record(CallContext(function_name="f"))
+    assert window.get_function_calls_in_window("f", 60.0) == 3
+    for i in range(200):
+        window.record(CallContext(function_name=f"tool_{i}"))
+    assert sum(len(shard) for shard in window._shards) <= _NUM_SHARDS
+    assert window.get_function_calls_in_window("tool_199", 60.0) == 1
+
+
+def test_identical_call_digest_includes_function_name():
+    from agenthalt.guards.rate_limit import _call_digest
+
+    args = {"q": "same"}
+    assert _call_digest("f", args) == _call_digest("f", dict(args))
+    assert _call_digest("f", args) != _call_digest("g", args)
+
+
+def test_reconfigure_raises_per_function_cap():
+    config = RateLimitConfig(
+        max_calls_per_minute=1000,
+        max_calls_per_minute_per_function=1,
+        max_identical_calls=100,
+        burst_threshold=1000,
+    )
+    guard = RateLimitGuard(config)
+    for i in range(5):
+        guard.window.record(make_ctx("f", query=f"q{i}"))
+    assert guard.window.get_function_calls_in_window("f", 60.0) == 2
+    config.max_calls_per_minute_per_function = 4
+    guard.reconfigure()
+    for i in range(5, 10):
+        guard.window.record(make_ctx("f", query=f"q{i}"))
+    # Counts saturated at the old cap of 2 would never reach the new limit;
+    # the resized log now holds up to 8
+    assert guard.window.get_function_calls_in_window("f", 60.0) == 7
+    assert guard.evaluate_sync(make_ctx("f", query="last")).is_blocked
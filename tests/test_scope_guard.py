@@ -17,6 +17,12 @@ async def test_allow_when_no_restrictions():
     assert result.decision == DecisionType.ALLOW
 
 
+def test_unrestricted_guard_does_not_apply():
+    assert not ScopeGuard(ScopeConfig()).should_apply(make_ctx("anything"))
+    assert ScopeGuard(ScopeConfig(read_only_mode=True)).should_apply(make_ctx("anything"))
+    assert ScopeGuard(ScopeConfig(deny_by_agent={"a": ["x"]})).should_apply(make_ctx("anything"))
+
+
 @pytest.mark.asyncio
 async def test_deny_blacklisted_function():
     guard = ScopeGuard(ScopeConfig(deny_functions=["drop_*", "delete_*"]))
@@ -88,3 +94,30 @@ async def test_per_agent_allow():
     # Agent without restrictions passes
     r3 = await guard.evaluate(make_ctx("delete_data", agent_id="other_agent"))
     assert r3.decision == DecisionType.ALLOW
+
+
+def test_per_agent_patterns_compiled_on_first_call():
+    guard = ScopeGuard(
+        ScopeConfig(
+            deny_by_agent={f"agent_{i}": ["delete_*"] for i in range(100)},
+            allow_by_agent={"limited_agent": []},
+        )
+    )
+    assert guard._deny_by_agent == {}
+    assert guard.evaluate_sync(make_ctx("delete_all", agent_id="agent_7")).is_blocked
+    assert not guard.evaluate_sync(make_ctx("delete_all", agent_id="other")).is_blocked
+    assert list(guard._deny_by_agent) == ["agent_7"]
+    assert guard.evaluate_sync(make_ctx("read", agent_id="limited_agent")).is_blocked
+
+
+def test_reconfigure_applies_config_edits():
+    guard = ScopeGuard(ScopeConfig())
+    guard.evaluate_sync(make_ctx("read_x", agent_id="a"))
+    guard.config.deny_functions.append("drop_*")
+    guard.config.deny_by_agent["a"] = ["read_*"]
+    assert not guard.should_apply(make_ctx("drop_db"))
+
+    guard.reconfigure()
+    assert guard.should_apply(make_ctx("drop_db"))
+    assert guard.evaluate_sync(make_ctx("drop_db")).is_blocked
+    assert guard.evaluate_sync(make_ctx("read_x", agent_id="a")).is_blocked
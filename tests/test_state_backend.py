@@ -0,0 +1,273 @@
+"""Tests for the state backends."""
+
+from collections.abc import Iterator
+
+import pytest
+
+from agenthalt.state.backend import (
+    _SQL_DELETE_EXPIRED,
+    CachedBackend,
+    InMemoryBackend,
+    SQLiteBackend,
+    StateBackend,
+)
+
+
+@pytest.fixture(params=["memory", "sqlite", "cached"])
+def backend(request, tmp_path) -> Iterator[StateBackend]:
+    if request.param == "memory":
+        yield InMemoryBackend()
+        return
+    if request.param == "cached":
+        # max_age=0 never serves from the cache, so expiry follows the inner backend
+        yield CachedBackend(InMemoryBackend(), max_age=0)
+        return
+    backend = SQLiteBackend(tmp_path / "state.db")
+    yield backend
+    backend.close()
+
+
+def test_get_set_roundtrip(backend: StateBackend):
+    assert backend.get("ns", "missing", default=7) == 7
+    backend.set("ns", "k", {"a": [1, 2], "b": "x"})
+    assert backend.get("ns", "k") == {"a": [1, 2], "b": "x"}
+    backend.set("ns", "k", 1.5)
+    assert backend.get("ns", "k") == 1.5
+
+
+def test_increment(backend: StateBackend):
+    assert backend.increment("ns", "spend", 0.25) == 0.25
+    assert backend.increment("ns", "spend", 0.5) == 0.75
+    assert backend.increment("ns", "spend") == 1.75
+    assert backend.get("ns", "spend") == 1.75
+
+
+def test_ttl_expiry(backend: StateBackend, monkeypatch):
+    import time
+
+    now = time.time()
+    backend.set("ns", "temp", 3.0, ttl=10)
+    assert backend.get("ns", "temp") == 3.0
+    monkeypatch.setattr(time, "time", lambda: now + 11)
+    assert backend.get("ns", "temp") is None
+    assert backend.increment("ns", "temp", 1.0) == 1.0
+
+
+def test_list_append_and_trim(backend: StateBackend):
+    for i in range(5):
+        backend.append_list("ns", "log", {"i": i}, max_size=3)
+    backend.append_list("ns", "other", {"i": -1})
+    assert backend.get_list("ns", "log") == [{"i": 2}, {"i": 3}, {"i": 4}]
+    assert backend.get_list("ns", "log", limit=2) == [{"i": 3}, {"i": 4}]
+    assert backend.get_list("ns", "other") == [{"i": -1}]
+
+
+def test_clear_namespace(backend: StateBackend):
+    backend.set("a", "k", 1)
+    backend.set("b", "k", 2)
+    backend.append_list("a", "log", {"x": 1})
+    backend.clear_namespace("a")
+    assert backend.get("a", "k") is None
+    assert backend.get_list("a", "log") == []
+    assert backend.get("b", "k") == 2
+
+
+def test_sqlite_persists_across_instances(tmp_path):
+    path = tmp_path / "state.db"
+    first = SQLiteBackend(path)
+    first.increment("budget", "daily", 2.5)
+    first.append_list("audit", "calls", {"fn": "f"})
+    first.close()
+
+    second = SQLiteBackend(path)
+    assert second.get("budget", "daily") == 2.5
+    assert second.get_list("audit", "calls") == [{"fn": "f"}]
+    assert second.get_stats()["namespaces"] == ["budget"]
+    second.close()
+
+
+def test_sqlite_pragmas(tmp_path):
+    backend = SQLiteBackend(tmp_path / "state.db", synchronous="FULL", cache_mb=4)
+    conn = backend._get_conn()
+    assert conn.execute("PRAGMA synchronous").fetchone()[0] == 2  # FULL
+    assert conn.execute("PRAGMA cache_size").fetchone()[0] == -4096
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    backend.close()
+
+    with pytest.raises(ValueError):
+        SQLiteBackend(tmp_path / "other.db", synchronous="normal; DROP TABLE kv_store")
+
+
+def test_bulk_commit_groups_writes(backend: StateBackend):
+    with backend.bulk_commit():
+        backend.increment("ns", "n", 1.0)
+        with backend.bulk_commit():
+            backend.append_list("ns", "log", {"i": 1})
+        backend.set("ns", "k", "v")
+    assert backend.get("ns", "n") == 1.0
+    assert backend.get("ns", "k") == "v"
+    assert backend.get_list("ns", "log") == [{"i": 1}]
+
+
+def test_sqlite_bulk_commit_is_atomic(tmp_path):
+    import sqlite3
+
+    path = tmp_path / "state.db"
+    backend = SQLiteBackend(path)
+    reader = sqlite3.connect(path)
+
+    def committed() -> list[tuple[str, str]]:
+        return reader.execute("SELECT key, value FROM kv_store ORDER BY key").fetchall()
+
+    with backend.bulk_commit():
+        backend.increment("ns", "n", 1.0)
+        backend.set("ns", "k", "v")
+        assert committed() == []
+    assert committed() == [("k", '"v"'), ("n", "1.0")]
+
+    with pytest.raises(RuntimeError), backend.bulk_commit():
+        backend.increment("ns", "n", 1.0)
+        raise RuntimeError
+    assert backend.get("ns", "n") == 1.0
+    assert committed() == [("k", '"v"'), ("n", "1.0")]
+    backend.close()
+    reader.close()
+
+
+def test_sqlite_trim_is_amortized(tmp_path):
+    backend = SQLiteBackend(tmp_path / "state.db")
+    for i in range(1050):
+        backend.append_list("ns", "log", {"i": i}, max_size=500)
+        count = backend.get_stats()["list_entries"]
+        assert count <= 505  # max_size plus 1% slack
+    assert backend.get_list("ns", "log", limit=1000)[-1] == {"i": 1049}
+    assert backend.get_list("ns", "log", limit=1000)[0]["i"] <= 550
+    backend.close()
+
+
+def test_memory_list_follows_max_size_changes():
+    backend = InMemoryBackend()
+    for i in range(5):
+        backend.append_list("ns", "log", {"i": i}, max_size=4)
+    backend.append_list("ns", "log", {"i": 5}, max_size=2)
+    assert backend.get_list("ns", "log") == [{"i": 4}, {"i": 5}]
+    backend.append_list("ns", "log", {"i": 6}, max_size=10)
+    assert backend.get_list("ns", "log") == [{"i": 4}, {"i": 5}, {"i": 6}]
+    assert backend.get_list("ns", "log", limit=0) == []
+
+
+def test_increment_keeps_full_float_precision(backend: StateBackend):
+    backend.increment("ns", "x", 0.1)
+    assert backend.increment("ns", "x", 0.2) == 0.1 + 0.2
+    assert backend.get("ns", "x") == 0.1 + 0.2
+    backend.set("ns", "y", 3)
+    assert backend.increment("ns", "y", 1) == 4.0
+
+
+def test_sqlite_get_does_not_write(tmp_path):
+    path = tmp_path / "state.db"
+    writer = SQLiteBackend(path)
+    reader = SQLiteBackend(path)
+    writer.set("ns", "k", "v")
+    with writer.bulk_commit():
+        writer.set("ns", "k", "w")
+        # Would wait on the writer's lock if reads still deleted expired rows
+        assert reader.get("ns", "k") == "v"
+        assert not reader._get_conn().in_transaction
+    assert reader.get("ns", "k") == "w"
+    writer.close()
+    reader.close()
+
+
+def test_sqlite_expired_rows_swept_periodically(tmp_path, monkeypatch):
+    import time
+
+    backend = SQLiteBackend(tmp_path / "state.db")
+    now = time.time()
+    backend.set("ns", "temp", 1, ttl=5)
+    monkeypatch.setattr(time, "time", lambda: now + 10)
+    assert backend.get("ns", "temp") is None
+    backend.set("ns", "other", 2)
+    assert backend.get_stats()["kv_entries"] == 2  # swept at most once a minute
+    monkeypatch.setattr(time, "time", lambda: now + 120)
+    backend.set("ns", "other", 3)
+    assert backend.get_stats()["kv_entries"] == 1
+    backend.close()
+
+
+def test_extend_list(backend: StateBackend):
+    backend.append_list("ns", "log", {"i": 0}, max_size=4)
+    backend.extend_list("ns", "log", ({"i": i} for i in range(1, 6)), max_size=4)
+    backend.extend_list("ns", "log", [], max_size=4)
+    assert backend.get_list("ns", "log") == [{"i": 2}, {"i": 3}, {"i": 4}, {"i": 5}]
+
+
+def test_sqlite_expiry_index_is_partial(tmp_path):
+    backend = SQLiteBackend(tmp_path / "state.db")
+    conn = backend._get_conn()
+    indexes = dict(conn.execute("SELECT name, sql FROM sqlite_master WHERE type = 'index'"))
+    assert "idx_kv_expires" not in indexes
+    assert "WHERE expires_at IS NOT NULL" in indexes["idx_kv_expiring"]
+    plan = conn.execute(f"EXPLAIN QUERY PLAN {_SQL_DELETE_EXPIRED}", (0.0,)).fetchall()
+    assert "idx_kv_expiring" in str(plan)
+    backend.close()
+
+
+def test_cached_backend_serves_reads_from_memory(tmp_path):
+    path = tmp_path / "state.db"
+    cached = CachedBackend(SQLiteBackend(path), max_entries=3, max_age=60)
+    other = SQLiteBackend(path)
+    cached.set("ns", "a", 1)
+    assert cached.increment("ns", "n", 2.0) == 2.0
+    assert cached.get("ns", "missing", default=5) == 5
+
+    other.set("ns", "a", 10)
+    other.set("ns", "missing", 7)
+    assert cached.get("ns", "a") == 1  # still within max_age
+    assert cached.get("ns", "missing", default=5) == 5
+    assert cached.get("ns", "b") is None  # a fourth key evicts the oldest, "a"
+    assert cached.get("ns", "a") == 10
+    cached.clear_cache()
+    assert cached.get("ns", "missing") == 7
+
+    with pytest.raises(RuntimeError), cached.bulk_commit():
+        cached.set("ns", "a", 99)
+        raise RuntimeError
+    assert cached.get("ns", "a") == 10
+
+    cached.clear_namespace("ns")
+    assert cached.get("ns", "n") is None
+    cached.close()
+    other.close()
+
+
+def test_increment_rejects_non_numeric_value(backend: StateBackend):
+    backend.set("ns", "name", "abc")
+    with pytest.raises(ValueError):
+        backend.increment("ns", "name", 1.0)
+    assert backend.get("ns", "name") == "abc"
+    backend.set("ns", "items", [1, 2])
+    with pytest.raises(TypeError):
+        backend.increment("ns", "items")
+    assert backend.get("ns", "items") == [1, 2]
+
+
+def test_increment_handles_infinity(backend: StateBackend):
+    assert backend.increment("ns", "x", float("inf")) == float("inf")
+    assert backend.get("ns", "x") == float("inf")
+    backend.set("ns", "big", 1e308)
+    assert backend.increment("ns", "big", 1e308) == float("inf")
+    assert backend.get("ns", "big") == float("inf")
+
+
+def test_sqlite_failed_increment_releases_write_lock(tmp_path):
+    path = tmp_path / "state.db"
+    first, second = SQLiteBackend(path), SQLiteBackend(path)
+    first.set("ns", "name", "abc")
+    with pytest.raises(ValueError):
+        first.increment("ns", "name")
+    assert not first._get_conn().in_transaction
+    second.set("ns", "other", 1)
+    assert first.get("ns", "other") == 1
+    first.close()
+    second.close()